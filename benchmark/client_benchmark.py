@@ -0,0 +1,322 @@
+"""Benchmark every public DataAPIClient method against a local stand in Data API server, with no AWS deployment.
+
+Each method is run in up to three modes:
+
+* sync - one call at a time from a single thread, for latency without contention
+* parallel - the same calls issued from --threads threads sharing one Client, for throughput under concurrency
+* batch - the Client's own bulk operations (get_resources, bulk_writer, iter_items, iter_find and scan_all), where
+  throughput is counted in Items rather than calls
+
+With --transport memory, the Client calls the stand in API through an InMemoryTransport rather than over HTTP, so that
+the results measure the Client alone.
+
+Throughput and p50/p95/p99 latency are printed as a table, and can be written as JSON or CSV for tracking regressions.
+Given a --baseline written by an earlier run, results whose p50 latency or throughput are more than --max-regression
+worse are listed, and the exit status is 1.
+
+Usage: python benchmark/client_benchmark.py [--requests N] [--threads N] [--latency SECONDS] [--item-size BYTES]
+                                            [--page-items N] [--pages N] [--batch-size N] [--modes MODE ...]
+                                            [--methods NAME ...] [--format json|csv] [--output FILE]
+                                            [--baseline FILE] [--max-regression FRACTION]
+                                            [--transport http|memory]
+"""
+import argparse
+import csv
+import io
+import json
+import math
+import os
+import platform
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data_api_client import DataAPIClient
+from src.lib.transport import Transport, InMemoryTransport
+from benchmark.stand_in_server import StandInServer, StandInApi, make_item
+
+SYNC = "sync"
+PARALLEL = "parallel"
+BATCH = "batch"
+MODES = [SYNC, PARALLEL, BATCH]
+_NAMESPACE = "Bench"
+_RESULT_FIELDS = ["method", "mode", "calls", "items", "errors", "seconds", "throughput", "mean_ms", "p50_ms",
+                  "p95_ms", "p99_ms", "max_ms"]
+
+# public methods that make no request, so have nothing to measure against a server
+NOT_BENCHMARKED = frozenset(["close", "cache_statistics", "metrics", "refresh_namespace_metadata"])
+
+
+def percentile(ordered: list, p: float) -> float:
+    """Nearest rank percentile of an already sorted list.
+    """
+    if len(ordered) == 0:
+        return 0.0
+
+    rank = max(0, min(len(ordered) - 1, math.ceil(p / 100 * len(ordered)) - 1))
+
+    return ordered[rank]
+
+
+def request_cases(resource: dict):
+    """The methods which make a single request per call, as {name: callable of (client, i)}.
+    """
+    return {
+        "provision": lambda c, i: c.provision(_NAMESPACE, "id"),
+        "get_namespaces": lambda c, i: c.get_namespaces(),
+        "get_endpoints": lambda c, i: c.get_endpoints(_NAMESPACE),
+        "get_status": lambda c, i: c.get_status(_NAMESPACE),
+        "get_info": lambda c, i: c.get_info(_NAMESPACE),
+        "put_info": lambda c, i: c.put_info(_NAMESPACE, {"Description": "benchmark"}),
+        "list_items": lambda c, i: c.list_items(_NAMESPACE, page_size=100),
+        "get_schema": lambda c, i: c.get_schema(_NAMESPACE, "Resource"),
+        "put_schema": lambda c, i: c.put_schema(_NAMESPACE, "Resource", {"type": "object"}),
+        "delete_schema": lambda c, i: c.delete_schema(_NAMESPACE, "Resource"),
+        "set_item_master": lambda c, i: c.set_item_master(_NAMESPACE, str(i), "master"),
+        "remove_item_master": lambda c, i: c.remove_item_master(_NAMESPACE, str(i), "master"),
+        "find": lambda c, i: c.find(_NAMESPACE, resource_attributes={"attribute_0": "x"}),
+        "validate_item": lambda c, i: c.validate_item(_NAMESPACE, str(i)),
+        "get_resource": lambda c, i: c.get_resource(_NAMESPACE, str(i)),
+        "get_metadata": lambda c, i: c.get_metadata(_NAMESPACE, str(i)),
+        "delete_resource": lambda c, i: c.delete_resource(_NAMESPACE, str(i)),
+        "delete_metadata": lambda c, i: c.delete_metadata(_NAMESPACE, str(i)),
+        "restore_item": lambda c, i: c.restore_item(_NAMESPACE, str(i)),
+        "delete_attributes": lambda c, i: c.delete_attributes(_NAMESPACE, str(i), resource_attributes=["attribute_0"]),
+        "put_resource": lambda c, i: c.put_resource(_NAMESPACE, str(i), dict(resource)),
+        "put_metadata": lambda c, i: c.put_metadata(_NAMESPACE, str(i), {"source": "benchmark"}),
+        "put_references": lambda c, i: c.put_references(_NAMESPACE, str(i), {"Resource": "Order", "Id": str(i)}),
+        "lineage_search": lambda c, i: c.lineage_search(_NAMESPACE, str(i), "UP"),
+        "start_export": lambda c, i: c.start_export(_NAMESPACE, 2, 50, "s3://bucket/export", "s3://bucket/log"),
+        "get_export_status": lambda c, i: c.get_export_status(_NAMESPACE, "Bench-export"),
+        "understand": lambda c, i: c.understand(_NAMESPACE, str(i), "S3Path")
+    }
+
+
+def _bulk_write(c, i, resource: dict, batch_size: int):
+    with c.bulk_writer() as writer:
+        for n in range(batch_size):
+            writer.put_resource(_NAMESPACE, f"{i}-{n}", dict(resource))
+
+    if not writer.report.ok:
+        raise Exception(f"Bulk write failed: {writer.report!r}")
+
+    return batch_size
+
+
+def batch_cases(resource: dict, batch_size: int):
+    """The bulk operations, as {name: callable of (client, i) returning the number of Items processed}.
+    """
+    return {
+        "get_resources": lambda c, i: len(c.get_resources(_NAMESPACE, [f"{i}-{n}" for n in range(batch_size)])),
+        "bulk_writer": lambda c, i: _bulk_write(c, i, resource, batch_size),
+        "iter_items": lambda c, i: sum(1 for _ in c.iter_items(_NAMESPACE, page_size=100)),
+        "iter_find": lambda c, i: sum(1 for _ in c.iter_find(_NAMESPACE, resource_attributes={"attribute_0": "x"})),
+        "scan_all": lambda c, i: sum(1 for _ in c.scan_all(_NAMESPACE, total_segments=4, page_size=100))
+    }
+
+
+def _summarise(method: str, mode: str, latencies: list, items: int, errors: int, seconds: float) -> dict:
+    ordered = sorted(latencies)
+
+    return {
+        "method": method,
+        "mode": mode,
+        "calls": len(latencies),
+        "items": items,
+        "errors": errors,
+        "seconds": round(seconds, 6),
+        # calls per second, or Items per second in batch mode
+        "throughput": round((items if mode == BATCH else len(latencies)) / seconds, 3) if seconds > 0 else 0.0,
+        "mean_ms": round(sum(ordered) / len(ordered) * 1e3, 4) if ordered else 0.0,
+        "p50_ms": round(percentile(ordered, 50) * 1e3, 4),
+        "p95_ms": round(percentile(ordered, 95) * 1e3, 4),
+        "p99_ms": round(percentile(ordered, 99) * 1e3, 4),
+        "max_ms": round(ordered[-1] * 1e3, 4) if ordered else 0.0
+    }
+
+
+def run_case(client, method: str, mode: str, call, calls: int, threads: int = 1) -> dict:
+    """Time calls to call(client, i), after one untimed warm up call.
+    """
+    lock = threading.Lock()
+    latencies = []
+    counts = {"items": 0, "errors": 0}
+
+    def _timed(i):
+        start = time.perf_counter()
+        try:
+            processed = call(client, i)
+            error = 0
+        except Exception:
+            processed = 0
+            error = 1
+        elapsed = time.perf_counter() - start
+
+        with lock:
+            latencies.append(elapsed)
+            counts["items"] += processed if isinstance(processed, int) and not isinstance(processed, bool) else 1
+            counts["errors"] += error
+
+    try:
+        call(client, -1)
+    except Exception:
+        # counted as errors in the timed calls
+        pass
+
+    start = time.perf_counter()
+    if threads > 1:
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            list(pool.map(_timed, range(calls)))
+    else:
+        for i in range(calls):
+            _timed(i)
+    seconds = time.perf_counter() - start
+
+    return _summarise(method, mode, latencies, counts["items"], counts["errors"], seconds)
+
+
+def run_suite(endpoint: str, requests: int = 200, threads: int = 8, item_size: int = 1024, batch_size: int = 100,
+              batch_requests: int = None, modes: list = None, methods: list = None, progress=None,
+              transport: Transport = None) -> list:
+    """Run the benchmark cases against a server, returning one result per method and mode.
+    """
+    modes = modes if modes is not None else MODES
+    batch_requests = batch_requests if batch_requests is not None else max(1, requests // 20)
+    resource = make_item(0, item_size).get("Resource")
+    client = DataAPIClient(stage="dev", region_name="us-east-1", access_key="AKIDEXAMPLE",
+                           secret_key="wJalrXUtnFEMI/K7MDENG+bPxRfiCYEXAMPLEKEY", service_endpoint=endpoint,
+                           tls=False, log_level="WARNING", pool_size=max(threads, 10), transport=transport)
+    results = []
+
+    try:
+        plan = []
+        for mode in [m for m in modes if m in (SYNC, PARALLEL)]:
+            plan += [(name, mode, call, requests, threads if mode == PARALLEL else 1)
+                     for name, call in request_cases(resource).items()]
+        if BATCH in modes:
+            plan += [(name, BATCH, call, batch_requests, 1) for name, call in batch_cases(resource, batch_size).items()]
+
+        for name, mode, call, calls, workers in plan:
+            if methods is not None and name not in methods:
+                continue
+
+            result = run_case(client, name, mode, call, calls, threads=workers)
+            results.append(result)
+            if progress is not None:
+                progress(result)
+    finally:
+        client.close()
+
+    return results
+
+
+def environment(args) -> dict:
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "parameters": {k: v for k, v in vars(args).items() if k not in ("output", "baseline", "format")}
+    }
+
+
+def to_json(results: list, env: dict) -> str:
+    return json.dumps({"environment": env, "results": results}, indent=2)
+
+
+def to_csv(results: list) -> str:
+    out = io.StringIO()
+    writer = csv.DictWriter(out, fieldnames=_RESULT_FIELDS)
+    writer.writeheader()
+    writer.writerows(results)
+
+    return out.getvalue()
+
+
+def regressions(results: list, baseline: list, max_regression: float) -> list:
+    """Results whose p50 latency rose, or throughput fell, by more than max_regression against the baseline.
+    """
+    previous = {(r.get("method"), r.get("mode")): r for r in baseline}
+    found = []
+
+    for result in results:
+        before = previous.get((result.get("method"), result.get("mode")))
+        if before is None:
+            continue
+
+        if before.get("p50_ms", 0) > 0 and result.get("p50_ms") > before.get("p50_ms") * (1 + max_regression):
+            found.append((result, "p50_ms", before.get("p50_ms")))
+        if result.get("throughput") < before.get("throughput", 0) * (1 - max_regression):
+            found.append((result, "throughput", before.get("throughput")))
+
+    return found
+
+
+def _print_result(result: dict):
+    print(f"{result.get('method'):20} {result.get('mode'):8} {result.get('throughput'):>10,.0f}/s  "
+          f"p50 {result.get('p50_ms'):8.2f}  p95 {result.get('p95_ms'):8.2f}  p99 {result.get('p99_ms'):8.2f} ms"
+          f"{'  errors ' + str(result.get('errors')) if result.get('errors') else ''}", file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=200, help="Calls per method in sync and parallel modes")
+    parser.add_argument("--batch-requests", type=int, default=None, help="Calls per method in batch mode")
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds the server waits before each response")
+    parser.add_argument("--connect-latency", type=float, default=0.0,
+                        help="Seconds the server waits on each new connection")
+    parser.add_argument("--item-size", type=int, default=1024, help="Bytes in each Resource")
+    parser.add_argument("--page-items", type=int, default=100, help="Items in each list and find page")
+    parser.add_argument("--pages", type=int, default=5, help="Pages returned before a list or find is complete")
+    parser.add_argument("--batch-size", type=int, default=100, help="Items per get_resources and bulk_writer call")
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=MODES)
+    parser.add_argument("--methods", nargs="+", default=None, help="Only run these methods")
+    parser.add_argument("--format", choices=["json", "csv"], default="json")
+    parser.add_argument("--output", default=None, help="File to write results to, instead of stdout")
+    parser.add_argument("--baseline", default=None, help="JSON results of an earlier run to compare with")
+    parser.add_argument("--max-regression", type=float, default=0.2)
+    parser.add_argument("--transport", choices=["http", "memory"], default="http",
+                        help="Call the stand in API over local HTTP, or in memory with no network")
+    args = parser.parse_args()
+
+    suite_args = dict(requests=args.requests, threads=args.threads, item_size=args.item_size,
+                      batch_size=args.batch_size, batch_requests=args.batch_requests, modes=args.modes,
+                      methods=args.methods, progress=_print_result)
+
+    if args.transport == "memory":
+        api = StandInApi(latency=args.latency, item_size=args.item_size, page_items=args.page_items, pages=args.pages)
+        results = run_suite(api.endpoint, transport=InMemoryTransport(api), **suite_args)
+    else:
+        server = StandInServer(connect_latency=args.connect_latency, latency=args.latency, item_size=args.item_size,
+                               page_items=args.page_items, pages=args.pages).start()
+
+        try:
+            results = run_suite(server.endpoint, **suite_args)
+        finally:
+            server.stop()
+
+    output = to_json(results, environment(args)) if args.format == "json" else to_csv(results)
+    if args.output is not None:
+        with open(args.output, "w") as f:
+            f.write(output)
+    else:
+        print(output)
+
+    if args.baseline is not None:
+        with open(args.baseline) as f:
+            found = regressions(results, json.load(f).get("results"), args.max_regression)
+
+        for result, metric, before in found:
+            print(f"REGRESSION {result.get('method')} {result.get('mode')} {metric}: {before} -> "
+                  f"{result.get(metric)}", file=sys.stderr)
+
+        if len(found) > 0:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Compare bytes on the wire and latency with and without request and response compression, at several payload sizes.
+
+Writes are put_resource calls with a Resource of the given size. Reads are list_items pages of about the given size,
+returned by the stand in server either as is or gzip encoded. The server can simulate a link of limited bandwidth, as
+on a real network the time saved in transfer is what pays for the time spent compressing.
+
+Usage: python benchmark/compression_benchmark.py [--requests N] [--sizes BYTES ...] [--bandwidth BYTES_PER_SECOND]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data_api_client import DataAPIClient
+from src.lib.compression import RequestCompressor, GZIP, DEFLATE
+from benchmark.stand_in_server import StandInServer, make_item
+
+_PAGE_ITEMS = 50
+
+
+def _client(endpoint: str, compression: RequestCompressor = None):
+    return DataAPIClient(stage="dev", region_name="us-east-1", access_key="AKIDEXAMPLE",
+                         secret_key="wJalrXUtnFEMI/K7MDENG+bPxRfiCYEXAMPLEKEY", service_endpoint=endpoint,
+                         tls=False, log_level="WARNING", compression=compression)
+
+
+def _measure(server: StandInServer, call, requests: int):
+    call()
+    server.reset()
+
+    latencies = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        call()
+        latencies.append(time.perf_counter() - start)
+
+    return statistics.median(latencies), server.bytes_received / requests, server.bytes_sent / requests
+
+
+def _report(label: str, size: int, result):
+    latency, received, sent = result
+    print(f"{label:16} {size:>9,} B  request {received:>11,.0f} B  response {sent:>11,.0f} B  "
+          f"p50 {latency * 1e3:8.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1024, 16384, 131072, 1048576])
+    parser.add_argument("--bandwidth", type=float, default=12.5e6,
+                        help="Bytes per second the server transfers at, 0 for no limit. Default 100 Mbit/s")
+    args = parser.parse_args()
+
+    server = StandInServer(bandwidth=args.bandwidth).start()
+
+    try:
+        for size in args.sizes:
+            resource = make_item(0, size).get("Resource")
+
+            for label, compression in [("put", None), ("put gzip", RequestCompressor(GZIP)),
+                                       ("put deflate", RequestCompressor(DEFLATE))]:
+                client = _client(server.endpoint, compression)
+                _report(label, size, _measure(server, lambda: client.put_resource("Bench", "1", resource),
+                                              args.requests))
+                client.close()
+
+            server.page_items = _PAGE_ITEMS
+            server.item_size = size // _PAGE_ITEMS
+            client = _client(server.endpoint)
+            for label, compress in [("list", False), ("list gzip", True)]:
+                server.compress_responses = compress
+                _report(label, size, _measure(server, lambda: client.list_items("Bench", page_size=_PAGE_ITEMS),
+                                              args.requests))
+            client.close()
+
+            server.page_items = 0
+            server.compress_responses = False
+            print()
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""Compare encode and decode time of the available JSON codecs on a list_items page.
+
+Usage: python benchmark/json_codec_benchmark.py [--items N] [--item-size BYTES] [--iterations N]
+"""
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.lib.json_codec import get_codec, STDLIB, ORJSON
+from src.exceptions import InvalidArgumentsException
+from benchmark.stand_in_server import make_item
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=1000)
+    parser.add_argument("--item-size", type=int, default=1024)
+    parser.add_argument("--iterations", type=int, default=20)
+    args = parser.parse_args()
+
+    page = {"Items": [make_item(i, args.item_size) for i in range(args.items)]}
+    n = args.iterations
+
+    for name in [STDLIB, ORJSON]:
+        try:
+            codec = get_codec(name)
+        except InvalidArgumentsException:
+            print(f"{name:8} not installed")
+            continue
+
+        encoded = codec.dumps(page)
+        encode = timeit.timeit(lambda: codec.dumps(page), number=n) / n
+        decode = timeit.timeit(lambda: codec.loads(encoded), number=n) / n
+        print(f"{name:8} {len(encoded):>12,} B  encode {encode * 1e3:8.2f} ms  decode {decode * 1e3:8.2f} ms  "
+              f"({len(encoded) / decode / 1e6:,.0f} MB/s)")
+
+
+if __name__ == "__main__":
+    main()
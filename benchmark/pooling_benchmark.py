@@ -0,0 +1,55 @@
+"""Compare requests/sec for a DataAPIClient with and without pooled keep-alive connections.
+
+Usage: python benchmark/pooling_benchmark.py [--requests N] [--threads N] [--connect-latency SECONDS]
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data_api_client import DataAPIClient
+from benchmark.stand_in_server import StandInServer
+
+
+def _run(endpoint: str, keep_alive: bool, requests: int, threads: int):
+    client = DataAPIClient(stage="dev", region_name="us-east-1", access_key="AKIDEXAMPLE",
+                           secret_key="wJalrXUtnFEMI/K7MDENG+bPxRfiCYEXAMPLEKEY", service_endpoint=endpoint,
+                           tls=False, log_level="WARNING", pool_size=threads, keep_alive=keep_alive)
+
+    def _call(i):
+        client.get_resource(data_type="Bench", item_id=str(i))
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(_call, range(requests)))
+    elapsed = time.perf_counter() - start
+
+    client.close()
+
+    return requests / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--connect-latency", type=float, default=0.002,
+                        help="Seconds the server sleeps on each new connection to stand in for a TLS handshake")
+    args = parser.parse_args()
+
+    server = StandInServer(connect_latency=args.connect_latency).start()
+
+    try:
+        for keep_alive in [False, True]:
+            rate = _run(server.endpoint, keep_alive, args.requests, args.threads)
+            print(f"keep_alive={keep_alive!s:5} threads={args.threads} requests={args.requests} "
+                  f"-> {rate:,.0f} requests/sec")
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Compare the memory held by list_items results as plain dicts and as compact ItemRecords.
+
+Each Item is shaped like a list_items result: the primary key and Item audit attributes, with Resource and Metadata
+sections. Memory is measured with tracemalloc, after the page has been decoded, so it is the cost of holding the Items.
+The time to build the Items, and then to read the Resource and Metadata of every Item once, is reported alongside.
+
+Usage: python benchmark/record_memory_benchmark.py [--items N] [--attributes N]
+"""
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.lib.json_codec import default_codec
+from src.lib.records import RecordFactory
+
+
+def _page(items: int, attributes: int) -> bytes:
+    return default_codec().dumps({"Items": [{
+        "id": f"customer-{i}",
+        "ItemVersion": i % 7,
+        "LastUpdateAction": "update",
+        "LastUpdateDate": "2020-03-15 13:29:40",
+        "LastUpdatedBy": "887210671223.AROA45EPAPR3Q7HLRS63S:AwsDataAPI-dev",
+        "Resource": {f"attribute_{n}": f"value {n} of item {i}" for n in range(attributes)},
+        "Metadata": {"source": "crm", "quality": i % 100}
+    } for i in range(items)]})
+
+
+def _held(build):
+    gc.collect()
+    tracemalloc.start()
+    items = build()
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    return items, size
+
+
+def _timed(build):
+    # timed apart from the memory measurement, as tracemalloc slows every allocation
+    gc.collect()
+    start = time.perf_counter()
+    items = build()
+    elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for item in items:
+        item.get("Resource")
+        item.get("Metadata")
+
+    return elapsed, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=100000)
+    parser.add_argument("--attributes", type=int, default=10)
+    args = parser.parse_args()
+
+    codec = default_codec()
+    page = _page(args.items, args.attributes)
+
+    def _dicts():
+        return codec.loads(page).get("Items")
+
+    def _records():
+        make = RecordFactory(codec).make
+        return [make(item) for item in codec.loads(page).get("Items")]
+
+    results = {}
+    for label, build in [("dict", _dicts), ("ItemRecord", _records)]:
+        items, size = _held(build)
+        results[label] = size
+        del items
+        elapsed, read = _timed(build)
+
+        print(f"{label:12} {args.items:>9,} Items  {size / 2 ** 20:8.1f} MiB  {size / args.items:8.0f} B/Item  "
+              f"build {elapsed:6.2f} s  read {read:6.2f} s")
+
+    print(f"{'saving':12} {1 - results.get('ItemRecord') / results.get('dict'):>32.0%}")
+
+
+if __name__ == "__main__":
+    main()
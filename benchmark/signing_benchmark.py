@@ -0,0 +1,54 @@
+"""Measure the per-request cost of SigV4 signing with a warm and a cold signing key cache.
+
+Usage: python benchmark/signing_benchmark.py [--iterations N]
+"""
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import requests
+from src.lib.signing import SigV4Signer, SigningKeyCache
+
+_URL = "https://abc.execute-api.eu-west-1.amazonaws.com/dev/MyItem/1234567890?SuppressItemMetadataFetch=False"
+_HEADERS = {"content-type": "application/json"}
+
+
+def _report(label: str, seconds: float, iterations: int):
+    print(f"{label:32} {seconds / iterations * 1e6:8.1f} us/request")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+    n = args.iterations
+
+    cache = SigningKeyCache()
+    signer = SigV4Signer("AKIDEXAMPLE", "secret", "eu-west-1", "execute-api", key_cache=cache)
+
+    _report("signer, cached key", timeit.timeit(lambda: signer.sign("GET", _URL, _HEADERS), number=n), n)
+
+    def _cold():
+        cache.clear()
+        signer.sign("GET", _URL, _HEADERS)
+
+    _report("signer, key derived per request", timeit.timeit(_cold, number=n), n)
+
+    try:
+        from requests_aws4auth import AWS4Auth
+    except ImportError:
+        return
+
+    request = requests.Request("GET", _URL, headers=_HEADERS).prepare()
+
+    def _aws4auth():
+        AWS4Auth("AKIDEXAMPLE", "secret", "eu-west-1", "execute-api")(request.copy())
+
+    _report("AWS4Auth built per request", timeit.timeit(_aws4auth, number=n), n)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,265 @@
+import gzip
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs, unquote
+from requests.structures import CaseInsensitiveDict
+
+# Namespace level routes, as /{stage}/{namespace}/{route}
+_NAMESPACE_ROUTES = frozenset(["info", "endpoints", "status", "provision", "list", "find", "ItemMaster", "export"])
+# Item level routes, as /{stage}/{namespace}/{id}/{route}
+_ITEM_ROUTES = frozenset(["meta", "restore", "understand", "upstream", "downstream"])
+_PAGE_TOKEN = re.compile(r"page-(\d+)")
+_AUDIT = {"ItemVersion": 1, "LastUpdateAction": "update", "LastUpdateDate": "2020-03-15 13:29:40",
+          "LastUpdatedBy": "887210671223.AROA45EPAPR3Q7HLRS63S:AwsDataAPI-dev"}
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """HTTP/1.1 handler that answers the Data API routes called by the HttpHelper with canned JSON documents.
+    """
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        super().setup()
+        # simulate the TCP+TLS handshake cost paid by every new connection
+        if self.server.connect_latency > 0:
+            time.sleep(self.server.connect_latency)
+
+    def log_message(self, format, *args):
+        pass
+
+    def _respond(self):
+        length = int(self.headers.get("Content-Length", 0))
+        body = self.rfile.read(length) if length > 0 else None
+
+        status, headers, content = self.server.respond(self.command, self.path, self.headers, body)
+
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(content)))
+        if self.close_connection:
+            self.send_header("Connection", "close")
+        self.end_headers()
+        self.wfile.write(content)
+
+    do_GET = _respond
+    do_PUT = _respond
+    do_POST = _respond
+    do_DELETE = _respond
+    do_HEAD = _respond
+
+
+class StandInApi:
+    """Canned responses for every Data API route that the Client calls, shared by the StandInServer and by an
+    InMemoryTransport, which calls the StandInApi in place of a server:
+
+        DataAPIClient(..., service_endpoint=StandInApi.ENDPOINT, tls=False, transport=InMemoryTransport(StandInApi()))
+
+    Items have a Resource of about item_size bytes, and list and find return pages of page_items Items, followed by a
+    LastEvaluatedKey until pages pages have been returned. latency is added to every response, or route_latency to the
+    routes it names, such as {"list": 0.05}, and bandwidth in bytes per second limits the speed at which bodies are
+    sent and received. Request and response body sizes are counted so that benchmarks can report bytes on the wire.
+    """
+    ENDPOINT = "stand-in.local"
+
+    def __init__(self, page_items: int = 0, item_size: int = 0, compress_responses: bool = False, bandwidth: float = 0,
+                 latency: float = 0, route_latency: dict = None, pages: int = 1, stage: str = "dev"):
+        self.page_items = page_items
+        self.item_size = item_size
+        self.compress_responses = compress_responses
+        # bytes per second, or 0 for no limit
+        self.bandwidth = bandwidth
+        self.latency = latency
+        self.route_latency = route_latency if route_latency is not None else {}
+        self.pages = pages
+        self.stage = stage
+        self._stats_lock = threading.Lock()
+        self.reset()
+
+    @property
+    def endpoint(self):
+        return self.ENDPOINT
+
+    def __call__(self, method: str, url: str, headers: dict, body: bytes = None):
+        parts = urlsplit(url)
+        target = f"{parts.path}?{parts.query}" if parts.query else parts.path
+
+        return self.respond(method, target, CaseInsensitiveDict(headers), body)
+
+    def _transfer(self, length: int):
+        # simulate a link of limited bandwidth
+        if self.bandwidth > 0:
+            time.sleep(length / self.bandwidth)
+
+    def _page(self, namespace: str, token) -> dict:
+        match = _PAGE_TOKEN.search(str(token)) if token is not None else None
+        page = int(match.group(1)) if match is not None else 0
+
+        document = {"Items": [dict(make_item(page * self.page_items + i, self.item_size), **_AUDIT)
+                              for i in range(self.page_items)]}
+        if page + 1 < self.pages:
+            document["LastEvaluatedKey"] = f"page-{page + 1}"
+
+        return document
+
+    def _item(self, path: str, section: str) -> dict:
+        return {"Item": {section: dict(make_item(0, self.item_size).get("Resource"), id=path, **_AUDIT)}}
+
+    def respond(self, method: str, target: str, headers, body: bytes = None):
+        """Answers a request for target, the path and query of the URL. Returns the status, headers and body.
+        """
+        received = len(body) if body is not None else 0
+        self._transfer(received)
+
+        request_body = None
+        if received > 0:
+            if headers.get("Content-Encoding") == "gzip":
+                body = gzip.decompress(body)
+
+            try:
+                request_body = json.loads(body)
+            except ValueError:
+                pass
+
+        url = urlsplit(target)
+        route, status, document = self.route(method, url.path, parse_qs(url.query), request_body)
+
+        latency = self.route_latency.get(route, self.latency)
+        if latency > 0:
+            time.sleep(latency)
+
+        content = json.dumps(document).encode("utf-8") if document is not None and method != "HEAD" else b""
+        response_headers = {"Content-Type": "application/json"}
+        if len(content) > 0 and self.compress_responses and "gzip" in headers.get("Accept-Encoding", ""):
+            content = gzip.compress(content, compresslevel=6, mtime=0)
+            response_headers["Content-Encoding"] = "gzip"
+
+        self.record(received, len(content))
+        self._transfer(len(content))
+
+        return status, response_headers, content
+
+    def route(self, method: str, path: str, query: dict, body):
+        """Returns the name of the route matched, and the status and document to respond with.
+        """
+        parts = [unquote(p) for p in path.strip("/").split("/")]
+
+        if parts == ["data-apis"]:
+            return "data-apis", 200, {self.stage: {"Endpoint": f"http://{self.endpoint}", "Stage": self.stage}}
+        elif len(parts) < 2 or parts[0] != self.stage:
+            return "unknown", 404, {"Message": f"No route for {path}"}
+
+        namespace = parts[1]
+        rest = parts[2:]
+
+        if namespace == "namespaces" and len(rest) == 0:
+            return "namespaces", 200, ["Customer", "Order", "Bench"]
+        elif len(rest) == 0:
+            return "unknown", 404, {"Message": f"No route for {path}"}
+        elif len(rest) == 1 and rest[0] in _NAMESPACE_ROUTES:
+            route = rest[0]
+
+            if route in ("list", "find"):
+                if method == "POST":
+                    token = (body or {}).get("ExclusiveStartKey")
+                else:
+                    token = query.get("ExclusiveStartKey", [None])[0]
+
+                return route, 200, self._page(namespace, token)
+            elif route == "info":
+                return route, 200, {"DataType": namespace, "PrimaryKey": "id", "Stage": self.stage,
+                                    "StrictOCCV": False} if method == "GET" else {"DataType": namespace}
+            elif route == "endpoints":
+                return route, 200, {"Resources": f"{namespace}-{self.stage}", "Metadata": f"{namespace}-Metadata"}
+            elif route == "status":
+                return route, 200, {"Status": "CREATE_COMPLETE"}
+            elif route == "export" and method == "GET":
+                # every export run completes as soon as it is started
+                run = query.get("JobRunID", ["jr_0"])[0]
+                return route, 200, {run: {"Status": "SUCCEEDED", "ExecutedDuration": 1}}
+            elif route == "export":
+                return route, 200, {"JobName": f"{namespace}-export", "JobRunId": "jr_0", "Status": "RUNNING"}
+            else:
+                return route, 200, {"DataType": namespace}
+        elif len(rest) == 2 and rest[0] == "schema":
+            return "schema", 200, {"$schema": "http://json-schema.org/draft-07/schema#", "type": "object"}
+        elif len(rest) == 2 and rest[1] in _ITEM_ROUTES:
+            route = rest[1]
+
+            if route == "meta":
+                return route, 200, self._item(path, "Metadata")
+            elif route in ("upstream", "downstream"):
+                return route, 200, [{"id": rest[0], "Depth": 1}]
+            else:
+                return route, 200, {"Resource": dict(_AUDIT)}
+        elif len(rest) == 1:
+            if method in ("GET", "HEAD"):
+                return "item", 200, self._item(path, "Resource")
+            elif method == "PUT":
+                # echo the sections written, as the Client returns them from put_resource and put_metadata
+                sections = body if isinstance(body, dict) else {}
+                return "item", 200, {k: dict(_AUDIT) for k in ("Resource", "Metadata", "References")
+                                     if k in sections} or {"Resource": dict(_AUDIT)}
+            else:
+                return "item", 200, {"DataType": namespace}
+
+        return "unknown", 404, {"Message": f"No route for {path}"}
+
+    def record(self, received: int, sent: int):
+        with self._stats_lock:
+            self.requests += 1
+            self.bytes_received += received
+            self.bytes_sent += sent
+
+    def reset(self):
+        with self._stats_lock:
+            self.requests = 0
+            self.bytes_received = 0
+            self.bytes_sent = 0
+
+
+class StandInServer(StandInApi, ThreadingHTTPServer):
+    """Local, in process stand in for a Data API Stage, for benchmarks and tests that must not need a deployment.
+
+    Every route that the Client calls is answered over HTTP by the StandInApi. connect_latency is added to each new
+    connection.
+    """
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(self, port: int = 0, connect_latency: float = 0, page_items: int = 0, item_size: int = 0,
+                 compress_responses: bool = False, bandwidth: float = 0, latency: float = 0,
+                 route_latency: dict = None, pages: int = 1, stage: str = "dev"):
+        ThreadingHTTPServer.__init__(self, ("127.0.0.1", port), StandInHandler)
+        StandInApi.__init__(self, page_items=page_items, item_size=item_size, compress_responses=compress_responses,
+                            bandwidth=bandwidth, latency=latency, route_latency=route_latency, pages=pages,
+                            stage=stage)
+        self.connect_latency = connect_latency
+        self._thread = None
+
+    @property
+    def endpoint(self):
+        return f"127.0.0.1:{self.server_address[1]}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+def make_item(i: int, size: int) -> dict:
+    """An Item whose Resource serialises to roughly size bytes of typical, fairly repetitive JSON.
+    """
+    fields = max(1, size // 48)
+
+    return {"id": str(i), "Resource": {f"attribute_{n}": {"value": f"value {n} of item {i}", "rank": n}
+                                       for n in range(fields)}}
@@ -0,0 +1,62 @@
+"""Measure the cost of importing the Data API Client and of constructing a DataAPIClient.
+
+Each import is timed in a fresh interpreter, as a cold start would be. Construction is timed with explicit credentials,
+which must not load boto3 or touch the network.
+
+Usage: python benchmark/startup_benchmark.py [--imports N] [--constructions N]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import timeit
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, _ROOT)
+
+_IMPORT_SCRIPT = """
+import sys, time
+start = time.perf_counter()
+import src.data_api_client
+print(time.perf_counter() - start, 'boto3' in sys.modules)
+"""
+
+
+def _import_time():
+    out = subprocess.run([sys.executable, "-c", _IMPORT_SCRIPT], cwd=_ROOT, check=True, capture_output=True,
+                         text=True).stdout.split()
+
+    return float(out[0]), out[1] == "True"
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--imports", type=int, default=5)
+    parser.add_argument("--constructions", type=int, default=2000)
+    args = parser.parse_args()
+
+    results = [_import_time() for _ in range(args.imports)]
+    print(f"{'import src.data_api_client':32} {statistics.median(r[0] for r in results) * 1e3:8.1f} ms (median)")
+    print(f"{'boto3 imported':32} {any(r[1] for r in results)!s:>8}")
+
+    from src.data_api_client import DataAPIClient
+
+    def _construct():
+        DataAPIClient(stage="dev", region_name="us-east-1", access_key="AKIDEXAMPLE", secret_key="secret",
+                      service_endpoint="localhost:1", tls=False)
+
+    n = args.constructions
+    print(f"{'DataAPIClient()':32} {timeit.timeit(_construct, number=n) / n * 1e6:8.1f} us")
+
+    # the first request pays for binding the endpoint and credentials
+    def _construct_and_bind():
+        DataAPIClient(stage="dev", region_name="us-east-1", access_key="AKIDEXAMPLE", secret_key="secret",
+                      service_endpoint="localhost:1", tls=False)._bind()
+
+    print(f"{'DataAPIClient() and bind':32} {timeit.timeit(_construct_and_bind, number=n) / n * 1e6:8.1f} us")
+    print(f"{'boto3 imported after bind':32} {'boto3' in sys.modules!s:>8}")
+
+
+if __name__ == "__main__":
+    main()
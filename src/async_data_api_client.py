@@ -0,0 +1,365 @@
+from src.lib.async_http_handler import AsyncHttpHelper
+from src.lib.http_handler import DEFAULT_POOL_SIZE, DEFAULT_POOL_IDLE_TIMEOUT
+from src.lib.data_api_control_plane import DataApiControlPlane
+import src.lib.request_args as request_args
+from src.lib.retry import RetryPolicy
+from src.lib.rate_limiter import AdaptiveRateLimiter
+from src.lib.credentials import CredentialProvider, get_credential_provider
+from src.lib.compression import RequestCompressor
+from src.lib.json_codec import JsonCodec, get_codec
+from src.lib.single_flight import AsyncSingleFlight
+import os
+from src.exceptions import *
+import src.parameters as params
+import logging
+
+
+class AsyncDataAPIClient:
+    """asyncio AWS Data API Client.
+
+    Offers the same methods as the DataAPIClient as coroutines, sharing one pooled aiohttp session per Client. Requires
+    aiohttp to be installed.
+    """
+    _http_handler = None
+    _stage = None
+    _region_name = None
+    _access_key = None
+    _secret_key = None
+    _session_token = None
+    _control_plane = None
+    _logger = None
+
+    SEARCH_UPSTREAM = 'UP'
+    SEARCH_DOWNSTREAM = 'DOWN'
+
+    def __init__(self, stage: str, region_name: str = None, access_key: str = None, secret_key: str = None,
+                 session_token: str = None, service_endpoint: str = None, tls: bool = True, log_level: str = 'INFO',
+                 pool_size: int = DEFAULT_POOL_SIZE, keep_alive: bool = True,
+                 pool_idle_timeout: int = DEFAULT_POOL_IDLE_TIMEOUT, max_retries: int = params.DEFAULT_RETRY_COUNT,
+                 retry_writes: bool = False, retry_policy: RetryPolicy = None,
+                 rate_limiter: AdaptiveRateLimiter = None, credential_provider: CredentialProvider = None,
+                 compression: RequestCompressor = None, json_codec: JsonCodec = None, coalesce_reads: bool = False,
+                 endpoint_cache: str = None):
+        self._logger = logging.getLogger("AsyncDataAPIClient")
+        self._logger.setLevel(log_level)
+
+        self._stage = stage
+        self._codec = get_codec(json_codec)
+        self._single_flight = AsyncSingleFlight() if coalesce_reads else None
+        if region_name is None:
+            self._region_name = os.getenv("AWS_REGION")
+        else:
+            self._region_name = region_name
+
+        self._access_key = access_key
+        self._secret_key = secret_key
+        self._session_token = session_token
+
+        # without keys, credentials come from a provider which refreshes them before they expire
+        if access_key is None and secret_key is None and credential_provider is None:
+            credential_provider = get_credential_provider()
+
+        # each Client gets its own retry budget unless a shared policy is supplied
+        if retry_policy is None:
+            retry_policy = RetryPolicy(max_retries=max_retries, retry_writes=retry_writes)
+
+        self._control_plane = DataApiControlPlane(tls=tls, region_name=self._region_name,
+                                                  override_url=service_endpoint, endpoint_cache=endpoint_cache)
+
+        self._http_handler = AsyncHttpHelper(host=self._control_plane.get_endpoint(stage), stage=self._stage,
+                                             region=self._region_name, access_key=self._access_key,
+                                             secret_key=self._secret_key, session_token=self._session_token,
+                                             custom_domain=self._control_plane.is_custom_domain(stage),
+                                             logger=self._logger, pool_size=pool_size, keep_alive=keep_alive,
+                                             pool_idle_timeout=pool_idle_timeout, retry_policy=retry_policy,
+                                             rate_limiter=rate_limiter, credential_provider=credential_provider,
+                                             compressor=compression, json_codec=self._codec)
+
+        self._logger.info(f"Bound Async Data API Client in Stage {self._stage} to {self._http_handler.get_base_path()}")
+
+    async def close(self):
+        """Release the pooled HTTP connections held by this Client.
+        """
+        await self._http_handler.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    def _handle_response(self, response):
+        return request_args.handle_response(response, self._codec)
+
+    # concurrent identical reads share one request, so that a hot Item does not cause a thundering herd
+    async def _coalesce(self, key: tuple, load):
+        if self._single_flight is None:
+            return await load()
+
+        return await self._single_flight.do(key, load)
+
+    # reads issued after a write must not be answered by a request sent before it
+    def _written(self, data_type: str, *item_ids):
+        if self._single_flight is not None:
+            self._single_flight.forget(lambda key: key[0] == data_type and key[1] in item_ids)
+
+    async def provision(self, data_type: str, primary_key: str, table_indexes=None, metadata_indexes=None,
+                        delete_mode=None, crawler_rolename=None, schema_validation_refresh_hitcount=None,
+                        graph_endpoint=None, allow_non_item_master_writes=True, strict_occv=False,
+                        catalog_database=None, es_domain=None, es_delivery_role_arn=None, es_delivery_failure_s3=None,
+                        pitr_enabled=True, kms_key_arn=None):
+        """Create a new API endpoint.
+        """
+        body = request_args.provision_body(data_type, primary_key, table_indexes=table_indexes,
+                                           metadata_indexes=metadata_indexes, delete_mode=delete_mode,
+                                           crawler_rolename=crawler_rolename,
+                                           schema_validation_refresh_hitcount=schema_validation_refresh_hitcount,
+                                           graph_endpoint=graph_endpoint,
+                                           allow_non_item_master_writes=allow_non_item_master_writes,
+                                           strict_occv=strict_occv, catalog_database=catalog_database,
+                                           es_domain=es_domain, es_delivery_role_arn=es_delivery_role_arn,
+                                           es_delivery_failure_s3=es_delivery_failure_s3, pitr_enabled=pitr_enabled,
+                                           kms_key_arn=kms_key_arn)
+        return self._handle_response(
+            await self._http_handler.put(data_type=data_type, path="provision", put_body=body))
+
+    async def get_namespaces(self):
+        """ Get all the provisioned namespaces in a given API
+        """
+        return self._handle_response(await self._http_handler.get(data_type=None, path="namespaces"))
+
+    async def get_endpoints(self, data_type: str):
+        """ Get all of the available endpoints for the API Type;
+        """
+        return self._handle_response(await self._http_handler.get(data_type=data_type, path="endpoints"))
+
+    async def get_status(self, data_type: str):
+        """Method to return the status of a Namsepace
+        """
+        return self._handle_response(await self._http_handler.get(data_type=data_type, path="status"))
+
+    async def get_info(self, data_type: str, attribute_filters: list = None):
+        """Method to return Namespace Metadata.
+        """
+        apply_filters = request_args.info_filters(attribute_filters)
+
+        async def _load():
+            return self._handle_response(
+                await self._http_handler.get(data_type=data_type, path="info", query_params=apply_filters))
+
+        key = (data_type, None, "info", tuple(sorted(apply_filters.items())) if apply_filters else ())
+        return await self._coalesce(key, _load)
+
+    async def put_info(self, data_type: str, api_metadata: dict):
+        """Method to create Namespace Metadata."""
+        try:
+            return self._handle_response(
+                await self._http_handler.put(data_type=data_type, path="info", put_body=api_metadata))
+        finally:
+            self._written(data_type, None)
+
+    async def list_items(self, data_type: str, page_size: int = None, start_token: str = None, segment: int = None,
+                         total_segments: int = None):
+        """List items in the API Namespace using pagination and parallel scanning if requested.
+        """
+        args = request_args.list_items_args(page_size=page_size, start_token=start_token, segment=segment,
+                                            total_segments=total_segments)
+
+        return self._handle_response(
+            await self._http_handler.get(data_type=data_type, path="list", query_params=args))
+
+    async def get_schema(self, data_type: str, schema_type: str):
+        """Get the schema for the Namespace's Resources or Metadata.
+        """
+        return self._handle_response(
+            await self._http_handler.get(data_type=data_type, path=f"schema/{schema_type}"))
+
+    async def put_schema(self, data_type: str, schema_type: str, json_schema: dict):
+        """Create a schema for a Namespace Resources or Metadata.
+        """
+        return self._handle_response(
+            await self._http_handler.put(data_type=data_type, path=f"schema/{schema_type}", put_body=json_schema))
+
+    async def delete_schema(self, data_type: str, schema_type: str):
+        """Delete the schema from a Namespace Resource or Metadata.
+        """
+        return self._handle_response(
+            await self._http_handler.delete(data_type=data_type, path=f"schema/{schema_type}"))
+
+    async def set_item_master(self, data_type: str, item_id: str, item_master_id: str):
+        """Link a Resource in the Namespace to an Item Master.
+        """
+        body = request_args.item_master_body(item_id, item_master_id)
+        try:
+            return self._handle_response(
+                await self._http_handler.put(data_type=data_type, path="ItemMaster", put_body=body))
+        finally:
+            self._written(data_type, item_id, item_master_id)
+
+    async def remove_item_master(self, data_type: str, item_id: str, item_master_id: str):
+        """Remove an Item Master reference.
+        """
+        body = request_args.item_master_body(item_id, item_master_id)
+        try:
+            return self._handle_response(
+                await self._http_handler.delete(data_type=data_type, path="ItemMaster", delete_body=body))
+        finally:
+            self._written(data_type, item_id, item_master_id)
+
+    async def find(self, data_type: str, resource_attributes=None, metadata_attributes=None, start_token: str = None,
+                   limit: int = None, consistent_read: bool = None):
+        """Perform a query or scan on the Namespace to find the item based on provided Resource or Metadata attributes.
+        """
+        search_request = request_args.find_request(resource_attributes=resource_attributes,
+                                                   metadata_attributes=metadata_attributes, start_token=start_token,
+                                                   limit=limit, consistent_read=consistent_read)
+
+        return self._handle_response(
+            await self._http_handler.post(data_type=data_type, path="find", post_body=search_request))
+
+    async def validate_item(self, data_type: str, item_id: str):
+        """Check if an Item exists by ID in the Namespace.
+        """
+        return self._handle_response(await self._http_handler.head(data_type=data_type, path=f"{item_id}"))
+
+    async def get_resource(self, data_type: str, item_id: str, item_master_option: str = None,
+                           suppress_metadata_fetch: bool = False, only_attributes: list = None,
+                           not_attributes: list = None):
+        """Get a Resource from the Namespace.
+        """
+        p = request_args.get_resource_args(item_master_option=item_master_option,
+                                           suppress_metadata_fetch=suppress_metadata_fetch,
+                                           only_attributes=only_attributes, not_attributes=not_attributes)
+
+        async def _load():
+            return self._handle_response(
+                await self._http_handler.get(data_type=data_type, path=f"{item_id}", query_params=p))
+
+        return await self._coalesce((data_type, item_id, "resource", tuple(sorted(p.items())) if p else ()), _load)
+
+    async def get_metadata(self, data_type: str, item_id: str):
+        """Get Metadata for an Item in the Namespace.
+        """
+        async def _load():
+            return self._handle_response(await self._http_handler.get(data_type=data_type, path=f"{item_id}/meta"))
+
+        return await self._coalesce((data_type, item_id, "meta", ()), _load)
+
+    async def delete_resource(self, data_type: str, item_id: str, delete_mode: str = None):
+        """Delete an item from the Namespace based upon admin config (tombstone or soft delete).
+        """
+        body = request_args.delete_resource_body(delete_mode)
+        try:
+            return self._handle_response(
+                await self._http_handler.delete(data_type=data_type, path=f"{item_id}", delete_body=body))
+        finally:
+            self._written(data_type, item_id)
+
+    async def delete_metadata(self, data_type: str, item_id: str):
+        """Delete Metadata for an Item from the Namespace.
+        """
+        try:
+            return self._handle_response(
+                await self._http_handler.delete(data_type=data_type, path=f"{item_id}", delete_body={"Metadata": {}}))
+        finally:
+            self._written(data_type, item_id)
+
+    async def restore_item(self, data_type: str, item_id: str):
+        """Restore a deleted Item in the Namespace (only supported after Soft Delete).
+        """
+        try:
+            return self._handle_response(await self._http_handler.put(data_type=data_type, path=f"{item_id}/restore"))
+        finally:
+            self._written(data_type, item_id)
+
+    async def delete_attributes(self, data_type: str, item_id: str, resource_attributes=None,
+                                metadata_attributes=None):
+        """Delete attributes from a Resource or Metadata.
+        """
+        delete = request_args.delete_attributes_body(resource_attributes=resource_attributes,
+                                                     metadata_attributes=metadata_attributes)
+
+        try:
+            return self._handle_response(
+                await self._http_handler.delete(data_type=data_type, path=f"{item_id}", delete_body=delete))
+        finally:
+            self._written(data_type, item_id)
+
+    # private method to perform a put body with the correct path
+    async def _item_write(self, data_type: str, item_id: str, body: dict):
+        try:
+            return self._handle_response(
+                await self._http_handler.put(data_type=data_type, path=f"{item_id}", put_body=body))
+        finally:
+            self._written(data_type, item_id)
+
+    # put a full item that is well formed by the client
+    async def _put_item(self, data_type: str, item_id: str, item: dict, item_version: int = None,
+                        strict_schema: bool = None):
+        item = request_args.prepare_item(item, item_version=item_version, strict_schema=strict_schema)
+
+        return await self._item_write(data_type=data_type, item_id=item_id, body=item)
+
+    async def put_resource(self, data_type: str, item_id: str, resource: dict, item_version: int = None,
+                           strict_schema: bool = False):
+        """Create or update a Resource in the Namespace.
+        """
+        _resource = request_args.resource_item(resource)
+
+        response = await self._put_item(data_type=data_type, item_id=item_id, item=_resource,
+                                        item_version=item_version, strict_schema=strict_schema)
+        return response.get(params.RESOURCE)
+
+    async def put_metadata(self, data_type: str, item_id: str, meta: dict, strict_schema: bool = False):
+        """Create or update Metadata for a Resource in the Namespace
+        """
+        _meta = request_args.metadata_item(meta)
+
+        response = await self._put_item(data_type=data_type, item_id=item_id, item=_meta,
+                                        strict_schema=strict_schema)
+        return response.get(params.METADATA)
+
+    async def put_references(self, data_type: str, item_id: str, references: dict):
+        """Create or update References for a Resource in the Namespace.
+        """
+        _item = request_args.references_item(references)
+
+        response = await self._put_item(data_type=data_type, item_id=item_id, item=_item)
+        return response.get(params.REFERENCES)
+
+    async def lineage_search(self, data_type: str, item_id: str, direction: str, max_depth: int = None):
+        """Perform an upstream or downstream data lineage search.
+        """
+        d, p = request_args.lineage_args(direction, max_depth=max_depth)
+
+        return self._handle_response(
+            await self._http_handler.get(data_type=data_type, path=f"{item_id}/{d}", query_params=p))
+
+    async def start_export(self, data_type: str, export_job_dpu: int, read_pct: int, s3_export_path: str,
+                           log_path: str, setup_crawler: bool = True, kms_key_arn: str = None,
+                           catalog_database: str = None):
+        """Export the contents of a Namespace to S3.
+        """
+        body = request_args.export_body(export_job_dpu, read_pct, s3_export_path, log_path,
+                                        setup_crawler=setup_crawler, kms_key_arn=kms_key_arn,
+                                        catalog_database=catalog_database)
+        return self._handle_response(
+            await self._http_handler.post(data_type=data_type, path="export", post_body=body))
+
+    async def get_export_status(self, data_type: str, job_name: str, job_run_id: str = None):
+        """Get the status of an Export Job.
+        """
+        qp = request_args.export_status_args(job_name, job_run_id=job_run_id)
+
+        return self._handle_response(
+            await self._http_handler.get(data_type=data_type, path="export", query_params=qp))
+
+    async def understand(self, data_type: str, item_id: str, storage_location_attribute: str):
+        """Run an AI powered Metadata resolver against a Resource.
+        """
+        try:
+            return self._handle_response(
+                await self._http_handler.put(data_type=data_type, path=f"{item_id}/understand", put_body={
+                    params.STORAGE_LOCATION_ATTRIBUTE: storage_location_attribute}))
+        finally:
+            self._written(data_type, item_id)
@@ -1,21 +1,43 @@
-from src.lib.http_handler import HttpHelper
+from src.lib.http_handler import HttpHelper, DEFAULT_POOL_SIZE, DEFAULT_POOL_IDLE_TIMEOUT
 from src.lib.data_api_control_plane import DataApiControlPlane
+import src.lib.request_args as request_args
+from src.lib.retry import RetryPolicy
+from src.lib.rate_limiter import AdaptiveRateLimiter
+from src.lib.credentials import CredentialProvider, get_credential_provider
+from src.lib.compression import RequestCompressor
+from src.lib.json_codec import JsonCodec, get_codec
+from src.lib.transport import Transport
+from src.lib.metrics import RequestMetrics, DECODE, detach, bind_operation, label_operations
+from src.lib.single_flight import SingleFlight
+from src.lib.export_poller import ExportJob, ExportPoller, get_export_poller
+from src.lib.records import RecordFactory
+from src.lib.parallel_scan import ParallelScanner, DEFAULT_SCAN_SEGMENTS, DEFAULT_SCAN_BUFFER_PAGES
+from src.lib.paginator import Paginator
+from src.lib.item_cache import ItemCache, RESOURCE, METADATA
+from src.lib.conditional import ValidatorCache, extract_validators
+from src.lib.namespace_cache import NamespaceMetadataCache, NAMESPACES, ENDPOINTS, STATUS, INFO
+from src.lib.schema_cache import SchemaCache, SCHEMA_TYPE_RESOURCE, SCHEMA_TYPE_METADATA
+from src.lib.bulk_writer import BulkWriter, DEFAULT_WRITE_CONCURRENCY, DEFAULT_WRITE_QUEUE_SIZE
 import os
-import json
+import http
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from src.exceptions import *
 import src.parameters as params
-import src.lib.utils as utils
-import http
 import logging
 
 __version__ = "0.9.0b1"
 
+DEFAULT_BATCH_CONCURRENCY = 10
+
 
 class DataAPIClient:
     """AWS Data API Client.
     """
     _primary_key_attr = None
-    _http_handler = None
+    _bound_http_handler = None
+    _handler_args = None
     _stage = None
     _region_name = None
     _credentials = None
@@ -24,95 +46,208 @@ class DataAPIClient:
     _session_token = None
     _control_plane = None
     _logger = None
+    _item_cache = None
+    _validator_cache = None
+    _schema_cache = None
+    _metadata_cache = None
 
     SEARCH_UPSTREAM = 'UP'
     SEARCH_DOWNSTREAM = 'DOWN'
 
     def __init__(self, stage: str, region_name: str = None, access_key: str = None, secret_key: str = None,
-                 session_token: str = None, service_endpoint: str = None, tls: bool = True, log_level: str = 'INFO'):
-        logging.basicConfig()
+                 session_token: str = None, service_endpoint: str = None, tls: bool = True, log_level: str = 'INFO',
+                 pool_size: int = DEFAULT_POOL_SIZE, keep_alive: bool = True,
+                 pool_idle_timeout: int = DEFAULT_POOL_IDLE_TIMEOUT, max_retries: int = params.DEFAULT_RETRY_COUNT,
+                 retry_writes: bool = False, retry_policy: RetryPolicy = None,
+                 rate_limiter: AdaptiveRateLimiter = None, item_cache: ItemCache = None,
+                 validator_cache: ValidatorCache = None, schema_cache: SchemaCache = None,
+                 metadata_cache: NamespaceMetadataCache = None, credential_provider: CredentialProvider = None,
+                 compression: RequestCompressor = None, json_codec: JsonCodec = None, transport: Transport = None,
+                 request_metrics: RequestMetrics = None, coalesce_reads: bool = False,
+                 export_poller: ExportPoller = None, endpoint_cache: str = None):
         self._logger = logging.getLogger("DataAPIClient")
         self._logger.setLevel(log_level)
 
         self._stage = stage
+        self._item_cache = item_cache
+        self._validator_cache = validator_cache
+        self._schema_cache = schema_cache
+        self._metadata_cache = metadata_cache
+        self._codec = get_codec(json_codec)
+        self._record_factory = RecordFactory(self._codec)
+        self._request_metrics = request_metrics
+        if request_metrics is not None:
+            label_operations(self)
+        self._single_flight = SingleFlight() if coalesce_reads else None
+        self._export_poller = export_poller if export_poller is not None else get_export_poller()
         if region_name is None:
             self._region_name = os.getenv("AWS_REGION")
         else:
             self._region_name = region_name
 
-        # resolve credentials
-        if access_key is None and secret_key is None:
-            # use helper module to resolve credentials
-            credentials = utils.get_credentials()
-            self._access_key = credentials.access_key
-            self._secret_key = credentials.secret_key
-            self._session_token = credentials.session_token
-        else:
-            self._access_key = access_key
-            self._secret_key = secret_key
-            self._session_token = session_token
+        self._access_key = access_key
+        self._secret_key = secret_key
+        self._session_token = session_token
 
-        self._control_plane = DataApiControlPlane(tls=tls, region_name=self._region_name,
-                                                  override_url=service_endpoint)
+        # without keys, credentials come from a provider which refreshes them before they expire. It resolves them on
+        # first use, so nothing is looked up until the first request
+        if access_key is None and secret_key is None and credential_provider is None:
+            credential_provider = get_credential_provider()
 
-        self._http_handler = HttpHelper(host=self._control_plane.get_endpoint(stage), stage=self._stage,
-                                        region=self._region_name, access_key=self._access_key,
-                                        secret_key=self._secret_key, session_token=self._session_token,
-                                        custom_domain=self._control_plane.is_custom_domain(stage), logger=self._logger)
+        # each Client gets its own retry budget unless a shared policy is supplied
+        if retry_policy is None:
+            retry_policy = RetryPolicy(max_retries=max_retries, retry_writes=retry_writes)
 
-        print(
-            f"Bound Data API Client in Stage {self._stage} to {self._http_handler.get_base_path()}")
+        self._control_plane = DataApiControlPlane(tls=tls, region_name=self._region_name,
+                                                  override_url=service_endpoint, endpoint_cache=endpoint_cache)
+
+        self._handler_args = dict(pool_size=pool_size, keep_alive=keep_alive, pool_idle_timeout=pool_idle_timeout,
+                                  retry_policy=retry_policy, rate_limiter=rate_limiter,
+                                  credential_provider=credential_provider, compressor=compression,
+                                  json_codec=self._codec, transport=transport, metrics=self._request_metrics)
+        self._bind_lock = threading.Lock()
+
+    @property
+    def _http_handler(self):
+        handler = self._bound_http_handler
+
+        return handler if handler is not None else self._bind()
+
+    @_http_handler.setter
+    def _http_handler(self, handler):
+        self._bound_http_handler = handler
+
+    # resolve the Stage endpoint and build the HTTP handler. This is deferred until the first request, so that
+    # constructing a Client does no I/O
+    def _bind(self):
+        with self._bind_lock:
+            if self._bound_http_handler is None:
+                self._bound_http_handler = HttpHelper(
+                    host=self._control_plane.get_endpoint(self._stage), stage=self._stage,
+                    region=self._region_name, access_key=self._access_key, secret_key=self._secret_key,
+                    session_token=self._session_token, custom_domain=self._control_plane.is_custom_domain(self._stage),
+                    logger=self._logger, **self._handler_args)
+
+                self._logger.debug(
+                    f"Bound Data API Client in Stage {self._stage} to {self._bound_http_handler.get_base_path()}")
+
+            return self._bound_http_handler
+
+    def close(self):
+        """Release the pooled HTTP connections held by this Client.
+        """
+        if self._bound_http_handler is not None:
+            self._bound_http_handler.close()
 
     def _handle_response(self, response):
-        if response.status_code in [http.HTTPStatus.CREATED, http.HTTPStatus.ACCEPTED]:
-            if response.content is not None:
-                content_body = json.loads(response.content)
-
-                if content_body is not None:
-                    return content_body
-
-            return True
-        elif response.status_code == http.HTTPStatus.NOT_MODIFIED:
-            return False
-        elif response.status_code == http.HTTPStatus.NO_CONTENT:
-            return None
-        elif response.status_code == http.HTTPStatus.BAD_REQUEST:
-            raise InvalidArgumentsException()
-        elif response.status_code == http.HTTPStatus.NOT_FOUND:
-            raise ResourceNotFoundException()
-        elif response.status_code == http.HTTPStatus.CONFLICT:
-            raise ConstraintViolationException()
-        elif response.status_code == http.HTTPStatus.INTERNAL_SERVER_ERROR:
-            raise Exception(response.reason)
-        elif response.status_code != http.HTTPStatus.OK:
-            message = response.reason
-
-            if "content" in response:
-                content_body = json.loads(response.get("content"))
-                if "Message" in content_body:
-                    message = content_body.get("Message")
-                else:
-                    return content_body
-
-            raise DetailedException(message)
-        else:
-            if response is None:
-                return None
-            else:
-                if response.text is not None and response.text != '':
-                    return response.json()
-                else:
-                    return True
+        event = detach(response)
+        if event is None:
+            return request_args.handle_response(response, self._codec)
 
-    def _validate_item_structure(self, structure, omit=None):
-        valid_top_level = ["Resource", "Metadata", "References"]
+        start = time.perf_counter()
+        try:
+            return request_args.handle_response(response, self._codec)
+        finally:
+            event.add(DECODE, time.perf_counter() - start)
+            self._request_metrics.record(event)
+
+    def metrics(self, reset: bool = False):
+        """Get the number of calls, errors, retries and bytes sent and received by each Client method, with latency
+        percentiles of each phase of its requests, or None if the Client has no request_metrics. With reset, the counts
+        and histograms are cleared.
+        """
+        return self._request_metrics.snapshot(reset=reset) if self._request_metrics is not None else None
+
+    def _namespace_read(self, kind: str, data_type: str, load):
+        if self._metadata_cache is None:
+            return load()
+
+        return self._metadata_cache.get((self._http_handler.get_base_path(), kind, data_type), load)
+
+    def refresh_namespace_metadata(self, data_type: str = None):
+        """Drop cached Namespace info, endpoints and status for a Namespace (or all Namespaces), so that they are
+        fetched from the API on next use.
+        """
+        if self._metadata_cache is not None:
+            self._metadata_cache.invalidate(api=self._http_handler.get_base_path(), data_type=data_type)
+
+            if data_type is not None:
+                self._metadata_cache.invalidate(api=self._http_handler.get_base_path(), kind=NAMESPACES)
+
+    def _read_item(self, data_type: str, item_id: str, kind: str, path: str, query_params: dict = None):
+        key = (self._stage, data_type, item_id, kind, tuple(sorted(query_params.items())) if query_params else ())
+
+        if self._item_cache is not None:
+            value = self._item_cache.get(key)
+
+            if value is not None:
+                return value
+
+        def _load():
+            if self._item_cache is None:
+                return self._conditional_get(key, data_type, path, query_params)
+
+            # a write made while the read is in flight invalidates the load, so that it does not cache the old Item
+            load = self._item_cache.start_load(key)
+            try:
+                value = self._conditional_get(key, data_type, path, query_params)
+
+                if value is not None:
+                    self._item_cache.put(key, value, load=load)
+
+                return value
+            finally:
+                self._item_cache.end_load(load)
 
-        if omit is not None:
-            for o in omit:
-                valid_top_level.pop(o)
+        return self._coalesce(key, _load)
 
-        if not any([x in structure for x in valid_top_level]):
-            raise InvalidArgumentsException("Item must include Resource, Metadata, or References")
+    # concurrent identical reads share one request, so that an expired hot Item does not cause a thundering herd
+    def _coalesce(self, key: tuple, load):
+        if self._single_flight is None:
+            return load()
+
+        return self._single_flight.do(key, load)
+
+    # GET which revalidates the body held from the last read of the key, if there is one, rather than downloading it
+    def _conditional_get(self, key: tuple, data_type: str, path: str, query_params: dict = None):
+        if self._validator_cache is None:
+            return self._handle_response(
+                self._http_handler.get(data_type=data_type, path=path, query_params=query_params))
+
+        held = self._validator_cache.get(key)
+        response = self._http_handler.get(data_type=data_type, path=path, query_params=query_params,
+                                          headers=held[0] if held is not None else None)
+
+        if response.status_code == http.HTTPStatus.NOT_MODIFIED and held is not None:
+            event = detach(response)
+            if event is not None:
+                self._request_metrics.record(event)
+
+            return self._validator_cache.not_modified_body(held[1])
+
+        value = self._handle_response(response)
+        self._validator_cache.put(key, extract_validators(response, value, self._validator_cache.derive_validators),
+                                  value)
+
+        return value
+
+    def _invalidate(self, data_type: str, *item_ids):
+        # drop held validators too, as LastUpdateDate only has a resolution of one second
+        for cache in (self._item_cache, self._validator_cache):
+            if cache is not None:
+                for item_id in item_ids:
+                    cache.invalidate(self._stage, data_type, item_id)
+
+        if self._single_flight is not None:
+            self._single_flight.forget(lambda key: key[:2] == (self._stage, data_type) and key[2] in item_ids)
+
+    def cache_statistics(self):
+        """Get the hit, miss, eviction and invalidation counts of the Item cache, or None if the Client has no cache.
+        """
+        return self._item_cache.statistics() if self._item_cache is not None else None
+
+    def _validate_item_structure(self, structure, omit=None):
+        request_args.validate_item_structure(structure, omit=omit)
 
     def provision(self, data_type: str, primary_key: str, table_indexes=None, metadata_indexes=None, delete_mode=None,
                   crawler_rolename=None, schema_validation_refresh_hitcount=None,
@@ -121,87 +256,130 @@ class DataAPIClient:
                   kms_key_arn=None):
         """Create a new API endpoint.
         """
+        body = request_args.provision_body(data_type, primary_key, table_indexes=table_indexes,
+                                           metadata_indexes=metadata_indexes, delete_mode=delete_mode,
+                                           crawler_rolename=crawler_rolename,
+                                           schema_validation_refresh_hitcount=schema_validation_refresh_hitcount,
+                                           graph_endpoint=graph_endpoint,
+                                           allow_non_item_master_writes=allow_non_item_master_writes,
+                                           strict_occv=strict_occv, catalog_database=catalog_database,
+                                           es_domain=es_domain, es_delivery_role_arn=es_delivery_role_arn,
+                                           es_delivery_failure_s3=es_delivery_failure_s3, pitr_enabled=pitr_enabled,
+                                           kms_key_arn=kms_key_arn)
         # return PUT /provision
-        body = {
-            params.DATA_TYPE: data_type,
-            params.PRIMARY_KEY: primary_key,
-            params.TABLE_INDEXES: table_indexes,
-            params.METADATA_INDEXES: metadata_indexes,
-            params.DELETE_MODE: delete_mode,
-            params.CRAWLER_ROLENAME: crawler_rolename,
-            params.SCHEMA_VALIDATION_REFRESH_HITCOUNT: schema_validation_refresh_hitcount,
-            params.GREMLIN_ADDRESS: graph_endpoint,
-            params.NON_ITEM_MASTER_WRITES_ALLOWED: allow_non_item_master_writes,
-            params.STRICT_OCCV: strict_occv,
-            params.CATALOG_DATABASE: catalog_database,
-            params.ES_DOMAIN: es_domain,
-            params.FIREHOSE_DELIVERY_ROLE_ARN: es_delivery_role_arn,
-            params.DELIVERY_STREAM_FAILURE_BUCKET: es_delivery_failure_s3,
-            params.PITR_ENABLED: pitr_enabled,
-            params.KMS_KEY_ARN: kms_key_arn
-        }
-        return self._handle_response(self._http_handler.put(data_type=data_type, path="provision"), put_body=body)
+        try:
+            return self._handle_response(
+                self._http_handler.put(data_type=data_type, path="provision", put_body=body))
+        finally:
+            self.refresh_namespace_metadata(data_type)
 
     def get_namespaces(self):
         """ Get all the provisioned namespaces in a given API
         """
         # return GET /namespaces
-        return self._handle_response(self._http_handler.get(data_type=None, path="namespaces"))
+        return self._namespace_read(NAMESPACES, None, lambda: self._handle_response(
+            self._http_handler.get(data_type=None, path="namespaces")))
 
     def get_endpoints(self, data_type: str):
         """ Get all of the available endpoints for the API Type;
         """
         # return GET /endpoints
-        return self._handle_response(self._http_handler.get(data_type=data_type, path="endpoints"))
+        return self._namespace_read(ENDPOINTS, data_type, lambda: self._handle_response(
+            self._http_handler.get(data_type=data_type, path="endpoints")))
 
     def get_status(self, data_type: str):
         """Method to return the status of a Namsepace
         """
         # return GET /status
-        return self._handle_response(self._http_handler.get(data_type=data_type, path="status"))
+        return self._namespace_read(STATUS, data_type, lambda: self._handle_response(
+            self._http_handler.get(data_type=data_type, path="status")))
 
     def get_info(self, data_type: str, attribute_filters: list = None):
         """Method to return Namespace Metadata.
         """
-        apply_filters = None
+        apply_filters = request_args.info_filters(attribute_filters)
+
+        if self._metadata_cache is not None:
+            # filters are applied to the cached full document, so that every subset shares one entry
+            info = self._namespace_read(INFO, data_type, lambda: self._handle_response(
+                self._http_handler.get(data_type=data_type, path="info")))
 
-        if attribute_filters is not None:
-            apply_filters = {
-                params.ATTRIBUTE_FILTER_PARAM: ','.join(attribute_filters)
-            }
+            if apply_filters is not None and isinstance(info, dict):
+                return {k: info.get(k) for k in attribute_filters if k in info}
+            else:
+                return info
 
         # return GET /info
-        return self._handle_response(
-            self._http_handler.get(data_type=data_type, path="info", query_params=apply_filters))
+        key = (self._stage, data_type, None, INFO, tuple(sorted(apply_filters.items())) if apply_filters else ())
+        return self._coalesce(key, lambda: self._handle_response(
+            self._http_handler.get(data_type=data_type, path="info", query_params=apply_filters)))
 
     def put_info(self, data_type: str, api_metadata: dict):
         """Method to create Namespace Metadata."""
         # return PUT /info
-        return self._handle_response(self._http_handler.put(data_type=data_type, path="info", put_body=api_metadata))
-
-    def list_items(self, data_type: str, page_size: int = None, start_token: str = None, segment: int = None,
-                   total_segments: int = None):
-        """List items in the API Namespace using pagination and parallel scanning if requested.
-        """
-        # validate args
-        args = {}
         try:
-            args[params.QUERY_PARAM_LIMIT] = int(page_size)
-            if segment is not None:
-                args[params.QUERY_PARAM_SEGMENT] = int(segment)
-            if total_segments is not None:
-                args[params.QUERY_PARAM_TOTAL_SEGMENTS] = int(total_segments)
-        except ValueError as e:
-            raise InvalidArgumentsException("Invalid Value for page_size, segment, or total_segments. Must be Int")
+            return self._handle_response(
+                self._http_handler.put(data_type=data_type, path="info", put_body=api_metadata))
+        finally:
+            self.refresh_namespace_metadata(data_type)
+
+            if self._single_flight is not None:
+                self._single_flight.forget(lambda key: key[:2] == (self._stage, data_type) and key[3] == INFO)
+
+    def _handle_page(self, response, stream: bool, compact: bool):
+        make_record = self._record_factory.make if compact else None
 
-        if segment is not None and total_segments is None:
-            raise InvalidArgumentsException("Parallel List requires segment and total_segments")
+        if stream:
+            return request_args.handle_streaming_response(response, transform=make_record, codec=self._codec)
 
-        if start_token is not None:
-            args[params.EXCLUSIVE_START_KEY] = start_token
+        page = self._handle_response(response)
+        if make_record is not None and isinstance(page, dict) and page.get("Items") is not None:
+            page["Items"] = [make_record(item) for item in page.get("Items")]
+
+        return page
+
+    def list_items(self, data_type: str, page_size: int = None, start_token: str = None, segment: int = None,
+                   total_segments: int = None, stream: bool = False, compact: bool = False):
+        """List items in the API Namespace using pagination and parallel scanning if requested. With stream, the page
+        is returned as a StreamingPage whose Items are decoded as the response arrives. With compact, Items are
+        returned as ItemRecords rather than dicts, which hold about 60% less memory but take about three times as
+        much CPU to build, and decode a nested section again every time it is read.
+        """
+        args = request_args.list_items_args(page_size=page_size, start_token=start_token, segment=segment,
+                                            total_segments=total_segments)
 
         # return GET /list
-        return self._handle_response(self._http_handler.get(data_type=data_type, path="list", query_params=args))
+        return self._handle_page(
+            self._http_handler.get(data_type=data_type, path="list", query_params=args, stream=stream), stream,
+            compact)
+
+    def iter_items(self, data_type: str, page_size: int = params.DEFAULT_MAX_RESPONSE_SIZE, start_token: str = None,
+                   max_items: int = None, max_pages: int = None, prefetch: bool = True, stream: bool = False,
+                   compact: bool = False):
+        """Iterate over all items in the API Namespace, fetching the next page in the background while the current
+        page is processed. With stream, each page is decoded one Item at a time instead, and pages are not prefetched.
+        """
+        def _fetch_page(token):
+            return self.list_items(data_type=data_type, page_size=page_size, start_token=token, stream=stream,
+                                   compact=compact)
+
+        return Paginator(bind_operation(_fetch_page), start_token=start_token, max_items=max_items,
+                         max_pages=max_pages, prefetch=prefetch and not stream)
+
+    def scan_all(self, data_type: str, total_segments: int = DEFAULT_SCAN_SEGMENTS,
+                 page_size: int = params.DEFAULT_MAX_RESPONSE_SIZE, ordered: bool = False,
+                 buffer_pages: int = DEFAULT_SCAN_BUFFER_PAGES, max_workers: int = None, progress_callback=None,
+                 compact: bool = False):
+        """Scan the whole API Namespace, running all segments of a parallel list concurrently and yielding Items as
+        they arrive. With compact, Items are yielded as ItemRecords rather than dicts.
+        """
+        def _list_page(segment, start_token):
+            return self.list_items(data_type=data_type, page_size=page_size, start_token=start_token,
+                                   segment=segment, total_segments=total_segments, compact=compact)
+
+        return iter(ParallelScanner(bind_operation(_list_page), total_segments=total_segments, ordered=ordered,
+                                    buffer_pages=buffer_pages, max_workers=max_workers,
+                                    progress_callback=progress_callback))
 
     def get_schema(self, data_type: str, schema_type: str):
         """Get the schema for the Namespace's Resources or Metadata.
@@ -213,73 +391,90 @@ class DataAPIClient:
         """Create a schema for a Namespace Resources or Metadata.
         """
         # return PUT /schema/{schema_type}
-        return self._handle_response(
-            self._http_handler.put(data_type=data_type, path=f"schema/{schema_type}", put_body=json_schema))
+        try:
+            return self._handle_response(
+                self._http_handler.put(data_type=data_type, path=f"schema/{schema_type}", put_body=json_schema))
+        finally:
+            self._invalidate_schema(data_type, schema_type)
 
     def delete_schema(self, data_type: str, schema_type: str):
         """Delete the schema from a Namespace Resource or Metadata.
         """
         # return DELETE /schema/{schema_type}
-        return self._handle_response(self._http_handler.delete(data_type=data_type, path=f"schema/{schema_type}"))
+        try:
+            return self._handle_response(
+                self._http_handler.delete(data_type=data_type, path=f"schema/{schema_type}"))
+        finally:
+            self._invalidate_schema(data_type, schema_type)
+
+    def _invalidate_schema(self, data_type: str, schema_type: str):
+        if self._schema_cache is not None:
+            self._schema_cache.invalidate((self._stage, data_type, schema_type.lower()))
+
+    # check each section of an Item against the Namespace schema before it is sent to the API
+    def _validate_schema(self, data_type: str, item: dict):
+        for section, schema_type in ((params.RESOURCE, SCHEMA_TYPE_RESOURCE), (params.METADATA, SCHEMA_TYPE_METADATA)):
+            if item.get(section) is not None:
+                self._schema_cache.validate((self._stage, data_type, schema_type),
+                                            lambda: self.get_schema(data_type=data_type, schema_type=schema_type),
+                                            item.get(section))
 
     def set_item_master(self, data_type: str, item_id: str, item_master_id: str):
         """Link a Resource in the Namespace to an Item Master.
         """
         # return PUT /ItemMaster
-        body = {
-            "id": item_id,
-            "ItemMasterID": item_master_id
-        }
-        return self._handle_response(self._http_handler.put(data_type=data_type, path="ItemMaster", put_body=body))
+        body = request_args.item_master_body(item_id, item_master_id)
+        try:
+            return self._handle_response(
+                self._http_handler.put(data_type=data_type, path="ItemMaster", put_body=body))
+        finally:
+            self._invalidate(data_type, item_id, item_master_id)
 
     def remove_item_master(self, data_type: str, item_id: str, item_master_id: str):
         """Remove an Item Master reference.
         """
         # return DELETE /ItemMaster with correct payload
-        body = {
-            "id": item_id,
-            "ItemMasterID": item_master_id
-        }
-        return self._handle_response(
-            self._http_handler.delete(data_type=data_type, path="ItemMaster", delete_body=body))
+        body = request_args.item_master_body(item_id, item_master_id)
+        try:
+            return self._handle_response(
+                self._http_handler.delete(data_type=data_type, path="ItemMaster", delete_body=body))
+        finally:
+            self._invalidate(data_type, item_id, item_master_id)
 
     def find(self, data_type: str, resource_attributes=None, metadata_attributes=None, start_token: str = None,
              limit: int = None,
-             consistent_read: bool = None):
+             consistent_read: bool = None, stream: bool = False, compact: bool = False):
         """Perform a query or scan on the Namespace to find the item based on provided Resource or Metadata attributes.
+        With stream, the page is returned as a StreamingPage whose Items are decoded as the response arrives. With
+        compact, Items are returned as ItemRecords rather than dicts, which hold about 60% less memory but take about
+        three times as much CPU to build, and decode a nested section again every time it is read.
         """
-        if resource_attributes is not None and metadata_attributes is not None:
-            raise InvalidArgumentsException("Provide Resource or Metadata attributes to search, but not both")
+        search_request = request_args.find_request(resource_attributes=resource_attributes,
+                                                   metadata_attributes=metadata_attributes, start_token=start_token,
+                                                   limit=limit, consistent_read=consistent_read)
 
-        if limit is not None and not isinstance(limit, int):
-            raise InvalidArgumentsException("Limit must be an Integer")
-
-        if consistent_read is not None and not isinstance(consistent_read, bool):
-            raise InvalidArgumentsException("Consistent Read must be a Boolean")
-
-        search_request = {}
-        if resource_attributes is not None and not isinstance(resource_attributes, dict):
-            raise InvalidArgumentsException("Resource Attributes must be a Dictionary")
-        else:
-            search_request[params.RESOURCE] = resource_attributes
-
-        if metadata_attributes is not None and not isinstance(metadata_attributes, dict):
-            raise InvalidArgumentsException("Metadata Attributes must be a Dictionary")
-        else:
-            search_request[params.METADATA] = metadata_attributes
-
-        if start_token is not None:
-            search_request[params.EXCLUSIVE_START_KEY] = start_token
+        # return POST /find
+        return self._handle_page(
+            self._http_handler.post(data_type=data_type, path="find", post_body=search_request, stream=stream), stream,
+            compact)
+
+    def iter_find(self, data_type: str, resource_attributes=None, metadata_attributes=None, start_token: str = None,
+                  limit: int = None, consistent_read: bool = None, max_items: int = None, max_pages: int = None,
+                  prefetch: bool = True, stream: bool = False, compact: bool = False):
+        """Iterate over all items matching a find request, fetching the next page in the background while the current
+        page is processed. With stream, each page is decoded one Item at a time instead, and pages are not prefetched.
+        """
+        # validate eagerly, rather than on the first page fetch
+        request_args.find_request(resource_attributes=resource_attributes, metadata_attributes=metadata_attributes,
+                                  limit=limit, consistent_read=consistent_read)
 
-        if limit is not None:
-            search_request[params.QUERY_PARAM_LIMIT] = limit
+        def _fetch_page(token):
+            return self.find(data_type=data_type, resource_attributes=resource_attributes,
+                             metadata_attributes=metadata_attributes, start_token=token, limit=limit,
+                             consistent_read=consistent_read, stream=stream, compact=compact)
 
-        if consistent_read is not None and consistent_read is True:
-            search_request[params.QUERY_PARAM_CONSISTENT] = "True"
-
-        # return POST /find
-        return self._handle_response(
-            self._http_handler.post(data_type=data_type, path="find", post_body=search_request))
+        return Paginator(bind_operation(_fetch_page), start_token=start_token, max_items=max_items,
+                         max_pages=max_pages, prefetch=prefetch and not stream)
 
     def validate_item(self, data_type: str, item_id: str):
         """Check if an Item exists by ID in the Namespace.
@@ -290,95 +485,103 @@ class DataAPIClient:
                      suppress_metadata_fetch: bool = False, only_attributes: list = None, not_attributes: list = None):
         """Get a Resource from the Namespace.
         """
-        p = {}
-        if item_master_option is not None:
-            if item_master_option.lower() not in [params.ITEM_MASTER_INCLUDE.lower(),
-                                                  params.ITEM_MASTER_PREFER.lower()]:
-                raise InvalidArgumentsException(
-                    f"Item Master option should be {params.ITEM_MASTER_PREFER} or {params.ITEM_MASTER_INCLUDE}")
-            p[params.ITEM_MASTER_QP] = item_master_option
+        p = request_args.get_resource_args(item_master_option=item_master_option,
+                                           suppress_metadata_fetch=suppress_metadata_fetch,
+                                           only_attributes=only_attributes, not_attributes=not_attributes)
+
+        return self._read_item(data_type, item_id, RESOURCE, path=f"{item_id}", query_params=p)
 
-        if suppress_metadata_fetch is not None:
-            p[params.SUPPRESS_ITEM_METADATA_FETCH] = suppress_metadata_fetch
+    def get_resources(self, data_type: str, item_ids: list, max_concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+                      item_master_option: str = None, suppress_metadata_fetch: bool = False,
+                      only_attributes: list = None, not_attributes: list = None):
+        """Get many Resources from the Namespace concurrently. Results are returned in the order of item_ids, with a
+        ResourceNotFoundException in place of any Item that does not exist.
+        """
+        if not isinstance(max_concurrency, int) or max_concurrency < 1:
+            raise InvalidArgumentsException("Max Concurrency must be a positive Integer")
 
-        if only_attributes is not None:
-            p[params.WHITELIST_ATTRIBUTES] = ",".join(only_attributes)
+        # validate the shared arguments once, rather than in every worker
+        request_args.get_resource_args(item_master_option=item_master_option,
+                                       suppress_metadata_fetch=suppress_metadata_fetch,
+                                       only_attributes=only_attributes, not_attributes=not_attributes)
 
-        if not_attributes is not None:
-            p[params.BLACKLIST_ATTRIBUTES] = ",".join(not_attributes)
+        def _get(item_id):
+            try:
+                return self.get_resource(data_type=data_type, item_id=item_id, item_master_option=item_master_option,
+                                         suppress_metadata_fetch=suppress_metadata_fetch,
+                                         only_attributes=only_attributes, not_attributes=not_attributes)
+            except ResourceNotFoundException:
+                return ResourceNotFoundException(f"Resource {item_id} Not Found")
 
-        return self._handle_response(self._http_handler.get(data_type=data_type, path=f"{item_id}", query_params=p))
+        # workers beyond the connection pool would only queue for a connection, or open one that is then discarded
+        workers = min(max_concurrency, self._handler_args.get("pool_size"))
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="DataAPIBatchGet") as pool:
+            return list(pool.map(bind_operation(_get), item_ids))
 
     def get_metadata(self, data_type: str, item_id: str):
         """Get Metadata for an Item in the Namespace.
         """
         # return GET /id/meta
-        return self._handle_response(self._http_handler.get(data_type=data_type, path=f"{item_id}/meta"))
+        return self._read_item(data_type, item_id, METADATA, path=f"{item_id}/meta")
 
     def delete_resource(self, data_type: str, item_id: str, delete_mode: str = None):
         """Delete an item from the Namespace based upon admin config (tombstone or soft delete).
         """
         # return DELETE /{id}
-        body = {}
-        if delete_mode is not None:
-            body[params.DELETE_MODE] = delete_mode
-        return self._handle_response(
-            self._http_handler.delete(data_type=data_type, path=f"{item_id}", delete_body=body))
+        body = request_args.delete_resource_body(delete_mode)
+        try:
+            return self._handle_response(
+                self._http_handler.delete(data_type=data_type, path=f"{item_id}", delete_body=body))
+        finally:
+            self._invalidate(data_type, item_id)
 
     def delete_metadata(self, data_type: str, item_id: str):
         """Delete Metadata for an Item from the Namespace.
         """
-        return self._handle_response(
-            self._http_handler.delete(data_type=data_type, path=f"{item_id}", delete_body={"Metadata": {}}))
+        try:
+            return self._handle_response(
+                self._http_handler.delete(data_type=data_type, path=f"{item_id}", delete_body={"Metadata": {}}))
+        finally:
+            self._invalidate(data_type, item_id)
 
     def restore_item(self, data_type: str, item_id: str):
         """Restore a deleted Item in the Namespace (only supported after Soft Delete).
         """
         # return PUT /restore
-        return self._handle_response(self._http_handler.put(data_type=data_type, path=f"{item_id}/restore"))
+        try:
+            return self._handle_response(self._http_handler.put(data_type=data_type, path=f"{item_id}/restore"))
+        finally:
+            self._invalidate(data_type, item_id)
 
     def delete_attributes(self, data_type: str, item_id: str, resource_attributes=None, metadata_attributes=None):
         """Delete attributes from a Resource or Metadata.
         """
-        # validate that at least 1 attribute list has been provided and their type is list
-        if (resource_attributes is None and metadata_attributes is None) or \
-                (resource_attributes is not None and not isinstance(resource_attributes, list)) or \
-                (metadata_attributes is not None and not isinstance(metadata_attributes, list)) or \
-                (resource_attributes is not None and len(resource_attributes) == 0) or \
-                (metadata_attributes is not None and len(metadata_attributes) == 0):
-            raise InvalidArgumentsException("Provide either Resource or Metadata attributes to remove")
-
-        delete = {}
-        if resource_attributes is not None:
-            delete["Resource"] = resource_attributes
-
-        if metadata_attributes is not None:
-            delete["Metadata"] = metadata_attributes
+        delete = request_args.delete_attributes_body(resource_attributes=resource_attributes,
+                                                     metadata_attributes=metadata_attributes)
 
         # return DELETE /{id}
-        return self._handle_response(
-            self._http_handler.delete(data_type=data_type, path=f"{item_id}", delete_body=delete))
+        try:
+            return self._handle_response(
+                self._http_handler.delete(data_type=data_type, path=f"{item_id}", delete_body=delete))
+        finally:
+            self._invalidate(data_type, item_id)
 
-    # private method to perform a put body with the correct path
+    # private method to perform a put body with the correct path. Every write to an Item comes through here, and
+    # drops any cached reads of it whether or not the write succeeded, as a failed write may still have been applied
     def _item_write(self, data_type: str, item_id: str, body: dict):
-        return self._handle_response(self._http_handler.put(data_type=data_type, path=f"{item_id}", put_body=body))
+        try:
+            return self._handle_response(
+                self._http_handler.put(data_type=data_type, path=f"{item_id}", put_body=body))
+        finally:
+            self._invalidate(data_type, item_id)
 
     # put a full item that is well formed by the client
     def _put_item(self, data_type: str, item_id: str, item: dict, item_version: int = None, strict_schema: bool = None):
-        # ensure the item is well formed
-        self._validate_item_structure(item)
+        item = request_args.prepare_item(item, item_version=item_version, strict_schema=strict_schema)
 
-        if item_version is not None:
-            if not isinstance(item_version, int):
-                raise InvalidArgumentsException("Item Version must be an Integer")
-            else:
-                # ensure that the value of the item version is set correctly
-                iv = "ItemVersion"
-                item.pop(iv)
-                item[iv] = item_version
-
-        if strict_schema is not None and isinstance(strict_schema, bool) and strict_schema is True:
-            item["StrictSchemaValidation"] = 'True'
+        if strict_schema is True and self._schema_cache is not None:
+            self._validate_schema(data_type, item)
 
         # write the item structure
         return self._item_write(data_type=data_type, item_id=item_id, body=item)
@@ -387,10 +590,7 @@ class DataAPIClient:
                      strict_schema: bool = False):
         """Create or update a Resource in the Namespace.
         """
-        if params.RESOURCE in resource:
-            _resource = resource
-        else:
-            _resource = {params.RESOURCE: resource}
+        _resource = request_args.resource_item(resource)
 
         return self._put_item(data_type=data_type, item_id=item_id, item=_resource, item_version=item_version,
                               strict_schema=strict_schema).get(
@@ -399,72 +599,70 @@ class DataAPIClient:
     def put_metadata(self, data_type: str, item_id: str, meta: dict, strict_schema: bool = False):
         """Create or update Metadata for a Resource in the Namespace
         """
-        if params.METADATA in meta:
-            _meta = meta
-        else:
-            _meta = {params.METADATA: meta}
+        _meta = request_args.metadata_item(meta)
 
         # remove the primary key from the item
         return self._put_item(data_type=data_type, item_id=item_id, item=_meta,
                               strict_schema=strict_schema).get(params.METADATA)
 
+    def bulk_writer(self, concurrency: int = DEFAULT_WRITE_CONCURRENCY, queue_size: int = DEFAULT_WRITE_QUEUE_SIZE):
+        """Create a BulkWriter which writes Resources and Metadata through this Client from a pool of worker threads.
+        """
+        return BulkWriter(self, concurrency=concurrency, queue_size=queue_size, logger=self._logger)
+
     def put_references(self, data_type: str, item_id: str, references: dict):
         """Create or update References for a Resource in the Namespace.
         """
-        if params.REFERENCES in references:
-            _item = references
-        else:
-            _item = {params.REFERENCES: [references]}
+        _item = request_args.references_item(references)
 
         return self._put_item(data_type=data_type, item_id=item_id, item=_item).get(params.REFERENCES)
 
     def lineage_search(self, data_type: str, item_id: str, direction: str, max_depth: int = None):
         """Perform an upstream or downstream data lineage search.
         """
-        p = None
-        if max_depth is not None:
-            if not isinstance(max_depth, int):
-                raise InvalidArgumentsException("Max Depth must be an Integer")
-            else:
-                p = {"search_depth": max_depth}
-
-        if direction.upper() == 'UP':
-            d = "upstream"
-        else:
-            d = "downstream"
+        d, p = request_args.lineage_args(direction, max_depth=max_depth)
 
         # return GET /upstream or /downstream
         return self._handle_response(self._http_handler.get(data_type=data_type, path=f"{item_id}/{d}", query_params=p))
 
     def start_export(self, data_type: str, export_job_dpu: int, read_pct: int, s3_export_path: str, log_path: str,
                      setup_crawler: bool = True, kms_key_arn: str = None,
-                     catalog_database: str = None):
-        """Export the contents of a Namespace to S3.
-        """
-        body = {
-            params.EXPORT_JOB_DPU: export_job_dpu,
-            params.EXPORT_READ_PCT: read_pct,
-            params.EXPORT_S3_PATH: s3_export_path,
-            params.EXPORT_LOG_PATH: log_path,
-            params.EXPORT_SETUP_CRAWLER: setup_crawler,
-            params.KMS_KEY_ARN: kms_key_arn,
-            params.CATALOG_DATABASE: catalog_database
-        }
-        return self._handle_response(self._http_handler.post(data_type=data_type, path="export", post_body=body))
+                     catalog_database: str = None, as_job: bool = False):
+        """Export the contents of a Namespace to S3. With as_job, an ExportJob future is returned, which completes
+        when the export does and is tracked by the Client's export poller.
+        """
+        body = request_args.export_body(export_job_dpu, read_pct, s3_export_path, log_path,
+                                        setup_crawler=setup_crawler, kms_key_arn=kms_key_arn,
+                                        catalog_database=catalog_database)
+        response = self._handle_response(self._http_handler.post(data_type=data_type, path="export", post_body=body))
+
+        if not as_job:
+            return response
+
+        job_run_id = response.get("JobRunId", response.get(params.JOB_RUN_PARAM)) if isinstance(response, dict) \
+            else None
+        if job_run_id is None:
+            raise DetailedException("Export Job was not started", detail=response)
+
+        job = ExportJob(self.get_export_status, data_type, response.get(params.JOB_NAME_PARAM), job_run_id,
+                        status=response.get("Status"))
+
+        return self._export_poller.track(job)
 
     def get_export_status(self, data_type: str, job_name: str, job_run_id: str = None):
         """Get the status of an Export Job.
         """
-        qp = {params.JOB_NAME_PARAM: job_name}
-
-        if job_run_id is not None:
-            qp[params.JOB_RUN_PARAM] = job_run_id
+        qp = request_args.export_status_args(job_name, job_run_id=job_run_id)
 
         return self._handle_response(self._http_handler.get(data_type=data_type, path="export", query_params=qp))
 
     def understand(self, data_type: str, item_id: str, storage_location_attribute: str):
         """Run an AI powered Metadata resolver against a Resource.
         """
-        return self._handle_response(
-            self._http_handler.put(data_type=data_type, path=f"{item_id}/understand", put_body={
-                params.STORAGE_LOCATION_ATTRIBUTE: storage_location_attribute}))
+        # the resolved Metadata is written to the Item
+        try:
+            return self._handle_response(
+                self._http_handler.put(data_type=data_type, path=f"{item_id}/understand", put_body={
+                    params.STORAGE_LOCATION_ATTRIBUTE: storage_location_attribute}))
+        finally:
+            self._invalidate(data_type, item_id)
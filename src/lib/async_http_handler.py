@@ -0,0 +1,148 @@
+import asyncio
+import logging
+from src.lib.http_handler import BaseHttpHelper, DEFAULT_POOL_SIZE, DEFAULT_POOL_IDLE_TIMEOUT
+from src.lib.retry import RetryPolicy
+from src.lib.rate_limiter import AdaptiveRateLimiter
+from src.lib.credentials import CredentialProvider
+from src.lib.compression import RequestCompressor
+from src.lib.json_codec import JsonCodec
+from src.lib.transport import BufferedResponse
+
+try:
+    import aiohttp
+    from yarl import URL
+except ImportError:
+    aiohttp = None
+
+
+class AsyncHttpHelper(BaseHttpHelper):
+    """asyncio version of the HttpHelper, backed by a pooled aiohttp session.
+
+    The session is created on first use so that it binds to the event loop that issues the requests. Credentials that
+    have not been resolved yet, or have expired, are resolved on the default executor rather than on the event loop.
+    """
+    _session = None
+
+    def __init__(self, host, stage, region, access_key, secret_key, session_token, custom_domain: bool = False,
+                 logger: logging.Logger = None, pool_size: int = DEFAULT_POOL_SIZE, keep_alive: bool = True,
+                 pool_idle_timeout: int = DEFAULT_POOL_IDLE_TIMEOUT, retry_policy: RetryPolicy = None,
+                 rate_limiter: AdaptiveRateLimiter = None, credential_provider: CredentialProvider = None,
+                 compressor: RequestCompressor = None, json_codec: JsonCodec = None):
+        if aiohttp is None:
+            raise ImportError("The asyncio Data API Client requires aiohttp. Install it with 'pip install aiohttp'")
+
+        super().__init__(host=host, stage=stage, region=region, access_key=access_key, secret_key=secret_key,
+                         session_token=session_token, custom_domain=custom_domain, logger=logger,
+                         pool_size=pool_size, keep_alive=keep_alive, pool_idle_timeout=pool_idle_timeout,
+                         retry_policy=retry_policy, rate_limiter=rate_limiter,
+                         credential_provider=credential_provider, compressor=compressor,
+                         json_codec=json_codec)
+
+    def _new_session(self):
+        if self._keep_alive is False:
+            connector = aiohttp.TCPConnector(limit=self._pool_size, force_close=True)
+        else:
+            # aiohttp closes each idle keep-alive connection itself once keepalive_timeout has passed
+            connector = aiohttp.TCPConnector(limit=self._pool_size, keepalive_timeout=self._pool_idle_timeout)
+
+        return aiohttp.ClientSession(connector=connector)
+
+    def _get_session(self):
+        if self._session is None or self._session.closed:
+            self._session = self._new_session()
+
+        return self._session
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def _resolve_credentials(self):
+        # resolving credentials may call STS or the instance metadata service, which would block the event loop
+        if self._credential_provider is not None and self._credential_provider.cached() is None:
+            await asyncio.get_running_loop().run_in_executor(None, self._credential_provider.get)
+
+    async def _send_once(self, method: str, url: str, body: bytes = None, extra_headers: dict = None):
+        headers = dict(self._headers)
+        if extra_headers is not None:
+            headers.update(extra_headers)
+
+        if self._auth is not None:
+            await self._resolve_credentials()
+            headers.update(self._auth.sign(method, url, headers, body))
+
+        # the URL is already encoded and signed, so it must not be re-quoted by aiohttp
+        async with self._get_session().request(method, URL(url, encoded=True), data=body,
+                                               headers=headers) as response:
+            content = await response.read()
+
+            return BufferedResponse(response.status, response.reason, response.headers, content)
+
+    async def _request(self, method: str, encoded_path: str, body: bytes = None, headers: dict = None):
+        url = self._make_path(encoded_path)
+        retryable = self._retry_policy is not None and self._retry_policy.is_retryable_request(method, encoded_path)
+        attempt = 0
+
+        while True:
+            if self._rate_limiter is not None:
+                wait = self._rate_limiter.reserve(method, encoded_path)
+                if wait > 0:
+                    await asyncio.sleep(wait)
+
+            try:
+                response = await self._send_once(method, url, body, headers)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                delay = self._retry_policy.next_delay(attempt, connection_error=True) if retryable else None
+                if delay is None:
+                    raise
+
+                self._logger.debug(f"{method} {url} failed with {e!r}, retrying in {delay:.3f}s")
+            else:
+                if self._rate_limiter is not None:
+                    self._rate_limiter.record(method, encoded_path, response.status_code)
+
+                delay = self._retry_policy.next_delay(attempt, status_code=response.status_code,
+                                                      retry_after=response.headers.get("Retry-After")) \
+                    if retryable else None
+                if delay is None:
+                    if self._retry_policy is not None and response.status_code < 500 and response.status_code != 429:
+                        self._retry_policy.record_success(attempt)
+
+                    return response
+
+                self._logger.debug(f"{method} {url} returned {response.status_code}, retrying in {delay:.3f}s")
+
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def head(self, data_type: str, path: str, query_params: str = None):
+        encoded_path = self._get_url(data_type, path, query_params)
+
+        return await self._request("HEAD", encoded_path)
+
+    async def get(self, data_type: str, path: str, query_params: dict = None, headers: dict = None):
+        encoded_path = self._get_url(data_type, path, query_params)
+
+        return await self._request("GET", encoded_path, headers=headers)
+
+    async def put(self, data_type: str, path: str, path_params: str = None, put_body=None):
+        encoded_path = self._get_url(data_type, path, path_params)
+
+        body, headers = self._encode_body(put_body)
+
+        return await self._request("PUT", encoded_path, body, headers=headers)
+
+    async def post(self, data_type: str, path: str, query_params: str = None, post_body: dict = None):
+        encoded_path = self._get_url(data_type, path, query_params)
+
+        body, headers = self._encode_body(post_body)
+
+        return await self._request("POST", encoded_path, body, headers=headers)
+
+    async def delete(self, data_type: str, path: str, delete_params: str = None, delete_body: dict = None):
+        encoded_path = self._get_url(data_type, path, delete_params)
+
+        body, headers = self._encode_body(delete_body)
+
+        return await self._request("DELETE", encoded_path, body, headers=headers)
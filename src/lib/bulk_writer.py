@@ -0,0 +1,174 @@
+import queue
+import threading
+import logging
+from src.exceptions import *
+from src.lib.metrics import bind_operation
+
+DEFAULT_WRITE_CONCURRENCY = 10
+DEFAULT_WRITE_QUEUE_SIZE = 1000
+_STOP = object()
+
+
+class WriteFailure:
+    """A single write which failed during a bulk write.
+    """
+    data_type = None
+    item_id = None
+    operation = None
+    exception = None
+
+    def __init__(self, data_type: str, item_id: str, operation: str, exception: Exception):
+        self.data_type = data_type
+        self.item_id = item_id
+        self.operation = operation
+        self.exception = exception
+
+    @property
+    def is_version_conflict(self):
+        return isinstance(self.exception, ConstraintViolationException)
+
+    def __repr__(self):
+        return f"WriteFailure({self.operation} {self.data_type}/{self.item_id}: {self.exception!r})"
+
+
+class BulkWriteReport:
+    """Outcome of a bulk write: the number of successful writes and every failed write.
+    """
+
+    def __init__(self):
+        self.succeeded = 0
+        self.failures = []
+
+    @property
+    def failed(self):
+        return len(self.failures)
+
+    @property
+    def ok(self):
+        return len(self.failures) == 0
+
+    def __repr__(self):
+        return f"BulkWriteReport(succeeded={self.succeeded}, failed={self.failed})"
+
+
+class BulkWriter:
+    """Writes Resources and Metadata through a Data API Client from a pool of worker threads.
+
+    Any number of producer threads may queue writes. When the queue is full, producers block until a worker takes the
+    next write, which bounds memory use. Failed writes, including ItemVersion conflicts, are collected into the report
+    rather than raised. Leaving the with block waits for every queued write to complete.
+
+        with client.bulk_writer(concurrency=20) as writer:
+            for item_id, resource in source:
+                writer.put_resource("MyItem", item_id, resource)
+        print(writer.report)
+    """
+
+    def __init__(self, client, concurrency: int = DEFAULT_WRITE_CONCURRENCY, queue_size: int = DEFAULT_WRITE_QUEUE_SIZE,
+                 logger: logging.Logger = None):
+        if not isinstance(concurrency, int) or concurrency < 1:
+            raise InvalidArgumentsException("Concurrency must be a positive Integer")
+
+        self._client = client
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._report = BulkWriteReport()
+        self._report_lock = threading.Lock()
+        self._closed = False
+        # counts the writes being queued, so that close() can wait for them before stopping the workers. The queue may
+        # block a producer for as long as it is full, so producers only hold the lock to check and update the count
+        self._submitting = 0
+        self._submit_lock = threading.Condition()
+        self._close_lock = threading.Lock()
+        self._logger = logger if logger is not None else logging.getLogger("BulkWriter")
+
+        # writes are named after the Client method which created the writer, rather than the method making them
+        work = bind_operation(self._work)
+        self._workers = [threading.Thread(target=work, name=f"DataAPIBulkWriter-{i}", daemon=True) for i in
+                         range(concurrency)]
+        for w in self._workers:
+            w.start()
+
+    @property
+    def report(self):
+        return self._report
+
+    def _work(self):
+        while True:
+            task = self._queue.get()
+
+            try:
+                if task is _STOP:
+                    return
+
+                operation, data_type, item_id, write = task
+                try:
+                    write()
+                    with self._report_lock:
+                        self._report.succeeded += 1
+                except Exception as e:
+                    self._logger.debug(f"{operation} of {data_type}/{item_id} failed: {e!r}")
+                    with self._report_lock:
+                        self._report.failures.append(WriteFailure(data_type, item_id, operation, e))
+            finally:
+                self._queue.task_done()
+
+    def _submit(self, operation: str, data_type: str, item_id: str, write):
+        with self._submit_lock:
+            if self._closed:
+                raise RuntimeError("BulkWriter is closed")
+            self._submitting += 1
+
+        try:
+            # blocks while the queue is full, which applies backpressure to producers
+            self._queue.put((operation, data_type, item_id, write))
+        finally:
+            with self._submit_lock:
+                self._submitting -= 1
+                if self._submitting == 0:
+                    self._submit_lock.notify_all()
+
+    def put_resource(self, data_type: str, item_id: str, resource: dict, item_version: int = None,
+                     strict_schema: bool = False):
+        """Queue a Resource write.
+        """
+        self._submit("put_resource", data_type, item_id,
+                     lambda: self._client.put_resource(data_type=data_type, item_id=item_id, resource=resource,
+                                                       item_version=item_version, strict_schema=strict_schema))
+
+    def put_metadata(self, data_type: str, item_id: str, meta: dict, strict_schema: bool = False):
+        """Queue a Metadata write.
+        """
+        self._submit("put_metadata", data_type, item_id,
+                     lambda: self._client.put_metadata(data_type=data_type, item_id=item_id, meta=meta,
+                                                       strict_schema=strict_schema))
+
+    def flush(self):
+        """Wait until every write queued so far has completed.
+        """
+        self._queue.join()
+
+        return self._report
+
+    def close(self):
+        """Flush outstanding writes and stop the workers. Returns the write report.
+        """
+        with self._close_lock:
+            if not self._closed:
+                with self._submit_lock:
+                    self._closed = True
+                    self._submit_lock.wait_for(lambda: self._submitting == 0)
+
+                self.flush()
+
+                for _ in self._workers:
+                    self._queue.put(_STOP)
+                for w in self._workers:
+                    w.join()
+
+        return self._report
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
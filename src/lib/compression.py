@@ -0,0 +1,62 @@
+import gzip
+import zlib
+from src.exceptions import InvalidArgumentsException
+
+GZIP = "gzip"
+DEFLATE = "deflate"
+ENCODINGS = [GZIP, DEFLATE]
+# responses in either encoding are decoded incrementally by urllib3 and aiohttp as the body is read
+ACCEPT_ENCODING = ", ".join(ENCODINGS)
+DEFAULT_COMPRESSION_THRESHOLD = 8192
+DEFAULT_COMPRESSION_LEVEL = 6
+
+
+def compress(body: bytes, encoding: str, level: int = DEFAULT_COMPRESSION_LEVEL) -> bytes:
+    if encoding == GZIP:
+        # a fixed mtime keeps the output, and so the signed payload hash, the same for the same body
+        return gzip.compress(body, compresslevel=level, mtime=0)
+    elif encoding == DEFLATE:
+        # HTTP deflate is the zlib format, not a raw deflate stream
+        return zlib.compress(body, level)
+    else:
+        raise InvalidArgumentsException(f"Compression Encoding must be one of {ENCODINGS}")
+
+
+def decompress(body: bytes, encoding: str) -> bytes:
+    if encoding == GZIP:
+        return gzip.decompress(body)
+    elif encoding == DEFLATE:
+        return zlib.decompress(body)
+    else:
+        raise InvalidArgumentsException(f"Compression Encoding must be one of {ENCODINGS}")
+
+
+class RequestCompressor:
+    """Compresses request bodies of at least threshold bytes with gzip or deflate.
+
+    Small bodies are sent as they are, as are bodies that would not get any smaller. The compressed bytes are what is
+    signed, so the SigV4 payload hash matches the body on the wire.
+    """
+
+    def __init__(self, encoding: str = GZIP, threshold: int = DEFAULT_COMPRESSION_THRESHOLD,
+                 level: int = DEFAULT_COMPRESSION_LEVEL):
+        if encoding not in ENCODINGS:
+            raise InvalidArgumentsException(f"Compression Encoding must be one of {ENCODINGS}")
+        if not isinstance(threshold, int) or threshold < 0:
+            raise InvalidArgumentsException("Compression Threshold must be a non-negative Integer")
+
+        self.encoding = encoding
+        self.threshold = threshold
+        self.level = level
+
+    def compress(self, body: bytes):
+        """Returns the body to send, and its Content-Encoding, or None if it is sent uncompressed.
+        """
+        if body is None or len(body) < self.threshold:
+            return body, None
+
+        compressed = compress(body, self.encoding, self.level)
+        if len(compressed) >= len(body):
+            return body, None
+
+        return compressed, self.encoding
@@ -0,0 +1,143 @@
+import copy
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+from email.utils import format_datetime
+import src.parameters as params
+
+DEFAULT_VALIDATOR_CACHE_SIZE = 1024
+ETAG_HEADER = "ETag"
+LAST_MODIFIED_HEADER = "Last-Modified"
+IF_NONE_MATCH_HEADER = "If-None-Match"
+IF_MODIFIED_SINCE_HEADER = "If-Modified-Since"
+
+
+def _sections(body):
+    """The Resource and Metadata sections of a get_resource or get_metadata response body, in a stable order.
+    """
+    if not isinstance(body, dict):
+        return []
+
+    item = body.get("Item")
+    if isinstance(item, dict):
+        return [item.get(s) for s in (params.RESOURCE, params.METADATA) if isinstance(item.get(s), dict)]
+    else:
+        # get_metadata returns the Metadata section itself
+        return [body]
+
+
+def extract_validators(response, body, derive: bool = False) -> dict:
+    """Build the conditional request headers which revalidate a response from the ETag and Last-Modified headers sent
+    by the API.
+
+    :param derive: when the API sends neither header, make an entity tag from the ItemVersion of each section of the
+        Item, and If-Modified-Since from the latest LastUpdateDate. The API never issued these validators, and
+        LastUpdateDate has a resolution of one second, so a write made by another client in the same second as the
+        last read may be answered Not Modified
+    """
+    validators = {}
+    headers = response.headers if response.headers is not None else {}
+
+    if headers.get(ETAG_HEADER) is not None:
+        validators[IF_NONE_MATCH_HEADER] = headers.get(ETAG_HEADER)
+    if headers.get(LAST_MODIFIED_HEADER) is not None:
+        validators[IF_MODIFIED_SINCE_HEADER] = headers.get(LAST_MODIFIED_HEADER)
+
+    if not derive:
+        return validators
+
+    sections = _sections(body)
+
+    if IF_NONE_MATCH_HEADER not in validators:
+        versions = [s.get(params.ITEM_VERSION) for s in sections]
+        if len(versions) > 0 and None not in versions:
+            validators[IF_NONE_MATCH_HEADER] = '"%s"' % "-".join(str(v) for v in versions)
+
+    if IF_MODIFIED_SINCE_HEADER not in validators:
+        try:
+            dates = [datetime.strptime(s.get(params.LAST_UPDATE_DATE), params.DEFAULT_DATE_FORMAT) for s in sections]
+        except (TypeError, ValueError):
+            dates = []
+
+        if len(dates) > 0:
+            validators[IF_MODIFIED_SINCE_HEADER] = format_datetime(max(dates).replace(tzinfo=timezone.utc),
+                                                                   usegmt=True)
+
+    return validators
+
+
+class ValidatorCache:
+    """Size bounded, least recently used store of the validators and body of each read, used to make conditional
+    requests. Unlike the ItemCache entries never expire, because every use is revalidated by the API. Thread safe.
+
+    :param derive_validators: also revalidate responses which came without an ETag or Last-Modified header, using
+        validators derived from the Item. See extract_validators() for the caveat
+    """
+
+    def __init__(self, max_size: int = DEFAULT_VALIDATOR_CACHE_SIZE, derive_validators: bool = False):
+        self._max_size = max_size
+        self.derive_validators = derive_validators
+        self._entries = OrderedDict()
+        # keys of the entries held for each (stage, data type, item id), so a write drops them without a scan
+        self._by_item = {}
+        self._lock = threading.Lock()
+        self.revalidations = 0
+        self.not_modified = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """The conditional request headers for a key and the body to serve if the API responds Not Modified, or None if
+        nothing is held for the key.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is None:
+                return None
+
+            self._entries.move_to_end(key)
+            self.revalidations += 1
+
+            return dict(entry[0]), entry[1]
+
+    def not_modified_body(self, body):
+        """Copy a held body to be returned to a caller, once the API has confirmed it is not modified.
+        """
+        with self._lock:
+            self.not_modified += 1
+
+        return copy.deepcopy(body)
+
+    def put(self, key, validators: dict, body):
+        if validators is None or len(validators) == 0:
+            return
+
+        body = copy.deepcopy(body)
+
+        with self._lock:
+            self._entries[key] = (validators, body)
+            self._entries.move_to_end(key)
+            self._by_item.setdefault(key[0:3], set()).add(key)
+
+            while len(self._entries) > self._max_size:
+                evicted, _ = self._entries.popitem(last=False)
+                self._unindex(evicted)
+
+    def _unindex(self, key):
+        keys = self._by_item.get(key[0:3])
+        if keys is not None:
+            keys.discard(key)
+            if len(keys) == 0:
+                del self._by_item[key[0:3]]
+
+    def invalidate(self, stage: str, data_type: str, item_id: str):
+        with self._lock:
+            for key in self._by_item.pop((stage, data_type, item_id), ()):
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._by_item.clear()
@@ -1,9 +1,126 @@
+import threading
+import time
+import logging
+from datetime import datetime, timezone, timedelta
+
+DEFAULT_REFRESH_MARGIN = 300
+DEFAULT_MIN_REFRESH_INTERVAL = 60
+
+_logger = logging.getLogger("CredentialProvider")
+
+
 class Credentials:
     access_key = None
     secret_key = None
     session_token = None
+    expiry_time = None
 
-    def __init__(self, access_key: str, secret_key: str, session_token: str = None):
+    def __init__(self, access_key: str, secret_key: str, session_token: str = None, expiry_time: datetime = None):
         self.access_key = access_key
         self.secret_key = secret_key
         self.session_token = session_token
+        self.expiry_time = expiry_time
+
+
+def _resolve_default_credentials():
+    # imported here, as utils imports this module
+    import src.lib.utils as utils
+
+    return utils.get_credentials()
+
+
+class CredentialProvider:
+    """Thread safe, cached source of AWS credentials for any number of Clients.
+
+    Credentials are resolved on first use and then reused. Once temporary credentials are within refresh_margin
+    seconds of their expiry_time, the next caller starts a refresh on a background thread and carries on with the
+    current credentials, so requests do not wait for the refresh. Only a caller holding credentials that have already
+    expired waits for new ones.
+
+    A source may hand out credentials that are already inside the margin, as the instance metadata service does for
+    the last minutes before it rotates them, so no background refresh starts within min_refresh_interval seconds of
+    the last time credentials were resolved.
+    """
+
+    def __init__(self, resolve=None, refresh_margin: float = DEFAULT_REFRESH_MARGIN,
+                 min_refresh_interval: float = DEFAULT_MIN_REFRESH_INTERVAL):
+        self._resolve = resolve if resolve is not None else _resolve_default_credentials
+        self._refresh_margin = timedelta(seconds=refresh_margin)
+        self._min_refresh_interval = min_refresh_interval
+        self._credentials = None
+        self._lock = threading.Lock()
+        self._refreshing = False
+        self._last_resolved = None
+
+    def _refresh(self):
+        try:
+            credentials = self._resolve()
+        except Exception as e:
+            # keep the current credentials, and try again on a later request
+            _logger.warning(f"Unable to refresh credentials: {e!r}")
+        else:
+            self._credentials = credentials
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+    def cached(self) -> Credentials:
+        """The current credentials if they have been resolved and have not expired, or None if get() would have to
+        wait for them to be resolved.
+        """
+        credentials = self._credentials
+
+        if credentials is None or (credentials.expiry_time is not None and
+                                   credentials.expiry_time <= datetime.now(timezone.utc)):
+            return None
+
+        return credentials
+
+    def get(self) -> Credentials:
+        credentials = self._credentials
+
+        if credentials is not None and credentials.expiry_time is None:
+            return credentials
+
+        now = datetime.now(timezone.utc)
+
+        if credentials is None or credentials.expiry_time <= now:
+            with self._lock:
+                credentials = self._credentials
+
+                if credentials is None or (credentials.expiry_time is not None and credentials.expiry_time <= now):
+                    self._last_resolved = time.monotonic()
+                    credentials = self._resolve()
+                    self._credentials = credentials
+
+            return credentials
+
+        if credentials.expiry_time - self._refresh_margin <= now:
+            with self._lock:
+                started = time.monotonic()
+                start = not self._refreshing and (self._last_resolved is None or
+                                                  started - self._last_resolved >= self._min_refresh_interval)
+                if start:
+                    self._refreshing = True
+                    self._last_resolved = started
+
+            if start:
+                threading.Thread(target=self._refresh, name="DataAPICredentialRefresh", daemon=True).start()
+
+        return credentials
+
+
+_shared_provider = None
+_shared_provider_lock = threading.Lock()
+
+
+def get_credential_provider() -> CredentialProvider:
+    """The process-wide credential provider, which resolves credentials the same way as utils.get_credentials().
+    """
+    global _shared_provider
+
+    with _shared_provider_lock:
+        if _shared_provider is None:
+            _shared_provider = CredentialProvider()
+
+        return _shared_provider
@@ -1,33 +1,35 @@
-import json
-import os
+import logging
 import src.exceptions as e
 from src.lib.http_handler import HttpHelper
-from datetime import datetime
+from src.lib.endpoint_registry import get_endpoint_registry, DEFAULT_ENDPOINT_REFRESH_INTERVAL
+from src.lib.credentials import get_credential_provider
 import src.lib.utils as utils
 
+_logger = logging.getLogger("DataApiControlPlane")
+
 
 class DataApiControlPlane:
     _base_uris = None
     _region_name = None
     _override_url = None
     _tls = True
+    _registry = None
 
-    def __init__(self, region_name, override_url=None, tls=True):
+    def __init__(self, region_name, override_url=None, tls=True, endpoint_cache: str = None):
         if region_name is None:
             raise e.InvalidArgumentsException("Region Name must be provided")
         else:
             self._region_name = region_name
             self._override_url = override_url
             self._tls = tls
+            # endpoints are shared by every Control Plane in the process which uses the same cache file
+            self._registry = get_endpoint_registry(endpoint_cache)
 
     def _load_uris(self):
-        if self._base_uris is None:
-            # load the base URI's from config
-            file_dir = os.path.dirname(__file__)
-            with open(f"{file_dir}/endpoints.json", 'r') as f:
-                self._base_uris = json.load(f)
+        self._base_uris = self._registry.get()
 
     def is_custom_domain(self, stage):
+        self._load_uris()
         stage_info = self._base_uris.get(stage)
 
         if stage_info is not None and stage_info.get('URL') is not None:
@@ -36,48 +38,60 @@ class DataApiControlPlane:
             return False
 
     def connect(self, from_url: str, access_key: str = None, secret_key: str = None, session_token: str = None,
-                force_refresh: bool = False):
-        _access_key = access_key
-        _secret_key = secret_key
-        _session_token = session_token
-
-        if access_key is None and secret_key is None:
-            # use helper module to resolve credentials
-            credentials = utils.get_credentials()
-            _access_key = credentials.access_key
-            _secret_key = credentials.secret_key
-            _session_token = credentials.session_token
-
-        file_dir = os.path.dirname(__file__)
-        filepath = f"{file_dir}/endpoints.json"
-
-        if not os.path.exists(filepath) or force_refresh:
-            host, stage, is_custom_domain = utils.resolve_url_info(from_url)
-
-            if self._tls:
-                host = f"https://{host}"
-            else:
-                host = f"http://{host}"
+                force_refresh: bool = False, refresh_interval: float = DEFAULT_ENDPOINT_REFRESH_INTERVAL,
+                background_refresh: bool = False):
+        """Fetch the Stage endpoints of the Data API at from_url into the endpoint cache, if they are not cached yet,
+        were fetched more than refresh_interval seconds ago, or force_refresh is set. If fetching stale endpoints fails,
+        the cached or packaged endpoints are used and the failure logged. With background_refresh, they are fetched
+        again from a background thread whenever they become refresh_interval seconds old, for the life of the process.
+        A refresh_interval of None keeps cached endpoints until they are refreshed by force.
+        """
+        # without keys, use the process-wide credentials, which stay current for background refreshes
+        credential_provider = get_credential_provider() if access_key is None and secret_key is None else None
+
+        host, stage, is_custom_domain = utils.resolve_url_info(from_url)
+
+        if self._tls:
+            host = f"https://{host}"
+        else:
+            host = f"http://{host}"
 
+        def _fetch_endpoints():
             # create an http handler just for the bootstrap request
             http_handler = HttpHelper(host=host, stage=stage,
-                                      region=self._region_name, access_key=_access_key,
-                                      secret_key=_secret_key, session_token=_session_token,
-                                      custom_domain=is_custom_domain)
-            response = http_handler.get(data_type=None, path="data-apis")
-            endpoints = response.json()
+                                      region=self._region_name, access_key=access_key,
+                                      secret_key=secret_key, session_token=session_token,
+                                      custom_domain=is_custom_domain, credential_provider=credential_provider)
+            try:
+                response = http_handler.get(data_type=None, path="data-apis")
+                endpoints = response.json()
+            finally:
+                http_handler.close()
 
             if endpoints is not None and endpoints.get("Message") is None:
-                endpoints["RefreshDate"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                # write the endpoint config to endpoints.json
-                with open(filepath, 'w+') as f:
-                    json.dump(endpoints, f, sort_keys=True, indent=4)
-
-                # refresh the default URL list
-                self._load_uris()
+                return endpoints
             else:
                 raise Exception(f"Unable to connect to Data API at {from_url} using supplied credentials")
 
+        # another process may already have refreshed the cache file
+        if not force_refresh and self._registry.is_stale(refresh_interval):
+            self._registry.reload()
+
+        if force_refresh or self._registry.is_stale(refresh_interval):
+            try:
+                self._registry.refresh(_fetch_endpoints)
+            except Exception as ex:
+                if force_refresh or not self._registry.is_loaded():
+                    raise
+
+                _logger.warning(f"Unable to refresh Data API endpoints, using the cached endpoints: {ex!r}")
+
+        # refresh the default URL list
+        self._load_uris()
+
+        if background_refresh and refresh_interval is not None:
+            self._registry.start_refresh(_fetch_endpoints, refresh_interval)
+
     def _get_stage_addr(self, stage):
         if stage in self._base_uris:
             stage_info = self._base_uris.get(stage)
@@ -0,0 +1,216 @@
+import json
+import os
+import tempfile
+import threading
+import logging
+from datetime import datetime
+
+# file locks are only available on POSIX. Elsewhere writes are still atomic, but concurrent writers are not serialised
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+ENDPOINTS_FILE = "endpoints.json"
+ENDPOINT_CACHE_ENV = "DATA_API_ENDPOINT_CACHE"
+ENDPOINT_CACHE_DIRECTORY = "aws-data-api"
+DEFAULT_ENDPOINT_REFRESH_INTERVAL = 86400
+REFRESH_DATE = "RefreshDate"
+REFRESH_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# endpoints.json in this package, which earlier versions used as the cache and which is still read if there is no cache
+PACKAGED_ENDPOINTS = os.path.join(os.path.dirname(__file__), ENDPOINTS_FILE)
+
+_logger = logging.getLogger("EndpointRegistry")
+
+
+def default_endpoint_cache() -> str:
+    """The endpoint cache file: DATA_API_ENDPOINT_CACHE if it is set, otherwise aws-data-api/endpoints.json in the
+    user's cache directory ($XDG_CACHE_HOME or ~/.cache), or in the temporary directory if there is no home directory.
+    """
+    path = os.getenv(ENDPOINT_CACHE_ENV)
+    if path is not None:
+        return path
+
+    cache_home = os.getenv("XDG_CACHE_HOME")
+    if not cache_home:
+        home = os.path.expanduser("~")
+        cache_home = os.path.join(home, ".cache") if home != "~" else tempfile.gettempdir()
+
+    return os.path.join(cache_home, ENDPOINT_CACHE_DIRECTORY, ENDPOINTS_FILE)
+
+
+class EndpointRegistry:
+    """In memory copy of the Stage endpoints of a Data API, backed by an endpoint cache file.
+
+    The file is read once, on first use, and every Control Plane using the same file shares the parsed endpoints.
+    Until the file exists, the endpoints are read from seed_path if one is given. Saves write a temporary file next to
+    the cache and rename it into place while holding an exclusive lock on a lock file beside it, so that readers in
+    other processes see either the old or the new endpoints, never a partial file. The RefreshDate saved with the
+    endpoints gives their age, and a background thread can refetch them whenever they are refresh_interval seconds old.
+    Seed endpoints without a RefreshDate are taken to be current, as they were before the cache existed.
+    """
+
+    def __init__(self, path: str, seed_path: str = None):
+        self._path = path
+        self._seed_path = seed_path
+        self._endpoints = None
+        self._seeded = False
+        self._lock = threading.RLock()
+        self._refresh_thread = None
+        self._stop = threading.Event()
+
+    @property
+    def path(self):
+        return self._path
+
+    def _read(self):
+        for path in (self._path, self._seed_path):
+            if path is not None:
+                try:
+                    with open(path, 'r') as f:
+                        endpoints = json.load(f)
+
+                    self._seeded = path is self._seed_path
+                    return endpoints
+                except FileNotFoundError:
+                    pass
+
+        return None
+
+    def get(self) -> dict:
+        """The endpoints, by Stage. Empty if the cache file does not exist yet.
+        """
+        endpoints = self._endpoints
+
+        if endpoints is None:
+            with self._lock:
+                if self._endpoints is None:
+                    self._endpoints = self._read()
+
+                endpoints = self._endpoints
+
+        return endpoints if endpoints is not None else {}
+
+    def is_loaded(self):
+        return len(self.get()) > 0
+
+    def reload(self):
+        """Read the cache file again, picking up endpoints saved by other processes.
+        """
+        with self._lock:
+            self._endpoints = self._read()
+
+    def age(self) -> float:
+        """Seconds since the endpoints were fetched, from their RefreshDate, or None if that is not known.
+        """
+        try:
+            refreshed = datetime.strptime(self.get().get(REFRESH_DATE), REFRESH_DATE_FORMAT)
+        except (TypeError, ValueError):
+            return None
+
+        return (datetime.now() - refreshed).total_seconds()
+
+    def is_stale(self, refresh_interval: float) -> bool:
+        """Whether the endpoints are missing, or are older than refresh_interval seconds or of unknown age. Never
+        stale if refresh_interval is None, or if they are seed endpoints of unknown age.
+        """
+        if not self.is_loaded():
+            return True
+        elif refresh_interval is None:
+            return False
+
+        age = self.age()
+
+        if age is None:
+            # the packaged seed has no RefreshDate, and fetching on every connect would defeat the cache
+            return not self._seeded
+
+        return age > refresh_interval
+
+    def save(self, endpoints: dict):
+        """Persist endpoints to the cache file and make them the in memory copy.
+        """
+        endpoints = dict(endpoints)
+        endpoints[REFRESH_DATE] = datetime.now().strftime(REFRESH_DATE_FORMAT)
+        directory = os.path.dirname(os.path.abspath(self._path))
+
+        with self._lock:
+            os.makedirs(directory, exist_ok=True)
+
+            with open(f"{self._path}.lock", 'a') as lock_file:
+                if fcntl is not None:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+
+                try:
+                    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(self._path)}.")
+                    try:
+                        with os.fdopen(fd, 'w') as f:
+                            json.dump(endpoints, f, sort_keys=True, indent=4)
+                            f.flush()
+                            os.fsync(f.fileno())
+
+                        os.replace(tmp_path, self._path)
+                    except BaseException:
+                        os.unlink(tmp_path)
+                        raise
+                finally:
+                    if fcntl is not None:
+                        fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+            self._endpoints = endpoints
+            self._seeded = False
+
+    def refresh(self, fetch_endpoints):
+        """Fetch the endpoints with fetch_endpoints() and save them.
+        """
+        self.save(fetch_endpoints())
+
+    def start_refresh(self, fetch_endpoints, refresh_interval: float = DEFAULT_ENDPOINT_REFRESH_INTERVAL):
+        """Refresh the endpoints from a daemon thread whenever they become refresh_interval seconds old, replacing any
+        previous refresh. Failed refreshes are logged, and the current endpoints kept until the next attempt.
+        """
+        self.stop_refresh()
+        stop = threading.Event()
+
+        def _run():
+            age = self.age()
+            delay = max(0.0, refresh_interval - age) if age is not None else 0.0
+
+            while not stop.wait(delay):
+                delay = refresh_interval
+                try:
+                    self.refresh(fetch_endpoints)
+                except Exception as e:
+                    _logger.warning(f"Unable to refresh Data API endpoints: {e!r}")
+
+        with self._lock:
+            self._stop = stop
+            self._refresh_thread = threading.Thread(target=_run, name="DataAPIEndpointRefresh", daemon=True)
+            self._refresh_thread.start()
+
+    def stop_refresh(self):
+        with self._lock:
+            self._stop.set()
+            self._refresh_thread = None
+
+
+_registries = {}
+_registries_lock = threading.Lock()
+
+
+def get_endpoint_registry(path: str = None) -> EndpointRegistry:
+    """The process-wide registry for an endpoint cache file, which defaults to default_endpoint_cache(). The default
+    cache is seeded from the endpoints.json packaged with the library until it has been saved.
+    """
+    seed_path = PACKAGED_ENDPOINTS if path is None else None
+    path = os.path.abspath(path if path is not None else default_endpoint_cache())
+
+    with _registries_lock:
+        registry = _registries.get(path)
+
+        if registry is None:
+            registry = EndpointRegistry(path, seed_path=seed_path)
+            _registries[path] = registry
+
+        return registry
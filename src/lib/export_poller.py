@@ -0,0 +1,231 @@
+import logging
+import threading
+import time
+from concurrent.futures import Future, InvalidStateError
+from src.exceptions import ResourceNotFoundException, DetailedException
+
+DEFAULT_MIN_POLL_INTERVAL = 5
+DEFAULT_MAX_POLL_INTERVAL = 60
+DEFAULT_POLL_BACKOFF = 1.5
+DEFAULT_MAX_POLL_ERRORS = 5
+
+SUCCEEDED = "SUCCEEDED"
+# Glue Job run states after which the run will not change again
+TERMINAL_STATES = frozenset([SUCCEEDED, "FAILED", "STOPPED", "TIMEOUT", "ERROR"])
+
+
+class ExportJob(Future):
+    """Future for an export started with start_export(as_job=True), which completes when the export does.
+
+    The result is the status document of the run once it has SUCCEEDED, and a run which ends in any other state raises
+    a DetailedException carrying the status document as its detail. status holds the last state seen. Cancelling an
+    ExportJob stops it being tracked, but does not stop the export.
+    """
+
+    def __init__(self, get_status, data_type: str, job_name: str, job_run_id: str, status: str = None):
+        super().__init__()
+        self._get_status = get_status
+        self.data_type = data_type
+        self.job_name = job_name
+        self.job_run_id = job_run_id
+        self.status = status
+        self.status_document = None
+
+    @property
+    def _group(self) -> tuple:
+        # runs of the same Job through the same Client can share one status call
+        return self._get_status, self.data_type, self.job_name
+
+    def wait(self, timeout: float = None) -> dict:
+        """Block until the export completes, returning its status document, or raising if it did not succeed. Raises
+        concurrent.futures.TimeoutError if it is still running after timeout seconds.
+        """
+        return self.result(timeout=timeout)
+
+    def __repr__(self):
+        return f"ExportJob(data_type={self.data_type}, job_name={self.job_name}, job_run_id={self.job_run_id}, " \
+               f"status={self.status})"
+
+
+class _Tracked:
+    def __init__(self, job: ExportJob, interval: float):
+        self.job = job
+        self.interval = interval
+        self.next_poll = time.monotonic() + interval
+        self.errors = 0
+
+
+class ExportPoller:
+    """Tracks export jobs on one background thread, completing each ExportJob when its run finishes.
+
+    Each run is polled every min_interval seconds at first, and the interval grows by backoff up to max_interval for as
+    long as its state stays the same, returning to min_interval when it changes. When any run of a Job is due, all
+    tracked runs of that Job are read with a single status call. A run whose status cannot be read max_errors times in
+    a row fails with the last error, or with a DetailedException if the API returned no status for it. The thread only runs while there are jobs to track. A process-wide instance is
+    available from get_export_poller().
+    """
+
+    def __init__(self, min_interval: float = DEFAULT_MIN_POLL_INTERVAL,
+                 max_interval: float = DEFAULT_MAX_POLL_INTERVAL, backoff: float = DEFAULT_POLL_BACKOFF,
+                 max_errors: int = DEFAULT_MAX_POLL_ERRORS, logger: logging.Logger = None):
+        self._min_interval = min_interval
+        self._max_interval = max_interval
+        self._backoff = backoff
+        self._max_errors = max_errors
+        self._logger = logger if logger is not None else logging.getLogger("ExportPoller")
+        self._tracked = []
+        self._condition = threading.Condition()
+        self._thread = None
+        self.status_calls = 0
+
+    def track(self, job: ExportJob) -> ExportJob:
+        with self._condition:
+            self._tracked.append(_Tracked(job, self._min_interval))
+
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="DataAPIExportPoller", daemon=True)
+                self._thread.start()
+
+            self._condition.notify()
+
+        return job
+
+    @property
+    def tracking(self) -> int:
+        with self._condition:
+            return len(self._tracked)
+
+    def _due(self) -> list:
+        # wait until a run is due, and return each Job with a run due, with all of its tracked runs
+        with self._condition:
+            while True:
+                self._tracked = [t for t in self._tracked if not t.job.done()]
+                if len(self._tracked) == 0:
+                    self._thread = None
+                    return None
+
+                now = time.monotonic()
+                next_poll = min(t.next_poll for t in self._tracked)
+                if next_poll <= now:
+                    break
+
+                self._condition.wait(timeout=next_poll - now)
+
+            due = {t.job._group for t in self._tracked if t.next_poll <= now}
+            groups = {}
+            for t in self._tracked:
+                if t.job._group in due:
+                    groups.setdefault(t.job._group, []).append(t)
+
+            return list(groups.values())
+
+    def _run(self):
+        while True:
+            groups = self._due()
+            if groups is None:
+                return
+
+            for tracked in groups:
+                self._poll(tracked)
+
+    @staticmethod
+    def _run_status(document, job_run_id: str, single: bool):
+        if not isinstance(document, dict):
+            return None
+        elif isinstance(document.get(job_run_id), dict):
+            return document.get(job_run_id)
+        elif single and len(document) == 1 and isinstance(next(iter(document.values())), dict):
+            return next(iter(document.values()))
+        else:
+            return None
+
+    def _status(self, tracked: list) -> dict:
+        """Read the status documents of the tracked runs of one Job, keyed by run.
+        """
+        job = tracked[0].job
+        if len(tracked) == 1:
+            self.status_calls += 1
+            document = job._get_status(job.data_type, job.job_name, job_run_id=job.job_run_id)
+            return {job.job_run_id: self._run_status(document, job.job_run_id, True)}
+
+        self.status_calls += 1
+        document = job._get_status(job.data_type, job.job_name)
+        statuses = {t.job.job_run_id: self._run_status(document, t.job.job_run_id, False) for t in tracked}
+
+        # runs not listed in the Job's status are read on their own
+        for t in tracked:
+            if statuses.get(t.job.job_run_id) is None:
+                self.status_calls += 1
+                document = job._get_status(job.data_type, job.job_name, job_run_id=t.job.job_run_id)
+                statuses[t.job.job_run_id] = self._run_status(document, t.job.job_run_id, True)
+
+        return statuses
+
+    def _poll(self, tracked: list):
+        try:
+            statuses = self._status(tracked)
+        except Exception as e:
+            self._logger.debug(f"Export status of {tracked[0].job.job_name} failed with {e!r}")
+
+            for t in tracked:
+                t.errors += 1
+                if isinstance(e, ResourceNotFoundException) or t.errors >= self._max_errors:
+                    self._complete(t.job, exception=e)
+                else:
+                    self._reschedule(t, changed=False)
+
+            return
+
+        for t in tracked:
+            document = statuses.get(t.job.job_run_id)
+            if document is None:
+                # an unknown run would otherwise be polled for ever, and wait() without a timeout would never return
+                t.errors += 1
+                if t.errors >= self._max_errors:
+                    self._complete(t.job, exception=DetailedException(
+                        f"No status found for Export Job {t.job.job_name} run {t.job.job_run_id}"))
+                else:
+                    self._reschedule(t, changed=False)
+
+                continue
+
+            status = document.get("Status")
+            changed = status != t.job.status
+            t.errors = 0
+            t.job.status_document = document
+            t.job.status = status
+
+            if status == SUCCEEDED:
+                self._complete(t.job, result=document)
+            elif status in TERMINAL_STATES:
+                self._complete(t.job, exception=DetailedException(
+                    f"Export Job {t.job.job_name} run {t.job.job_run_id} {status}", detail=document))
+            else:
+                self._reschedule(t, changed=changed)
+
+    def _reschedule(self, tracked: _Tracked, changed: bool):
+        if changed:
+            tracked.interval = self._min_interval
+        else:
+            tracked.interval = min(self._max_interval, tracked.interval * self._backoff)
+
+        tracked.next_poll = time.monotonic() + tracked.interval
+
+    def _complete(self, job: ExportJob, result: dict = None, exception: Exception = None):
+        # the job may have been cancelled while its status was read
+        try:
+            if exception is not None:
+                job.set_exception(exception)
+            else:
+                job.set_result(result)
+        except InvalidStateError:
+            pass
+
+
+_shared_export_poller = ExportPoller()
+
+
+def get_export_poller() -> ExportPoller:
+    """The process-wide export poller.
+    """
+    return _shared_export_poller
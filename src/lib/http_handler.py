@@ -1,35 +1,44 @@
-import requests, urllib
-import json
-from requests_aws4auth import AWS4Auth
+import urllib
+import time
+from src.lib.signing import SigV4Signer
+from src.lib.retry import RetryPolicy
+from src.lib.rate_limiter import AdaptiveRateLimiter
+from src.lib.credentials import CredentialProvider
+from src.lib.compression import RequestCompressor, ACCEPT_ENCODING
+from src.lib.json_codec import JsonCodec, get_codec
+from src.lib.transport import Transport, RequestsTransport, DEFAULT_POOL_SIZE, DEFAULT_POOL_IDLE_TIMEOUT
+from src.lib.metrics import RequestMetrics, RequestEvent, SERIALIZE, SIGN, WAIT, attach
 import logging
 
 SERVICE = "execute-api"
 
 
-def authed(f):
-    def do_auth(self, *args, **kwargs):
-        if self._access_key is not None:
-            self._auth = self._get_auth()
-
-        return f(self, *args, **kwargs)
-
-    return do_auth
-
-
-class HttpHelper:
+class BaseHttpHelper:
+    """Addressing, signing, body encoding and retry settings shared by the HttpHelper and the AsyncHttpHelper, which
+    each add the verbs and the connections to send them over.
+    """
     _host = None
     _region = None
     _access_key = None
     _secret_key = None
     _session_token = None
     _auth = None
+    _credential_provider = None
     _logger = None
+    _retry_policy = None
+    _rate_limiter = None
+    _compressor = None
+    _codec = None
     _default_headers = {
-        "content-type": "application/json"
+        "content-type": "application/json",
+        "accept-encoding": ACCEPT_ENCODING
     }
 
     def __init__(self, host, stage, region, access_key, secret_key, session_token, custom_domain: bool = False,
-                 logger: logging.Logger = None):
+                 logger: logging.Logger = None, pool_size: int = DEFAULT_POOL_SIZE, keep_alive: bool = True,
+                 pool_idle_timeout: int = DEFAULT_POOL_IDLE_TIMEOUT, retry_policy: RetryPolicy = None,
+                 rate_limiter: AdaptiveRateLimiter = None, credential_provider: CredentialProvider = None,
+                 compressor: RequestCompressor = None, json_codec: JsonCodec = None):
         self._host = host
         self._region = region
         self._stage = stage
@@ -37,11 +46,30 @@ class HttpHelper:
         self._secret_key = secret_key
         self._session_token = session_token
         self._custom_domain = custom_domain
+        self._pool_size = pool_size
+        self._keep_alive = keep_alive
+        self._pool_idle_timeout = pool_idle_timeout
+        self._retry_policy = retry_policy
+        self._rate_limiter = rate_limiter
+        self._compressor = compressor
+        self._codec = get_codec(json_codec)
+
+        # the signer is built once and derives signing keys through the shared key cache. A credential provider takes
+        # precedence over static keys, so that refreshed credentials are used as soon as they are available
+        if credential_provider is not None:
+            self._credential_provider = credential_provider
+            self._auth = SigV4Signer(None, None, region, SERVICE, credential_provider=credential_provider)
+        elif access_key is not None:
+            self._auth = SigV4Signer(access_key, secret_key, region, SERVICE, session_token=session_token)
+
+        self._headers = dict(self._default_headers)
+        if keep_alive is False:
+            # ask the server to close the connection after each response so nothing is pooled
+            self._headers["Connection"] = "close"
 
         if logger is not None:
             self._logger = logger
         else:
-            logging.basicConfig()
             self._logger = logging.getLogger("HttpHandler")
             self._logger.setLevel(logging.INFO)
 
@@ -52,8 +80,16 @@ class HttpHelper:
 
         return base
 
-    def _get_auth(self):
-        return AWS4Auth(self._access_key, self._secret_key, self._region, SERVICE, session_token=self._session_token)
+    def set_credentials(self, access_key, secret_key, session_token=None):
+        self._access_key = access_key
+        self._secret_key = secret_key
+        self._session_token = session_token
+        self._credential_provider = None
+
+        if self._auth is None:
+            self._auth = SigV4Signer(access_key, secret_key, self._region, SERVICE, session_token=session_token)
+        else:
+            self._auth.set_credentials(access_key, secret_key, session_token)
 
     def _get_url(self, data_type: str, path: str, query_params: str = None):
         if data_type is not None:
@@ -68,43 +104,177 @@ class HttpHelper:
 
         return encoded_path
 
+    def _encode_body(self, body, event: RequestEvent = None):
+        """Serialise a request body, compressing it if it is large enough. Returns the body and any headers it needs.
+        """
+        start = time.perf_counter()
+        encoded = self._codec.dumps(body)
+        headers = None
+
+        if self._compressor is not None:
+            encoded, encoding = self._compressor.compress(encoded)
+            if encoding is not None:
+                headers = {"Content-Encoding": encoding}
+
+        if event is not None:
+            event.add(SERIALIZE, time.perf_counter() - start)
+
+        return encoded, headers
+
     def _make_path(self, encoded_path):
         path = f"{self.get_base_path()}/{encoded_path}"
         self._logger.debug(path)
 
         return path
 
-    @authed
+
+class HttpHelper(BaseHttpHelper):
+    _transport = None
+    _metrics = None
+
+    def __init__(self, host, stage, region, access_key, secret_key, session_token, custom_domain: bool = False,
+                 logger: logging.Logger = None, pool_size: int = DEFAULT_POOL_SIZE, keep_alive: bool = True,
+                 pool_idle_timeout: int = DEFAULT_POOL_IDLE_TIMEOUT, retry_policy: RetryPolicy = None,
+                 rate_limiter: AdaptiveRateLimiter = None, credential_provider: CredentialProvider = None,
+                 compressor: RequestCompressor = None, json_codec: JsonCodec = None, transport: Transport = None,
+                 metrics: RequestMetrics = None):
+        super().__init__(host=host, stage=stage, region=region, access_key=access_key, secret_key=secret_key,
+                         session_token=session_token, custom_domain=custom_domain, logger=logger,
+                         pool_size=pool_size, keep_alive=keep_alive, pool_idle_timeout=pool_idle_timeout,
+                         retry_policy=retry_policy, rate_limiter=rate_limiter,
+                         credential_provider=credential_provider, compressor=compressor, json_codec=json_codec)
+        self._metrics = metrics
+
+        if transport is not None:
+            self._transport = transport
+        else:
+            self._transport = RequestsTransport(pool_size=pool_size, pool_idle_timeout=pool_idle_timeout,
+                                                logger=self._logger)
+
+    def close(self):
+        self._transport.close()
+
+    def _start_event(self, method: str, encoded_path: str, data_type: str) -> RequestEvent:
+        return self._metrics.start(method, encoded_path.split("?")[0], data_type) if self._metrics is not None \
+            else None
+
+    def _finish_event(self, event: RequestEvent, attempt: int, response=None, error: Exception = None,
+                      stream: bool = False):
+        event.retries = attempt
+        event.error = error
+
+        if response is None:
+            self._metrics.record(event)
+            return
+
+        event.status = response.status_code
+        length = response.headers.get("Content-Length")
+        if length is not None:
+            event.bytes_in = int(length)
+        elif not stream:
+            event.bytes_in = len(response.content) if response.content is not None else 0
+
+        # a streamed body is decoded by the caller as it is read, so the event is complete once the headers arrive.
+        # Otherwise it is recorded once the Client has decoded the response
+        if stream:
+            self._metrics.record(event)
+        else:
+            attach(response, event)
+
+    def _send(self, method: str, encoded_path: str, body: bytes = None, headers: dict = None, stream: bool = False,
+              event: RequestEvent = None):
+        url = self._make_path(encoded_path)
+        headers = {**self._headers, **headers} if headers is not None else self._headers
+        retryable = self._retry_policy is not None and self._retry_policy.is_retryable_request(method, encoded_path)
+        timings = event.phases if event is not None else None
+        attempt = 0
+
+        while True:
+            if self._rate_limiter is not None:
+                start = time.perf_counter()
+                self._rate_limiter.acquire(method, encoded_path)
+                if event is not None:
+                    event.add(WAIT, time.perf_counter() - start)
+
+            # sign on every attempt, as the signature covers the request time and the credentials may have been
+            # refreshed
+            start = time.perf_counter()
+            signed = dict(headers)
+            if self._auth is not None:
+                signed.update(self._auth.sign(method, url, signed, body))
+            if event is not None:
+                event.add(SIGN, time.perf_counter() - start)
+                event.bytes_out += len(body) if body is not None else 0
+
+            try:
+                response = self._transport.send(method, url, signed, body, stream=stream, timings=timings)
+            except self._transport.connection_errors as e:
+                delay = self._retry_policy.next_delay(attempt, connection_error=True) if retryable else None
+                if delay is None:
+                    if event is not None:
+                        self._finish_event(event, attempt, error=e)
+                    raise
+
+                self._logger.debug(f"{method} {url} failed with {e!r}, retrying in {delay:.3f}s")
+            else:
+                if self._rate_limiter is not None:
+                    self._rate_limiter.record(method, encoded_path, response.status_code)
+
+                delay = self._retry_policy.next_delay(attempt, status_code=response.status_code,
+                                                      retry_after=response.headers.get("Retry-After")) \
+                    if retryable else None
+                if delay is None:
+                    if self._retry_policy is not None and response.status_code < 500 and response.status_code != 429:
+                        self._retry_policy.record_success(attempt)
+                    if event is not None:
+                        self._finish_event(event, attempt, response=response, stream=stream)
+
+                    return response
+
+                self._logger.debug(f"{method} {url} returned {response.status_code}, retrying in {delay:.3f}s")
+
+                # a streamed response holds its connection until it is closed
+                if stream:
+                    response.close()
+
+            start = time.perf_counter()
+            self._retry_policy.sleep(delay)
+            if event is not None:
+                event.add(WAIT, time.perf_counter() - start)
+            attempt += 1
+
     def head(self, data_type: str, path: str, query_params: str = None):
         encoded_path = self._get_url(data_type, path, query_params)
+        event = self._start_event("HEAD", encoded_path, data_type)
 
-        return requests.head(url=f"{self._make_path(encoded_path)}", auth=self._auth,
-                             headers=self._default_headers)
+        return self._send("HEAD", encoded_path, event=event)
 
-    @authed
-    def get(self, data_type: str, path: str, query_params: dict = None):
+    def get(self, data_type: str, path: str, query_params: dict = None, headers: dict = None, stream: bool = False):
         encoded_path = self._get_url(data_type, path, query_params)
+        event = self._start_event("GET", encoded_path, data_type)
 
-        return requests.get(url=self._make_path(encoded_path), auth=self._auth, headers=self._default_headers)
+        return self._send("GET", encoded_path, headers=headers, stream=stream, event=event)
 
-    @authed
     def put(self, data_type: str, path: str, path_params: str = None, put_body=None):
         encoded_path = self._get_url(data_type, path, path_params)
+        event = self._start_event("PUT", encoded_path, data_type)
+
+        body, headers = self._encode_body(put_body, event)
 
-        return requests.put(url=f"{self._make_path(encoded_path)}", data=json.dumps(put_body), auth=self._auth,
-                            headers=self._default_headers)
+        return self._send("PUT", encoded_path, body, headers=headers, event=event)
 
-    @authed
-    def post(self, data_type: str, path: str, query_params: str = None, post_body: dict = None):
+    def post(self, data_type: str, path: str, query_params: str = None, post_body: dict = None, stream: bool = False):
         encoded_path = self._get_url(data_type, path, query_params)
+        event = self._start_event("POST", encoded_path, data_type)
 
-        return requests.post(url=f"{self._make_path(encoded_path)}", data=json.dumps(post_body), auth=self._auth,
-                             headers=self._default_headers)
+        body, headers = self._encode_body(post_body, event)
+
+        return self._send("POST", encoded_path, body, headers=headers, stream=stream, event=event)
 
-    @authed
     def delete(self, data_type: str, path: str, delete_params: str = None, delete_body: dict = None):
         encoded_path = self._get_url(data_type, path, delete_params)
+        event = self._start_event("DELETE", encoded_path, data_type)
+
+        body, headers = self._encode_body(delete_body, event)
 
-        return requests.delete(url=f"{self._make_path(encoded_path)}", data=json.dumps(delete_body),
-                               auth=self._auth,
-                               headers=self._default_headers)
+        return self._send("DELETE", encoded_path, body, headers=headers, event=event)
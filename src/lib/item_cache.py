@@ -0,0 +1,159 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+DEFAULT_CACHE_SIZE = 1024
+DEFAULT_CACHE_TTL = 60
+
+# the kinds of read that are cached for an Item
+RESOURCE = "resource"
+METADATA = "metadata"
+
+
+class _Load:
+    __slots__ = ("key", "stale")
+
+    def __init__(self, key):
+        self.key = key
+        self.stale = False
+
+
+class ItemCache:
+    """Size bounded, least recently used cache of Item reads, whose entries expire after ttl seconds.
+
+    Entries are keyed by (stage, data_type, item_id, kind, projection), where projection is a hashable form of the
+    options that shape the response, and are indexed by Item so that a write can drop every cached read of that
+    Item at once. Cached values are copied on the way in and out, so callers are free to modify what they are given.
+    A read registered with start_load() which is still in flight when its Item is invalidated may have fetched the Item
+    before the write, and so its value is not cached. The cache is thread safe and can be shared between Clients.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_CACHE_SIZE, ttl: float = DEFAULT_CACHE_TTL):
+        self._max_size = max_size
+        self._ttl = ttl
+        self._entries = OrderedDict()
+        self._by_item = {}
+        self._loading = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def _item_of(key):
+        return key[0:3]
+
+    def _remove(self, key):
+        self._entries.pop(key, None)
+        item = self._item_of(key)
+        keys = self._by_item.get(item)
+
+        if keys is not None:
+            keys.discard(key)
+            if len(keys) == 0:
+                del self._by_item[item]
+
+    def get(self, key, default=None):
+        """Return the cached value for a key, or default if it is absent or has expired.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is not None and entry[0] < time.monotonic():
+                self._remove(key)
+                self.evictions += 1
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+                return default
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            value = entry[1]
+
+        return copy.deepcopy(value)
+
+    def start_load(self, key) -> _Load:
+        """Register a read of a key that is about to be made, returning the ticket to pass to put() with its value and
+        to end_load() once it is done.
+        """
+        load = _Load(key)
+        with self._lock:
+            self._loading.setdefault(self._item_of(key), set()).add(load)
+
+        return load
+
+    def end_load(self, load: _Load):
+        with self._lock:
+            self._end_load(load)
+
+    def _end_load(self, load: _Load):
+        item = self._item_of(load.key)
+        loads = self._loading.get(item)
+
+        if loads is not None:
+            loads.discard(load)
+            if len(loads) == 0:
+                del self._loading[item]
+
+    def put(self, key, value, load: _Load = None):
+        """Cache the value for a key. A value read under a load ticket is dropped if the Item was invalidated while
+        the read was in flight.
+        """
+        value = copy.deepcopy(value)
+
+        with self._lock:
+            if load is not None:
+                self._end_load(load)
+                if load.stale:
+                    return
+
+            self._entries[key] = (time.monotonic() + self._ttl, value)
+            self._entries.move_to_end(key)
+            self._by_item.setdefault(self._item_of(key), set()).add(key)
+
+            while len(self._entries) > self._max_size:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def invalidate(self, stage: str, data_type: str, item_id: str):
+        """Drop every cached read of an Item.
+        """
+        with self._lock:
+            for load in self._loading.pop((stage, data_type, item_id), ()):
+                load.stale = True
+
+            keys = self._by_item.pop((stage, data_type, item_id), None)
+
+            if keys is not None:
+                for key in keys:
+                    self._entries.pop(key, None)
+
+                self.invalidations += len(keys)
+
+    def clear(self):
+        with self._lock:
+            for loads in self._loading.values():
+                for load in loads:
+                    load.stale = True
+
+            self._loading.clear()
+            self._entries.clear()
+            self._by_item.clear()
+
+    def statistics(self):
+        with self._lock:
+            return {
+                "Size": len(self._entries),
+                "Hits": self.hits,
+                "Misses": self.misses,
+                "Evictions": self.evictions,
+                "Invalidations": self.invalidations
+            }
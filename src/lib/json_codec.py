@@ -0,0 +1,103 @@
+import json
+import threading
+from abc import ABC, abstractmethod
+from src.exceptions import InvalidArgumentsException
+
+STDLIB = "json"
+ORJSON = "orjson"
+
+# orjson decodes integers outside the 64 bit range as floats, and every such integer has at least 19 digits. Mapping
+# every digit to 0 finds a run of them with a substring search, which is many times faster than a regular expression
+_DIGITS_TO_ZERO = bytes(ord("0") if ord("0") <= c <= ord("9") else c for c in range(256))
+_LONG_NUMBER = b"0" * 19
+
+
+class JsonCodec(ABC):
+    """Encodes request bodies to UTF-8 JSON bytes, and decodes response bodies.
+    """
+    name = None
+
+    @abstractmethod
+    def dumps(self, obj) -> bytes:
+        pass
+
+    @abstractmethod
+    def loads(self, data):
+        pass
+
+
+class StdlibJsonCodec(JsonCodec):
+    name = STDLIB
+
+    def dumps(self, obj) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+
+    def loads(self, data):
+        return json.loads(data)
+
+
+class OrjsonCodec(JsonCodec):
+    """JSON codec backed by orjson, which encodes straight to bytes and decodes several times faster than the stdlib.
+
+    Documents that orjson cannot encode, such as those with integers beyond 64 bits or non string keys, are encoded
+    by the stdlib instead. orjson would decode integers beyond 64 bits as floats, losing the precision of the 38 digit
+    numbers that DynamoDB can hold, so documents with a run of 19 or more digits are decoded by the stdlib too.
+    """
+    name = ORJSON
+
+    def __init__(self):
+        import orjson
+
+        self._orjson = orjson
+
+    def dumps(self, obj) -> bytes:
+        try:
+            return self._orjson.dumps(obj)
+        except TypeError:
+            return json.dumps(obj).encode("utf-8")
+
+    def loads(self, data):
+        raw = data.encode("utf-8") if isinstance(data, str) else data
+        if _LONG_NUMBER in raw.translate(_DIGITS_TO_ZERO):
+            return json.loads(data)
+
+        return self._orjson.loads(data)
+
+
+_CODECS = {
+    STDLIB: StdlibJsonCodec,
+    ORJSON: OrjsonCodec
+}
+_default_codec = None
+_default_codec_lock = threading.Lock()
+
+
+def default_codec() -> JsonCodec:
+    """The fastest codec available in this environment: orjson if it is installed, otherwise the stdlib.
+    """
+    global _default_codec
+
+    with _default_codec_lock:
+        if _default_codec is None:
+            try:
+                _default_codec = OrjsonCodec()
+            except ImportError:
+                _default_codec = StdlibJsonCodec()
+
+        return _default_codec
+
+
+def get_codec(codec=None) -> JsonCodec:
+    """Resolve a codec from a JsonCodec, the name of a supported library, or None for the default.
+    """
+    if codec is None:
+        return default_codec()
+    elif isinstance(codec, JsonCodec):
+        return codec
+    elif codec in _CODECS:
+        try:
+            return _CODECS.get(codec)()
+        except ImportError:
+            raise InvalidArgumentsException(f"JSON Codec {codec} is not installed")
+    else:
+        raise InvalidArgumentsException(f"JSON Codec must be a JsonCodec or one of {list(_CODECS.keys())}")
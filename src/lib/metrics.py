@@ -0,0 +1,272 @@
+import contextvars
+import functools
+import inspect
+import logging
+import threading
+import time
+from src.lib.transport import CONNECT, TTFB, TRANSFER
+
+# latencies are recorded in whole microseconds, in HDR style buckets which keep 7 significant bits at every scale
+_SUB_BUCKET_BITS = 7
+_SUB_BUCKET_COUNT = 1 << _SUB_BUCKET_BITS
+
+SERIALIZE = "serialize"
+SIGN = "sign"
+DECODE = "decode"
+WAIT = "wait"
+TOTAL = "total"
+PHASES = [SERIALIZE, SIGN, WAIT, CONNECT, TTFB, TRANSFER, DECODE, TOTAL]
+PERCENTILES = [50, 90, 99, 99.9]
+
+_OPERATION = contextvars.ContextVar("data_api_operation", default=None)
+_EVENT_ATTRIBUTE = "_data_api_request_event"
+
+
+class RequestEvent:
+    """Timing and size of one call made by the HttpHelper, including any retries, passed to every metrics callback.
+
+    phases maps each phase that was measured to its seconds, summed over every attempt. connect, ttfb and transfer are
+    measured by the RequestsTransport and Http2Transport, and ttfb by the InMemoryTransport. There is no decode phase
+    for streamed responses, whose Items are decoded as the caller iterates over them. wait is time spent in the rate limiter and backing off
+    between retries. status is None if no response was received.
+    """
+    operation = None
+    method = None
+    path = None
+    data_type = None
+    status = None
+    retries = 0
+    bytes_out = 0
+    bytes_in = None
+    error = None
+
+    def __init__(self, operation: str, method: str, path: str, data_type: str = None):
+        self.operation = operation
+        self.method = method
+        self.path = path
+        self.data_type = data_type
+        self.phases = {}
+        self.started = time.perf_counter()
+
+    def add(self, phase: str, seconds: float):
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+    @property
+    def failed(self):
+        # only throttling, server and connection errors count, as a 404 or 409 is a normal answer to some requests
+        return self.error is not None or self.status is None or self.status >= 500 or self.status == 429
+
+    def __repr__(self):
+        timings = ", ".join(f"{k}={v * 1000:.3f}ms" for k, v in self.phases.items())
+        return f"RequestEvent(operation={self.operation}, method={self.method}, path={self.path}, " \
+               f"status={self.status}, retries={self.retries}, bytes_out={self.bytes_out}, " \
+               f"bytes_in={self.bytes_in}, {timings})"
+
+
+class LatencyHistogram:
+    """Log-linear latency histogram in the style of HdrHistogram. Values are counted in buckets whose width grows
+    with the value, so any percentile is reported to within 2% at a fixed cost per value, whatever the range.
+    """
+
+    def __init__(self):
+        self._counts = {}
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+
+    @staticmethod
+    def _bucket(value: int) -> tuple:
+        if value < _SUB_BUCKET_COUNT:
+            return value, value
+
+        shift = value.bit_length() - _SUB_BUCKET_BITS
+        lowest = (value >> shift) << shift
+
+        return lowest, lowest + (1 << shift) - 1
+
+    def record(self, seconds: float):
+        value = max(0, int(seconds * 1_000_000))
+        lowest, _ = self._bucket(value)
+
+        self._counts[lowest] = self._counts.get(lowest, 0) + 1
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def percentile(self, percentile: float) -> float:
+        """The value in seconds below which percentile percent of the values fall, or None if there are no values.
+        """
+        if self.count == 0:
+            return None
+
+        rank = max(1, int(percentile / 100 * self.count + 0.5))
+        seen = 0
+        for lowest in sorted(self._counts):
+            seen += self._counts[lowest]
+            if seen >= rank:
+                # report the highest value the bucket could hold, but never more than was recorded
+                return min(self._bucket(lowest)[1], self.max) / 1_000_000
+
+        return self.max / 1_000_000
+
+    def summary(self) -> dict:
+        summary = {"count": self.count, "mean_ms": round(self.total / self.count / 1000, 3) if self.count else None,
+                   "min_ms": self.min / 1000 if self.min is not None else None}
+        for p in PERCENTILES:
+            value = self.percentile(p)
+            summary[f"p{p:g}_ms"] = round(value * 1000, 3) if value is not None else None
+        summary["max_ms"] = self.max / 1000 if self.max is not None else None
+
+        return summary
+
+
+class _OperationStats:
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.retries = 0
+        self.bytes_out = 0
+        self.bytes_in = 0
+        self.histograms = {}
+
+
+class RequestMetrics:
+    """Collects a RequestEvent for every call made by a Client, keeping latency histograms of each phase per Client
+    method, and passing each event to the callbacks.
+
+    Callbacks are called on the thread that made the call, once the response has been decoded, so they should be
+    quick. Exceptions raised by a callback are logged and otherwise ignored. A RequestMetrics may be shared by several
+    Clients.
+    """
+
+    def __init__(self, callbacks: list = None, histograms: bool = True, logger: logging.Logger = None):
+        self._callbacks = list(callbacks) if callbacks is not None else []
+        self._histograms = histograms
+        self._logger = logger if logger is not None else logging.getLogger("RequestMetrics")
+        self._operations = {}
+        self._lock = threading.Lock()
+
+    def add_callback(self, callback):
+        self._callbacks.append(callback)
+
+    def remove_callback(self, callback):
+        self._callbacks.remove(callback)
+
+    def start(self, method: str, path: str, data_type: str = None) -> RequestEvent:
+        operation = _OPERATION.get()
+
+        return RequestEvent(operation if operation is not None else method, method, path, data_type)
+
+    def record(self, event: RequestEvent):
+        event.phases[TOTAL] = time.perf_counter() - event.started
+
+        if self._histograms:
+            with self._lock:
+                stats = self._operations.get(event.operation)
+                if stats is None:
+                    stats = self._operations[event.operation] = _OperationStats()
+
+                stats.count += 1
+                stats.errors += 1 if event.failed else 0
+                stats.retries += event.retries
+                stats.bytes_out += event.bytes_out
+                stats.bytes_in += event.bytes_in if event.bytes_in is not None else 0
+
+                for phase, seconds in event.phases.items():
+                    histogram = stats.histograms.get(phase)
+                    if histogram is None:
+                        histogram = stats.histograms[phase] = LatencyHistogram()
+                    histogram.record(seconds)
+
+        for callback in self._callbacks:
+            try:
+                callback(event)
+            except Exception as e:
+                self._logger.warning(f"Metrics callback {callback!r} failed with {e!r}")
+
+    def histogram(self, operation: str, phase: str = TOTAL) -> LatencyHistogram:
+        with self._lock:
+            stats = self._operations.get(operation)
+            return stats.histograms.get(phase) if stats is not None else None
+
+    def snapshot(self, reset: bool = False) -> dict:
+        """Counts, bytes and latency percentiles of every phase, per Client method.
+        """
+        with self._lock:
+            operations = self._operations
+            if reset:
+                self._operations = {}
+
+            return {operation: {"count": stats.count, "errors": stats.errors, "retries": stats.retries,
+                                "bytes_out": stats.bytes_out, "bytes_in": stats.bytes_in,
+                                "latency": {phase: stats.histograms[phase].summary()
+                                            for phase in PHASES if phase in stats.histograms}}
+                    for operation, stats in operations.items()}
+
+
+def attach(response, event: RequestEvent):
+    """Hold the event on its response until the response has been decoded.
+    """
+    setattr(response, _EVENT_ATTRIBUTE, event)
+
+
+def detach(response) -> RequestEvent:
+    try:
+        event = vars(response).pop(_EVENT_ATTRIBUTE, None)
+    except TypeError:
+        return None
+
+    return event if isinstance(event, RequestEvent) else None
+
+
+def bind_operation(func):
+    """Wrap func so that the requests it makes are named after the Client method running now, whichever thread calls
+    it and whenever. Used for the work a method hands to worker threads, iterators or writers, which would otherwise
+    run outside the method and be named after the methods they call.
+    """
+    operation = _OPERATION.get()
+    if operation is None:
+        return func
+
+    @functools.wraps(func)
+    def bound(*args, **kwargs):
+        token = _OPERATION.set(operation)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _OPERATION.reset(token)
+
+    return bound
+
+
+def _labelled(name: str, func):
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if _OPERATION.get() is not None:
+            return func(*args, **kwargs)
+
+        token = _OPERATION.set(name)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _OPERATION.reset(token)
+
+    # functools.wraps is not followed by inspect.getfullargspec, so give the wrapper the signature of the method
+    wrapper.__signature__ = inspect.signature(func)
+
+    return wrapper
+
+
+def label_operations(client):
+    """Name the requests made by each public method of a Client after the method, so that metrics are kept per method.
+    Requests made by a method called from another are named after the outermost method, including those made later or
+    on other threads by work bound with bind_operation(). Only applied to Clients which record metrics, so that the
+    methods of other Clients are called directly.
+    """
+    for name in dir(type(client)):
+        if not name.startswith("_") and inspect.isfunction(inspect.getattr_static(type(client), name)):
+            setattr(client, name, _labelled(name, getattr(client, name)))
+
+    return client
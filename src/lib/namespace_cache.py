@@ -0,0 +1,88 @@
+import copy
+import threading
+import time
+from src.lib.single_flight import SingleFlight
+
+DEFAULT_NAMESPACE_CACHE_TTL = 3600
+
+# the kinds of control plane document that are cached
+NAMESPACES = "namespaces"
+ENDPOINTS = "endpoints"
+STATUS = "status"
+INFO = "info"
+
+
+class NamespaceMetadataCache:
+    """Cache of Namespace control plane documents (info, namespaces, endpoints and status), which rarely change.
+
+    Entries are keyed by (api, kind, data_type), where api identifies the API and Stage, and expire after ttl seconds.
+    When several threads ask for the same missing or expired entry, only one of them calls the API, and the others
+    wait for and share its result or exception. A document still being fetched when the cache is invalidated is not
+    stored, as it may predate the change. Thread safe. A process-wide instance is available from get_metadata_cache().
+    """
+
+    def __init__(self, ttl: float = DEFAULT_NAMESPACE_CACHE_TTL):
+        self._ttl = ttl
+        self._entries = {}
+        self._flight = SingleFlight()
+        # incremented by every invalidation, so that loads which overlap one can tell
+        self._generation = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: tuple, load):
+        """Get the document for a key, calling load() to fetch it if it is absent or expired.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is not None and entry[0] >= time.monotonic():
+                self.hits += 1
+            else:
+                self.misses += 1
+                entry = None
+
+        if entry is not None:
+            return copy.deepcopy(entry[1])
+
+        return self._flight.do(key, lambda: self._load(key, load))
+
+    def _load(self, key: tuple, load):
+        with self._lock:
+            generation = self._generation
+
+        value = load()
+
+        with self._lock:
+            if generation == self._generation:
+                self._entries[key] = (time.monotonic() + self._ttl, copy.deepcopy(value))
+
+        return value
+
+    def invalidate(self, api: str = None, kind: str = None, data_type: str = None):
+        """Drop the cached documents matching every supplied argument, so that they are fetched again on next use. With
+        no arguments, the whole cache is cleared.
+        """
+        def _matches(key):
+            return (api is None or key[0] == api) and (kind is None or key[1] == kind) and \
+                (data_type is None or key[2] == data_type)
+
+        with self._lock:
+            self._generation += 1
+
+            for key in list(self._entries):
+                if _matches(key):
+                    del self._entries[key]
+
+        # callers arriving after the invalidation fetch the document again, rather than joining a load sent before it
+        self._flight.forget(_matches)
+
+
+_shared_metadata_cache = NamespaceMetadataCache()
+
+
+def get_metadata_cache() -> NamespaceMetadataCache:
+    """The process-wide Namespace metadata cache.
+    """
+    return _shared_metadata_cache
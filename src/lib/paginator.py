@@ -0,0 +1,120 @@
+from concurrent.futures import ThreadPoolExecutor
+import src.parameters as params
+from src.exceptions import InvalidArgumentsException
+from src.lib.streaming import StreamingPage
+
+
+class Paginator:
+    """Follows LastEvaluatedKey across pages of a list or find request, yielding the Items of each page.
+
+    With prefetch enabled, the request for page N+1 is issued on a background thread as soon as page N arrives, so the
+    round trip for the next page overlaps with the caller processing the current one.
+
+    Pages may also be StreamingPages, whose Items are decoded as the response arrives. The continuation token of a
+    streamed page is only known once its body has been read, so the next page is requested after the current one has
+    been consumed, and prefetch does not apply.
+
+    Resuming is page aligned. When max_items stops iteration partway through a page, last_evaluated_key is the token
+    that page was fetched with, so a Paginator resumed from it returns that page's Items again rather than skipping
+    the ones not yet returned. exhausted is set once the last page has been read to the end.
+    """
+
+    def __init__(self, fetch_page, start_token=None, max_items: int = None, max_pages: int = None,
+                 prefetch: bool = True):
+        """
+        :param fetch_page: callable of (start_token) returning a response page with Items and LastEvaluatedKey
+        """
+        if max_items is not None and (not isinstance(max_items, int) or max_items < 1):
+            raise InvalidArgumentsException("Max Items must be a positive Integer")
+        if max_pages is not None and (not isinstance(max_pages, int) or max_pages < 1):
+            raise InvalidArgumentsException("Max Pages must be a positive Integer")
+
+        self._fetch_page = fetch_page
+        self._start_token = start_token
+        self._max_items = max_items
+        self._max_pages = max_pages
+        self._prefetch = prefetch
+
+        # the continuation token to resume from later
+        self.last_evaluated_key = None
+        self.exhausted = False
+        # the token the page being returned was fetched with
+        self._page_token = start_token
+
+    def _more_wanted(self, pages: int, items: int):
+        return (self._max_pages is None or pages < self._max_pages) and \
+               (self._max_items is None or items < self._max_items)
+
+    def pages(self):
+        """Iterate over the response pages, rather than the Items in them.
+        """
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="DataAPIPrefetch") if self._prefetch else None
+        pages = 0
+        items = 0
+        token = self._start_token
+
+        try:
+            pending = executor.submit(self._fetch_page, token) if executor is not None else None
+
+            while True:
+                page = pending.result() if pending is not None else self._fetch_page(token)
+                pages += 1
+                self._page_token = token
+
+                if isinstance(page, StreamingPage):
+                    try:
+                        yield page
+
+                        # reads whatever is left of the body
+                        token = page.last_evaluated_key
+                    finally:
+                        page.close()
+
+                    items += page.item_count
+                    self.last_evaluated_key = token
+                    self.exhausted = token is None
+
+                    if token is None or not self._more_wanted(pages, items):
+                        break
+
+                    pending = None
+                    continue
+
+                page_items = page.get("Items", []) if page is not None else []
+                items += len(page_items)
+                token = page.get(params.LAST_EVALUATED_KEY) if page is not None else None
+                self.last_evaluated_key = token
+                self.exhausted = token is None
+
+                more = token is not None and self._more_wanted(pages, items)
+                if more and executor is not None:
+                    pending = executor.submit(self._fetch_page, token)
+
+                yield page
+
+                if not more:
+                    break
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=False)
+
+    def __iter__(self):
+        items = 0
+
+        for page in self.pages():
+            streamed = isinstance(page, StreamingPage)
+            page_items = page if streamed else page.get("Items", []) if page is not None else []
+
+            for i, item in enumerate(page_items):
+                if self._max_items is not None and items >= self._max_items:
+                    return
+
+                items += 1
+
+                # stopping partway through the page, so resume from its start. Whether a streamed page has more Items
+                # is not known until the next one is decoded, so it is assumed to
+                if items == self._max_items and (streamed or i < len(page_items) - 1):
+                    self.last_evaluated_key = self._page_token
+                    self.exhausted = False
+
+                yield item
@@ -0,0 +1,134 @@
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import src.parameters as params
+from src.exceptions import InvalidArgumentsException
+
+DEFAULT_SCAN_SEGMENTS = 4
+DEFAULT_SCAN_BUFFER_PAGES = 8
+_QUEUE_POLL_SECONDS = 0.1
+_SEGMENT_DONE = object()
+
+
+class SegmentProgress:
+    """Progress of a single segment of a parallel scan, passed to the scan progress callback after every page.
+    """
+    segment = None
+    pages = 0
+    items = 0
+    complete = False
+
+    def __init__(self, segment: int):
+        self.segment = segment
+
+    def __repr__(self):
+        return f"SegmentProgress(segment={self.segment}, pages={self.pages}, items={self.items}, " \
+               f"complete={self.complete})"
+
+
+class _SegmentError:
+    def __init__(self, exception: Exception):
+        self.exception = exception
+
+
+class ParallelScanner:
+    """Runs every segment of a parallel list on a worker pool, following LastEvaluatedKey in each segment, and yields
+    the Items as pages arrive.
+
+    Pages wait in bounded queues until the consumer takes them, so a slow consumer blocks the workers rather than
+    growing memory. With ordered=True, all Items of segment 0 are yielded before segment 1 and so on, while the later
+    segments keep fetching into their own queues.
+    """
+
+    def __init__(self, list_page, total_segments: int = DEFAULT_SCAN_SEGMENTS, ordered: bool = False,
+                 buffer_pages: int = DEFAULT_SCAN_BUFFER_PAGES, max_workers: int = None, progress_callback=None):
+        """
+        :param list_page: callable of (segment, start_token) returning a list_items response page
+        """
+        if not isinstance(total_segments, int) or total_segments < 1:
+            raise InvalidArgumentsException("Total Segments must be a positive Integer")
+        if not isinstance(buffer_pages, int) or buffer_pages < 1:
+            raise InvalidArgumentsException("Buffer Pages must be a positive Integer")
+
+        self._list_page = list_page
+        self._total_segments = total_segments
+        self._ordered = ordered
+        self._max_workers = max_workers if max_workers is not None else total_segments
+        self._progress_callback = progress_callback
+        self._stopped = threading.Event()
+
+        if ordered:
+            per_segment = max(1, buffer_pages // total_segments)
+            self._queues = [queue.Queue(maxsize=per_segment) for _ in range(total_segments)]
+        else:
+            shared = queue.Queue(maxsize=buffer_pages)
+            self._queues = [shared] * total_segments
+
+    def _put(self, segment: int, entry):
+        # wait for space, but give up if the consumer has gone away
+        while not self._stopped.is_set():
+            try:
+                self._queues[segment].put(entry, timeout=_QUEUE_POLL_SECONDS)
+                return True
+            except queue.Full:
+                pass
+
+        return False
+
+    def _scan_segment(self, segment: int):
+        progress = SegmentProgress(segment)
+        start_token = None
+
+        try:
+            while not self._stopped.is_set():
+                page = self._list_page(segment, start_token)
+                items = page.get("Items", []) if page is not None else []
+
+                progress.pages += 1
+                progress.items += len(items)
+                start_token = page.get(params.LAST_EVALUATED_KEY) if page is not None else None
+                progress.complete = start_token is None
+
+                if len(items) > 0 and not self._put(segment, items):
+                    return
+
+                if self._progress_callback is not None:
+                    self._progress_callback(progress)
+
+                if progress.complete:
+                    break
+        except Exception as e:
+            self._put(segment, _SegmentError(e))
+            return
+
+        self._put(segment, _SEGMENT_DONE)
+
+    def __iter__(self):
+        pool = ThreadPoolExecutor(max_workers=self._max_workers, thread_name_prefix="DataAPIScan")
+
+        try:
+            for segment in range(self._total_segments):
+                pool.submit(self._scan_segment, segment)
+
+            if self._ordered:
+                for segment in range(self._total_segments):
+                    yield from self._drain(self._queues[segment], 1)
+            else:
+                yield from self._drain(self._queues[0], self._total_segments)
+        finally:
+            # also reached when the caller stops iterating early, which releases any blocked workers
+            self._stopped.set()
+            pool.shutdown(wait=False)
+
+    def _drain(self, q: queue.Queue, segments: int):
+        remaining = segments
+
+        while remaining > 0:
+            entry = q.get()
+
+            if entry is _SEGMENT_DONE:
+                remaining -= 1
+            elif isinstance(entry, _SegmentError):
+                raise entry.exception
+            else:
+                yield from entry
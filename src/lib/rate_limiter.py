@@ -0,0 +1,137 @@
+import threading
+import time
+from src.lib.request_args import is_read_request
+from src.exceptions import InvalidArgumentsException
+
+DEFAULT_READ_RATE = 100
+DEFAULT_WRITE_RATE = 50
+DEFAULT_MIN_RATE = 1
+DEFAULT_DECREASE_FACTOR = 0.5
+DEFAULT_ADDITIVE_INCREASE = 1
+DEFAULT_DECREASE_INTERVAL = 1
+THROTTLE_STATUS_CODES = frozenset([429])
+READ = "read"
+WRITE = "write"
+
+
+class TokenBucket:
+    """Thread safe token bucket refilled continuously at a configurable rate.
+
+    Callers reserve a token and are told how long to wait for it, so the bucket works for both threads and coroutines.
+    Reservations can run the bucket negative, which queues callers behind each other in arrival order.
+    """
+
+    def __init__(self, rate: float, burst: float = None):
+        if rate <= 0:
+            raise InvalidArgumentsException("Rate must be greater than 0")
+
+        self._rate = float(rate)
+        self._burst = float(burst) if burst is not None else max(1.0, self._rate)
+        self._tokens = self._burst
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    @property
+    def rate(self):
+        return self._rate
+
+    def _refill(self, now: float):
+        self._tokens = min(self._burst, self._tokens + (now - self._last) * self._rate)
+        self._last = now
+
+    def set_rate(self, rate: float):
+        with self._lock:
+            self._refill(time.monotonic())
+            self._rate = float(rate)
+
+    def reserve(self) -> float:
+        """Take a token, returning the number of seconds to wait before using it.
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens -= 1
+
+            return 0.0 if self._tokens >= 0 else -self._tokens / self._rate
+
+    def acquire(self):
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+
+class AdaptiveRateLimiter:
+    """Client side rate limiter with separate read and write token buckets, adapted with AIMD.
+
+    Every throttled response multiplies the rate of its bucket by decrease_factor (at most once per decrease_interval,
+    so that a burst of throttles from requests already in flight only counts once). Every successful response adds
+    roughly additive_increase requests/second per second. One instance can be shared by any number of Clients and
+    threads, so that they collectively stay just under the limit of the API:
+
+        limiter = AdaptiveRateLimiter(read_rate=500, write_rate=100)
+        clients = [DataAPIClient(stage="dev", rate_limiter=limiter) for _ in range(workers)]
+    """
+
+    def __init__(self, read_rate: float = DEFAULT_READ_RATE, write_rate: float = DEFAULT_WRITE_RATE,
+                 min_rate: float = DEFAULT_MIN_RATE, max_read_rate: float = None, max_write_rate: float = None,
+                 decrease_factor: float = DEFAULT_DECREASE_FACTOR, additive_increase: float = DEFAULT_ADDITIVE_INCREASE,
+                 decrease_interval: float = DEFAULT_DECREASE_INTERVAL):
+        if not 0 < decrease_factor < 1:
+            raise InvalidArgumentsException("Decrease Factor must be between 0 and 1")
+
+        self._buckets = {READ: TokenBucket(read_rate), WRITE: TokenBucket(write_rate)}
+        self._max_rates = {READ: max_read_rate, WRITE: max_write_rate}
+        self._last_decrease = {READ: 0.0, WRITE: 0.0}
+        self._min_rate = min_rate
+        self._decrease_factor = decrease_factor
+        self._additive_increase = additive_increase
+        self._decrease_interval = decrease_interval
+        self._lock = threading.Lock()
+
+    @property
+    def read_rate(self):
+        return self._buckets[READ].rate
+
+    @property
+    def write_rate(self):
+        return self._buckets[WRITE].rate
+
+    def _kind(self, method: str, encoded_path: str):
+        return READ if is_read_request(method, encoded_path) else WRITE
+
+    def reserve(self, method: str, encoded_path: str) -> float:
+        """Take a token for a request, returning the number of seconds to wait before sending it.
+        """
+        return self._buckets[self._kind(method, encoded_path)].reserve()
+
+    def acquire(self, method: str, encoded_path: str):
+        """Block until a request may be sent.
+        """
+        wait = self.reserve(method, encoded_path)
+        if wait > 0:
+            time.sleep(wait)
+
+    def record(self, method: str, encoded_path: str, status_code: int):
+        """Adapt the rate of the request's bucket to the response it received.
+        """
+        kind = self._kind(method, encoded_path)
+        bucket = self._buckets[kind]
+
+        with self._lock:
+            rate = bucket.rate
+
+            if status_code in THROTTLE_STATUS_CODES:
+                now = time.monotonic()
+                if now - self._last_decrease[kind] < self._decrease_interval:
+                    return
+
+                self._last_decrease[kind] = now
+                new_rate = max(self._min_rate, rate * self._decrease_factor)
+            elif status_code < 500:
+                # spread the increase over the requests sent in a second
+                new_rate = rate + self._additive_increase / rate
+                if self._max_rates[kind] is not None:
+                    new_rate = min(self._max_rates[kind], new_rate)
+            else:
+                return
+
+            bucket.set_rate(new_rate)
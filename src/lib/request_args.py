@@ -0,0 +1,318 @@
+import http
+from src.exceptions import *
+import src.parameters as params
+from src.lib.streaming import StreamingPage, DEFAULT_STREAM_CHUNK_SIZE
+from src.lib.json_codec import JsonCodec, default_codec
+
+# Request building, argument validation and response mapping shared by the sync and async Data API Clients, so that
+# both apply exactly the same rules
+
+# POST is used for find, which only reads
+_READ_METHODS = frozenset(["GET", "HEAD"])
+_READ_POST_PATHS = frozenset(["find"])
+
+
+def is_read_request(method: str, encoded_path: str) -> bool:
+    """Whether a request only reads data, and is therefore safe to repeat.
+    """
+    method = method.upper()
+
+    if method in _READ_METHODS:
+        return True
+    else:
+        return method == "POST" and encoded_path.split("?")[0].rsplit("/", 1)[-1] in _READ_POST_PATHS
+
+
+def handle_response(response, codec: JsonCodec = None):
+    if codec is None:
+        codec = default_codec()
+
+    if response.status_code in [http.HTTPStatus.CREATED, http.HTTPStatus.ACCEPTED]:
+        if response.content is not None:
+            content_body = codec.loads(response.content)
+
+            if content_body is not None:
+                return content_body
+
+        return True
+    elif response.status_code == http.HTTPStatus.NOT_MODIFIED:
+        return False
+    elif response.status_code == http.HTTPStatus.NO_CONTENT:
+        return None
+    elif response.status_code == http.HTTPStatus.BAD_REQUEST:
+        raise InvalidArgumentsException()
+    elif response.status_code == http.HTTPStatus.NOT_FOUND:
+        raise ResourceNotFoundException()
+    elif response.status_code == http.HTTPStatus.CONFLICT:
+        raise ConstraintViolationException()
+    elif response.status_code == http.HTTPStatus.INTERNAL_SERVER_ERROR:
+        raise Exception(response.reason)
+    elif response.status_code != http.HTTPStatus.OK:
+        message = response.reason
+
+        if "content" in response:
+            content_body = codec.loads(response.get("content"))
+            if "Message" in content_body:
+                message = content_body.get("Message")
+            else:
+                return content_body
+
+        raise DetailedException(message)
+    else:
+        if response is None:
+            return None
+        else:
+            # decode the body bytes directly, rather than through a decoded copy of the text
+            if response.content is not None and len(response.content) > 0:
+                return codec.loads(response.content)
+            else:
+                return True
+
+
+def handle_streaming_response(response, transform=None, codec: JsonCodec = None):
+    """Map a response requested with stream=True. A successful list or find page is returned as a StreamingPage that
+    decodes its Items as the body arrives, and any other response is read in full and mapped as by handle_response.
+    """
+    if response.status_code == http.HTTPStatus.OK:
+        return StreamingPage(response.iter_content(chunk_size=DEFAULT_STREAM_CHUNK_SIZE), close=response.close,
+                             transform=transform, codec=codec)
+
+    try:
+        return handle_response(response, codec)
+    finally:
+        response.close()
+
+
+def validate_item_structure(structure, omit=None):
+    valid_top_level = ["Resource", "Metadata", "References"]
+
+    if omit is not None:
+        for o in omit:
+            valid_top_level.pop(o)
+
+    if not any([x in structure for x in valid_top_level]):
+        raise InvalidArgumentsException("Item must include Resource, Metadata, or References")
+
+
+def provision_body(data_type: str, primary_key: str, table_indexes=None, metadata_indexes=None, delete_mode=None,
+                   crawler_rolename=None, schema_validation_refresh_hitcount=None,
+                   graph_endpoint=None, allow_non_item_master_writes=True, strict_occv=False, catalog_database=None,
+                   es_domain=None, es_delivery_role_arn=None, es_delivery_failure_s3=None, pitr_enabled=True,
+                   kms_key_arn=None):
+    return {
+        params.DATA_TYPE: data_type,
+        params.PRIMARY_KEY: primary_key,
+        params.TABLE_INDEXES: table_indexes,
+        params.METADATA_INDEXES: metadata_indexes,
+        params.DELETE_MODE: delete_mode,
+        params.CRAWLER_ROLENAME: crawler_rolename,
+        params.SCHEMA_VALIDATION_REFRESH_HITCOUNT: schema_validation_refresh_hitcount,
+        params.GREMLIN_ADDRESS: graph_endpoint,
+        params.NON_ITEM_MASTER_WRITES_ALLOWED: allow_non_item_master_writes,
+        params.STRICT_OCCV: strict_occv,
+        params.CATALOG_DATABASE: catalog_database,
+        params.ES_DOMAIN: es_domain,
+        params.FIREHOSE_DELIVERY_ROLE_ARN: es_delivery_role_arn,
+        params.DELIVERY_STREAM_FAILURE_BUCKET: es_delivery_failure_s3,
+        params.PITR_ENABLED: pitr_enabled,
+        params.KMS_KEY_ARN: kms_key_arn
+    }
+
+
+def info_filters(attribute_filters: list = None):
+    if attribute_filters is not None:
+        return {
+            params.ATTRIBUTE_FILTER_PARAM: ','.join(attribute_filters)
+        }
+    else:
+        return None
+
+
+def list_items_args(page_size: int = None, start_token: str = None, segment: int = None, total_segments: int = None):
+    # validate args
+    args = {}
+    try:
+        args[params.QUERY_PARAM_LIMIT] = int(page_size)
+        if segment is not None:
+            args[params.QUERY_PARAM_SEGMENT] = int(segment)
+        if total_segments is not None:
+            args[params.QUERY_PARAM_TOTAL_SEGMENTS] = int(total_segments)
+    except ValueError as e:
+        raise InvalidArgumentsException("Invalid Value for page_size, segment, or total_segments. Must be Int")
+
+    if segment is not None and total_segments is None:
+        raise InvalidArgumentsException("Parallel List requires segment and total_segments")
+
+    if start_token is not None:
+        args[params.EXCLUSIVE_START_KEY] = start_token
+
+    return args
+
+
+def item_master_body(item_id: str, item_master_id: str):
+    return {
+        "id": item_id,
+        "ItemMasterID": item_master_id
+    }
+
+
+def find_request(resource_attributes=None, metadata_attributes=None, start_token: str = None, limit: int = None,
+                 consistent_read: bool = None):
+    if resource_attributes is not None and metadata_attributes is not None:
+        raise InvalidArgumentsException("Provide Resource or Metadata attributes to search, but not both")
+
+    if limit is not None and not isinstance(limit, int):
+        raise InvalidArgumentsException("Limit must be an Integer")
+
+    if consistent_read is not None and not isinstance(consistent_read, bool):
+        raise InvalidArgumentsException("Consistent Read must be a Boolean")
+
+    search_request = {}
+    if resource_attributes is not None and not isinstance(resource_attributes, dict):
+        raise InvalidArgumentsException("Resource Attributes must be a Dictionary")
+    else:
+        search_request[params.RESOURCE] = resource_attributes
+
+    if metadata_attributes is not None and not isinstance(metadata_attributes, dict):
+        raise InvalidArgumentsException("Metadata Attributes must be a Dictionary")
+    else:
+        search_request[params.METADATA] = metadata_attributes
+
+    if start_token is not None:
+        search_request[params.EXCLUSIVE_START_KEY] = start_token
+
+    if limit is not None:
+        search_request[params.QUERY_PARAM_LIMIT] = limit
+
+    if consistent_read is not None and consistent_read is True:
+        search_request[params.QUERY_PARAM_CONSISTENT] = "True"
+
+    return search_request
+
+
+def get_resource_args(item_master_option: str = None, suppress_metadata_fetch: bool = False,
+                      only_attributes: list = None, not_attributes: list = None):
+    p = {}
+    if item_master_option is not None:
+        if item_master_option.lower() not in [params.ITEM_MASTER_INCLUDE.lower(),
+                                              params.ITEM_MASTER_PREFER.lower()]:
+            raise InvalidArgumentsException(
+                f"Item Master option should be {params.ITEM_MASTER_PREFER} or {params.ITEM_MASTER_INCLUDE}")
+        p[params.ITEM_MASTER_QP] = item_master_option
+
+    if suppress_metadata_fetch is not None:
+        p[params.SUPPRESS_ITEM_METADATA_FETCH] = suppress_metadata_fetch
+
+    if only_attributes is not None:
+        p[params.WHITELIST_ATTRIBUTES] = ",".join(only_attributes)
+
+    if not_attributes is not None:
+        p[params.BLACKLIST_ATTRIBUTES] = ",".join(not_attributes)
+
+    return p
+
+
+def delete_resource_body(delete_mode: str = None):
+    body = {}
+    if delete_mode is not None:
+        body[params.DELETE_MODE] = delete_mode
+
+    return body
+
+
+def delete_attributes_body(resource_attributes=None, metadata_attributes=None):
+    # validate that at least 1 attribute list has been provided and their type is list
+    if (resource_attributes is None and metadata_attributes is None) or \
+            (resource_attributes is not None and not isinstance(resource_attributes, list)) or \
+            (metadata_attributes is not None and not isinstance(metadata_attributes, list)) or \
+            (resource_attributes is not None and len(resource_attributes) == 0) or \
+            (metadata_attributes is not None and len(metadata_attributes) == 0):
+        raise InvalidArgumentsException("Provide either Resource or Metadata attributes to remove")
+
+    delete = {}
+    if resource_attributes is not None:
+        delete["Resource"] = resource_attributes
+
+    if metadata_attributes is not None:
+        delete["Metadata"] = metadata_attributes
+
+    return delete
+
+
+# prepare a full item that is well formed by the client for writing
+def prepare_item(item: dict, item_version: int = None, strict_schema: bool = None):
+    # ensure the item is well formed
+    validate_item_structure(item)
+
+    if item_version is not None:
+        if not isinstance(item_version, int):
+            raise InvalidArgumentsException("Item Version must be an Integer")
+        else:
+            # ensure that the value of the item version is set correctly
+            iv = "ItemVersion"
+            item.pop(iv)
+            item[iv] = item_version
+
+    if strict_schema is not None and isinstance(strict_schema, bool) and strict_schema is True:
+        item["StrictSchemaValidation"] = 'True'
+
+    return item
+
+
+def resource_item(resource: dict):
+    if params.RESOURCE in resource:
+        return resource
+    else:
+        return {params.RESOURCE: resource}
+
+
+def metadata_item(meta: dict):
+    if params.METADATA in meta:
+        return meta
+    else:
+        return {params.METADATA: meta}
+
+
+def references_item(references: dict):
+    if params.REFERENCES in references:
+        return references
+    else:
+        return {params.REFERENCES: [references]}
+
+
+def lineage_args(direction: str, max_depth: int = None):
+    p = None
+    if max_depth is not None:
+        if not isinstance(max_depth, int):
+            raise InvalidArgumentsException("Max Depth must be an Integer")
+        else:
+            p = {"search_depth": max_depth}
+
+    if direction.upper() == 'UP':
+        d = "upstream"
+    else:
+        d = "downstream"
+
+    return d, p
+
+
+def export_body(export_job_dpu: int, read_pct: int, s3_export_path: str, log_path: str, setup_crawler: bool = True,
+                kms_key_arn: str = None, catalog_database: str = None):
+    return {
+        params.EXPORT_JOB_DPU: export_job_dpu,
+        params.EXPORT_READ_PCT: read_pct,
+        params.EXPORT_S3_PATH: s3_export_path,
+        params.EXPORT_LOG_PATH: log_path,
+        params.EXPORT_SETUP_CRAWLER: setup_crawler,
+        params.KMS_KEY_ARN: kms_key_arn,
+        params.CATALOG_DATABASE: catalog_database
+    }
+
+
+def export_status_args(job_name: str, job_run_id: str = None):
+    qp = {params.JOB_NAME_PARAM: job_name}
+
+    if job_run_id is not None:
+        qp[params.JOB_RUN_PARAM] = job_run_id
+
+    return qp
@@ -0,0 +1,128 @@
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+import src.parameters as params
+from src.lib.request_args import is_read_request
+
+DEFAULT_BASE_DELAY = 0.1
+DEFAULT_MAX_DELAY = 20
+DEFAULT_RETRY_BUDGET = 500
+RETRY_COST = 5
+CONNECTION_ERROR_RETRY_COST = 10
+NO_RETRY_INCREMENT = 1
+RETRYABLE_STATUS_CODES = frozenset([429, 500, 502, 503, 504])
+
+
+def parse_retry_after(value: str):
+    """Parse a Retry-After header, given either as delay seconds or as an HTTP date. Returns seconds or None.
+    """
+    if value is None:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class RetryBudget:
+    """Token bucket limiting how many retries a Client may make, so that retries cannot amplify an outage.
+
+    Every retry spends tokens and every successful request returns some. While the API keeps failing the bucket drains
+    and requests fail fast, and it refills as requests start succeeding again.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_RETRY_BUDGET):
+        self._capacity = capacity
+        self._tokens = capacity
+        self._lock = threading.Lock()
+
+    @property
+    def available(self):
+        return self._tokens
+
+    def acquire(self, cost: int) -> bool:
+        with self._lock:
+            if self._tokens < cost:
+                return False
+
+            self._tokens -= cost
+            return True
+
+    def release(self, amount: int):
+        with self._lock:
+            self._tokens = min(self._capacity, self._tokens + amount)
+
+
+class RetryPolicy:
+    """Decides whether and when a failed request is retried.
+
+    Throttling (429), transient server errors (500, 502, 503, 504) and connection errors are retried with capped
+    exponential backoff and full jitter, waiting at least as long as any Retry-After header asks. Reads, including find,
+    are always retryable. Writes are only retried when retry_writes is set, as a write may have been applied before the
+    error was returned.
+    """
+
+    def __init__(self, max_retries: int = params.DEFAULT_RETRY_COUNT, base_delay: float = DEFAULT_BASE_DELAY,
+                 max_delay: float = DEFAULT_MAX_DELAY, retry_writes: bool = False, budget: RetryBudget = None):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retry_writes = retry_writes
+        self.budget = budget if budget is not None else RetryBudget()
+
+    def is_retryable_request(self, method: str, path: str) -> bool:
+        if self.max_retries < 1:
+            return False
+
+        return is_read_request(method, path) or self.retry_writes
+
+    def backoff(self, attempt: int, retry_after: float = None):
+        """Delay before retry number attempt (starting at 0), or None if the server asks for a longer wait than
+        max_delay.
+        """
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+        if retry_after is not None:
+            if retry_after > self.max_delay:
+                return None
+            delay = max(delay, retry_after)
+
+        return delay
+
+    def next_delay(self, attempt: int, status_code: int = None, retry_after: str = None, connection_error=False):
+        """Returns the delay before retrying a failed attempt, or None if it must not be retried.
+        """
+        if attempt >= self.max_retries:
+            return None
+
+        if not connection_error and status_code not in RETRYABLE_STATUS_CODES:
+            return None
+
+        delay = self.backoff(attempt, parse_retry_after(retry_after))
+        if delay is None:
+            return None
+
+        if not self.budget.acquire(CONNECTION_ERROR_RETRY_COST if connection_error else RETRY_COST):
+            return None
+
+        return delay
+
+    def record_success(self, attempts: int):
+        # a successful retry refunds its cost, a first time success slowly refills the budget
+        self.budget.release(RETRY_COST if attempts > 0 else NO_RETRY_INCREMENT)
+
+    def sleep(self, delay: float):
+        time.sleep(delay)
@@ -0,0 +1,152 @@
+import functools
+import threading
+import time
+import logging
+from src.exceptions import *
+import src.parameters as params
+
+DEFAULT_SCHEMA_CACHE_TTL = 300
+SCHEMA_TYPE_RESOURCE = "resource"
+SCHEMA_TYPE_METADATA = "metadata"
+
+
+@functools.lru_cache(maxsize=None)
+def schema_library():
+    """The JSON Schema library used to validate Items locally, or None if neither is installed.
+
+    fastjsonschema generates Python code for each schema and is much faster than jsonschema, which is used if it is the
+    only one installed. They are imported on first use rather than with the Client, which only needs them once a
+    SchemaCache compiles a schema.
+    """
+    try:
+        import fastjsonschema
+        return fastjsonschema
+    except ImportError:
+        pass
+
+    try:
+        import jsonschema
+        return jsonschema
+    except ImportError:
+        return None
+
+
+def compile_validator(schema: dict):
+    """Compile a JSON Schema into a function which raises InvalidArgumentsException for a document that does not match
+    it. Returns None if there is no schema, or no JSON Schema library is installed. Raises the error of the library if
+    it cannot compile the schema.
+    """
+    if schema is None or not isinstance(schema, dict) or len(schema) == 0:
+        return None
+
+    library = schema_library()
+    if library is None:
+        return None
+    elif library.__name__ == "fastjsonschema":
+        compiled = library.compile(schema)
+
+        def _validate(document):
+            try:
+                compiled(document)
+            except library.JsonSchemaException as e:
+                raise InvalidArgumentsException(f"Schema Validation Failed: {e.message}")
+
+        return _validate
+    else:
+        cls = library.validators.validator_for(schema)
+        cls.check_schema(schema)
+        validator = cls(schema)
+
+        def _validate(document):
+            error = next(iter(validator.iter_errors(document)), None)
+            if error is not None:
+                raise InvalidArgumentsException(f"Schema Validation Failed: {error.message}")
+
+        return _validate
+
+
+class _Entry:
+    __slots__ = ["validator", "expires", "hits"]
+
+    def __init__(self, validator, expires: float):
+        self.validator = validator
+        self.expires = expires
+        self.hits = 0
+
+
+class SchemaCache:
+    """Cache of compiled Namespace schemas, used to validate Items locally before they are written with strict_schema.
+
+    A schema is fetched again once it is older than ttl seconds, or has been used refresh_hitcount times, mirroring the
+    SchemaValidationRefreshHitcount setting the API applies to its own schema cache. A refresh_hitcount of 0 fetches the
+    schema for every write. Namespaces without a schema are cached too, so they are not fetched for every write.
+    Thread safe, and can be shared between Clients.
+    """
+
+    def __init__(self, ttl: float = DEFAULT_SCHEMA_CACHE_TTL,
+                 refresh_hitcount: int = params.DEFAULT_SCHEMA_VALIDATION_REFRESH_HITCOUNT,
+                 logger: logging.Logger = None):
+        self._ttl = ttl
+        self._refresh_hitcount = refresh_hitcount
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._logger = logger if logger is not None else logging.getLogger("SchemaCache")
+        self.fetches = 0
+
+        if schema_library() is None:
+            self._logger.warning(
+                "Local schema validation requires fastjsonschema or jsonschema. Items will only be validated by the "
+                "API")
+
+    def _current(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is None or entry.expires < time.monotonic() or entry.hits >= self._refresh_hitcount:
+                return None
+
+            entry.hits += 1
+            return entry
+
+    def validator(self, key: tuple, fetch_schema):
+        """Get the compiled validator for a key, calling fetch_schema() to load the schema if it is absent or stale.
+        """
+        entry = self._current(key)
+
+        if entry is None:
+            try:
+                schema = fetch_schema()
+            except ResourceNotFoundException:
+                schema = None
+
+            try:
+                validator = compile_validator(schema)
+            except Exception as e:
+                # such as a schema draft or keyword the library does not support. The API still validates the Item
+                self._logger.warning(f"Could not compile the schema for {key}, so Items will only be validated by the "
+                                     f"API: {e!r}")
+                validator = None
+
+            entry = _Entry(validator, time.monotonic() + self._ttl)
+            # the fetch counts as the first use of the schema
+            entry.hits = 1
+
+            with self._lock:
+                self._entries[key] = entry
+                self.fetches += 1
+
+        return entry.validator
+
+    def validate(self, key: tuple, fetch_schema, document: dict):
+        validator = self.validator(key, fetch_schema)
+
+        if validator is not None:
+            validator(document)
+
+    def invalidate(self, key: tuple):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,164 @@
+import hashlib
+import hmac
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+from urllib.parse import urlsplit, quote, parse_qsl
+from requests.auth import AuthBase
+from src.lib.credentials import CredentialProvider
+
+ALGORITHM = "AWS4-HMAC-SHA256"
+DEFAULT_KEY_CACHE_SIZE = 64
+_SIGNED_HEADERS = ["host", "content-type", "content-encoding"]
+_EMPTY_PAYLOAD_HASH = hashlib.sha256(b"").hexdigest()
+
+
+def _hmac(key: bytes, msg: str) -> bytes:
+    return hmac.new(key, msg.encode("utf-8"), hashlib.sha256).digest()
+
+
+def derive_signing_key(secret_key: str, date_stamp: str, region: str, service: str) -> bytes:
+    """Run the SigV4 HMAC key derivation chain for a single day, region and service.
+    """
+    k_date = _hmac(f"AWS4{secret_key}".encode("utf-8"), date_stamp)
+    k_region = _hmac(k_date, region)
+    k_service = _hmac(k_region, service)
+
+    return _hmac(k_service, "aws4_request")
+
+
+class SigningKeyCache:
+    """Thread safe LRU of derived signing keys, keyed by (date, region, service, credential).
+
+    A derived key is only valid for one UTC day, so at most one entry per credential is live at any time and the cache
+    size only needs to cover the number of distinct credentials in the process.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_KEY_CACHE_SIZE):
+        self._max_size = max_size
+        self._keys = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, access_key: str, secret_key: str, date_stamp: str, region: str, service: str) -> bytes:
+        # the secret is hashed so that the cache never holds a second plain text copy of it
+        cache_key = (date_stamp, region, service, access_key, hashlib.sha256(secret_key.encode("utf-8")).digest())
+
+        with self._lock:
+            signing_key = self._keys.get(cache_key)
+            if signing_key is not None:
+                self._keys.move_to_end(cache_key)
+                self.hits += 1
+                return signing_key
+
+        signing_key = derive_signing_key(secret_key, date_stamp, region, service)
+
+        with self._lock:
+            self.misses += 1
+            self._keys[cache_key] = signing_key
+            while len(self._keys) > self._max_size:
+                self._keys.popitem(last=False)
+
+        return signing_key
+
+    def clear(self):
+        with self._lock:
+            self._keys.clear()
+
+
+# signing keys are shared by every signer in the process
+_shared_key_cache = SigningKeyCache()
+
+
+def get_key_cache() -> SigningKeyCache:
+    return _shared_key_cache
+
+
+class SigV4Signer(AuthBase):
+    """Requests auth handler that signs with AWS Signature Version 4, reusing cached signing keys.
+    """
+
+    def __init__(self, access_key: str, secret_key: str, region: str, service: str, session_token: str = None,
+                 key_cache: SigningKeyCache = None, credential_provider: CredentialProvider = None):
+        self._region = region
+        self._service = service
+        self._key_cache = key_cache if key_cache is not None else _shared_key_cache
+        self._credentials = (access_key, secret_key, session_token)
+        self._credential_provider = credential_provider
+
+    def set_credentials(self, access_key: str, secret_key: str, session_token: str = None):
+        # swap as a single tuple so that concurrent signers never see a mix of old and new values
+        self._credentials = (access_key, secret_key, session_token)
+        self._credential_provider = None
+
+    def _current_credentials(self):
+        if self._credential_provider is not None:
+            credentials = self._credential_provider.get()
+            return credentials.access_key, credentials.secret_key, credentials.session_token
+        else:
+            return self._credentials
+
+    def _canonical_path(self, path: str) -> str:
+        # for services other than S3 the already encoded path is encoded a second time
+        return quote(path if path != "" else "/", safe="/~")
+
+    def _canonical_query(self, query: str) -> str:
+        pairs = [(quote(k, safe="-_.~"), quote(v, safe="-_.~")) for k, v in
+                 parse_qsl(query, keep_blank_values=True)]
+
+        return "&".join(f"{k}={v}" for k, v in sorted(pairs))
+
+    def sign(self, method: str, url: str, headers: dict, body: bytes = None, timestamp: datetime = None) -> dict:
+        """Generate the SigV4 headers for a request. Returns the headers to add to the request.
+        """
+        access_key, secret_key, session_token = self._current_credentials()
+        if timestamp is None:
+            timestamp = datetime.now(timezone.utc)
+        amz_date = timestamp.strftime("%Y%m%dT%H%M%SZ")
+        date_stamp = amz_date[:8]
+
+        url_parts = urlsplit(url)
+        payload_hash = hashlib.sha256(body).hexdigest() if body else _EMPTY_PAYLOAD_HASH
+
+        signing_headers = {
+            "x-amz-date": amz_date,
+            "x-amz-content-sha256": payload_hash
+        }
+        if session_token is not None:
+            signing_headers["x-amz-security-token"] = session_token
+
+        canonical = {"host": url_parts.netloc}
+        for name, value in headers.items():
+            name = name.lower()
+            if name in _SIGNED_HEADERS or name.startswith("x-amz-"):
+                canonical[name] = " ".join(str(value).split())
+        canonical.update(signing_headers)
+
+        signed_headers = ";".join(sorted(canonical))
+        canonical_headers = "".join(f"{name}:{canonical[name]}\n" for name in sorted(canonical))
+        canonical_request = "\n".join([method.upper(), self._canonical_path(url_parts.path),
+                                       self._canonical_query(url_parts.query), canonical_headers, signed_headers,
+                                       payload_hash])
+
+        scope = f"{date_stamp}/{self._region}/{self._service}/aws4_request"
+        string_to_sign = "\n".join(
+            [ALGORITHM, amz_date, scope, hashlib.sha256(canonical_request.encode("utf-8")).hexdigest()])
+
+        signing_key = self._key_cache.get(access_key, secret_key, date_stamp, self._region, self._service)
+        signature = hmac.new(signing_key, string_to_sign.encode("utf-8"), hashlib.sha256).hexdigest()
+
+        signing_headers["Authorization"] = f"{ALGORITHM} Credential={access_key}/{scope}, " \
+                                           f"SignedHeaders={signed_headers}, Signature={signature}"
+
+        return signing_headers
+
+    def __call__(self, r):
+        body = r.body
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+            r.body = body
+
+        r.headers.update(self.sign(r.method, r.url, r.headers, body))
+
+        return r
@@ -0,0 +1,122 @@
+import asyncio
+import copy
+import threading
+from concurrent.futures import Future
+
+_UNSET = object()
+
+
+class _Flight:
+    def __init__(self, future):
+        self.future = future
+        self.waiters = 0
+        # the copy of the result shared by the waiters, taken when an AsyncSingleFlight flight lands
+        self.shared = _UNSET
+
+
+class SingleFlight:
+    """Coalesces identical reads which are in flight at the same time, so that a hot Item read by many threads at once
+    costs one request rather than one per thread.
+
+    The first caller for a key makes the request, and callers arriving while it is in flight wait for and share its
+    result, or have its exception raised. Each waiter gets its own copy of the result. Thread safe.
+    """
+
+    def __init__(self):
+        self._flights = {}
+        self._lock = threading.Lock()
+        self.coalesced = 0
+
+    def do(self, key: tuple, load):
+        """Return load(), or the result of the call already in flight for the key.
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            owner = flight is None
+
+            if owner:
+                flight = self._flights[key] = _Flight(Future())
+            else:
+                flight.waiters += 1
+                self.coalesced += 1
+
+        if not owner:
+            return copy.deepcopy(flight.future.result())
+
+        try:
+            value = load()
+        except BaseException as e:
+            self._land(key, flight)
+            flight.future.set_exception(e)
+            raise
+
+        # the caller may change its result as soon as it is returned, so waiters share a copy taken first
+        if self._land(key, flight) > 0:
+            flight.future.set_result(copy.deepcopy(value))
+        else:
+            flight.future.set_result(None)
+
+        return value
+
+    def _land(self, key: tuple, flight: _Flight) -> int:
+        with self._lock:
+            # the flight may already have been forgotten, and replaced by a later one
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+
+            return flight.waiters
+
+    def forget(self, match):
+        """Stop callers joining the flights whose keys match, so that reads made after a write are not answered by a
+        request sent before it.
+        """
+        with self._lock:
+            for key in [k for k in self._flights if match(k)]:
+                del self._flights[key]
+
+
+class AsyncSingleFlight:
+    """asyncio version of the SingleFlight, for coroutines sharing one event loop.
+
+    The request runs in its own task, so a waiter being cancelled does not cancel the request for the others.
+    """
+
+    def __init__(self):
+        self._flights = {}
+        self.coalesced = 0
+
+    async def do(self, key: tuple, load):
+        """Return the result of awaiting load(), or of the call already in flight for the key.
+        """
+        flight = self._flights.get(key)
+
+        if flight is None:
+            task = asyncio.ensure_future(load())
+            flight = self._flights[key] = _Flight(task)
+
+            def _land(done):
+                if self._flights.get(key) is flight:
+                    del self._flights[key]
+
+                # runs before any caller resumes, so the copy is taken before the first caller can change its result
+                if flight.waiters > 0 and not done.cancelled() and done.exception() is None:
+                    flight.shared = copy.deepcopy(done.result())
+
+            task.add_done_callback(_land)
+
+            return await asyncio.shield(task)
+
+        flight.waiters += 1
+        self.coalesced += 1
+        await asyncio.shield(flight.future)
+
+        # a caller joining after the request finished, but before the flight landed, resumes without yielding and so
+        # before the first caller has its result, and can copy the result itself
+        shared = flight.shared
+        return copy.deepcopy(flight.future.result() if shared is _UNSET else shared)
+
+    def forget(self, match):
+        """Stop callers joining the flights whose keys match, as for SingleFlight.forget().
+        """
+        for key in [k for k in self._flights if match(k)]:
+            del self._flights[key]
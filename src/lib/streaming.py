@@ -0,0 +1,231 @@
+import codecs
+import json
+import src.parameters as params
+from src.exceptions import DetailedException
+from src.lib.json_codec import JsonCodec
+
+DEFAULT_STREAM_CHUNK_SIZE = 65536
+ITEMS = "Items"
+_WHITESPACE = " \t\n\r"
+_DELIMITERS = ",]}:"
+_ITEM = object()
+_FIELD = object()
+_END = object()
+
+
+class _StreamBuffer:
+    """Decoded text of a response body, read from its byte chunks only as far as the parser needs.
+    """
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._json = json.JSONDecoder()
+        self._text = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self, unparsed: int = 0) -> bool:
+        """Read at least one more chunk, and keep reading until at least unparsed characters are waiting to be parsed.
+        Returns False if the body had already been read.
+        """
+        if self._eof:
+            return False
+
+        # drop the text that has already been parsed, so the buffer only ever holds about one Item
+        if self._pos > DEFAULT_STREAM_CHUNK_SIZE:
+            self._text = self._text[self._pos:]
+            self._pos = 0
+
+        parts = [self._text]
+        length = len(self._text) - self._pos
+        for chunk in self._chunks:
+            if len(chunk) > 0:
+                parts.append(self._decoder.decode(chunk))
+                length += len(parts[-1])
+                if length >= unparsed:
+                    break
+        else:
+            parts.append(self._decoder.decode(b"", final=True))
+            self._eof = True
+
+        self._text = "".join(parts)
+
+        return True
+
+    def _skip_whitespace(self) -> bool:
+        while True:
+            while self._pos < len(self._text) and self._text[self._pos] in _WHITESPACE:
+                self._pos += 1
+
+            if self._pos < len(self._text):
+                return True
+            elif not self._fill():
+                return False
+
+    def next_char(self) -> str:
+        if not self._skip_whitespace():
+            raise DetailedException("Unexpected end of streamed response")
+
+        c = self._text[self._pos]
+        self._pos += 1
+
+        return c
+
+    def peek(self) -> str:
+        if not self._skip_whitespace():
+            raise DetailedException("Unexpected end of streamed response")
+
+        return self._text[self._pos]
+
+    def value(self, codec: JsonCodec = None):
+        """Decode the next complete JSON value, with the stdlib unless a codec is given.
+        """
+        self._skip_whitespace()
+
+        while True:
+            try:
+                value, end = self._json.raw_decode(self._text, self._pos)
+            except json.JSONDecodeError:
+                # a value spanning many chunks would be decoded again from its start after every one of them, so wait
+                # until the unparsed text has doubled before trying again, which keeps the total work linear
+                if self._fill(2 * (len(self._text) - self._pos)):
+                    continue
+                raise
+
+            # a number cut off by the end of the buffer may continue in the next chunk ("2." decodes as 2), so only
+            # accept a value once the delimiter after it has arrived
+            after = end
+            while after < len(self._text) and self._text[after] in _WHITESPACE:
+                after += 1
+
+            if not self._eof and (after == len(self._text) or self._text[after] not in _DELIMITERS):
+                self._fill()
+                continue
+
+            if codec is not None:
+                # the stdlib has already found where the value ends, and the codec decodes just that text
+                value = codec.loads(self._text[self._pos:end])
+
+            self._pos = end
+            return value
+
+
+def _events(buffer: _StreamBuffer, codec: JsonCodec = None):
+    if buffer.next_char() != "{":
+        raise DetailedException("Streamed response is not a JSON object")
+
+    if buffer.peek() == "}":
+        return
+
+    while True:
+        key = buffer.value()
+        if buffer.next_char() != ":":
+            raise DetailedException("Malformed streamed response")
+
+        if key == ITEMS and buffer.peek() == "[":
+            buffer.next_char()
+
+            if buffer.peek() == "]":
+                buffer.next_char()
+            else:
+                while True:
+                    yield _ITEM, buffer.value()
+
+                    c = buffer.next_char()
+                    if c == "]":
+                        break
+                    elif c != ",":
+                        raise DetailedException("Malformed streamed response")
+        else:
+            yield _FIELD, key, buffer.value(codec)
+
+        c = buffer.next_char()
+        if c == "}":
+            return
+        elif c != ",":
+            raise DetailedException("Malformed streamed response")
+
+
+class StreamingPage:
+    """A list or find response page whose Items are decoded one at a time as the body arrives, rather than all at once.
+
+    Iterate the page once to get its Items. The other fields of the page, such as LastEvaluatedKey, are available from
+    get() and last_evaluated_key. A field that the API sends after the Items is only known once they have been read, so
+    asking for it first skips any Items not yet iterated. The response is closed once the body has been read, or when
+    close() is called.
+
+    Items are always decoded with the stdlib json module, which can resume part way through the body, whatever
+    json_codec the Client was given. The other fields are decoded with that codec.
+    """
+
+    def __init__(self, chunks, close=None, transform=None, codec: JsonCodec = None):
+        """
+        :param transform: optional callable applied to each Item as it is decoded
+        :param codec: optional JsonCodec used to decode the fields other than Items
+        """
+        self._events = _events(_StreamBuffer(chunks), codec)
+        self._close = close
+        self._transform = transform
+        self._pending = _END
+        self._done = False
+        self.fields = {}
+        self.item_count = 0
+
+    def _next_item(self):
+        # read up to the next Item, recording the fields on the way
+        if self._pending is not _END:
+            item = self._pending
+            self._pending = _END
+
+            return item
+
+        try:
+            for event in self._events:
+                if event[0] is _ITEM:
+                    self.item_count += 1
+                    return self._transform(event[1]) if self._transform is not None else event[1]
+                else:
+                    self.fields[event[1]] = event[2]
+        except BaseException:
+            self.close()
+            raise
+
+        self._done = True
+        self.close()
+
+        return _END
+
+    def __iter__(self):
+        while True:
+            item = self._next_item()
+            if item is _END:
+                return
+
+            yield item
+
+    def get(self, key: str, default=None):
+        if key not in self.fields and not self._done:
+            # fields sent ahead of the Items can be read without losing any
+            self._pending = self._next_item()
+
+            if key not in self.fields:
+                while self._next_item() is not _END:
+                    pass
+
+        return self.fields.get(key, default)
+
+    @property
+    def last_evaluated_key(self):
+        return self.get(params.LAST_EVALUATED_KEY)
+
+    def close(self):
+        if self._close is not None:
+            self._close()
+            self._close = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -0,0 +1,369 @@
+import io
+import json
+import threading
+import time
+import logging
+from abc import ABC, abstractmethod
+from http import HTTPStatus
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from urllib3.exceptions import ProtocolError
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+DEFAULT_POOL_SIZE = 10
+DEFAULT_POOL_IDLE_TIMEOUT = 60
+DEFAULT_CHUNK_SIZE = 65536
+# seconds the Http2Transport waits to connect, or for each read or write, before failing the request
+DEFAULT_HTTP2_TIMEOUT = 60
+
+# phases a transport may report in the timings of a request, in seconds
+CONNECT = "connect"
+TTFB = "ttfb"
+TRANSFER = "transfer"
+
+# seconds spent taking a connection from the pool and connecting it, by the request in progress on this thread
+_acquire = threading.local()
+
+
+class Transport(ABC):
+    """Sends already signed requests on behalf of the HttpHelper.
+
+    send() returns a response with status_code, reason, headers and content, a streamed body from
+    iter_content(chunk_size), and close(), as a requests Response does. Errors raised for requests that may not have
+    reached the server, and so can be retried, are listed in connection_errors.
+
+    When timings is given, the transport adds the seconds spent in the CONNECT, TTFB and TRANSFER phases that it can
+    measure to it.
+    """
+    connection_errors = ()
+
+    @abstractmethod
+    def send(self, method: str, url: str, headers: dict, body: bytes = None, stream: bool = False,
+             timings: dict = None):
+        pass
+
+    def close(self):
+        pass
+
+
+def _no_auth(r):
+    # requests are signed before they reach the transport. Passing an auth handler stops requests applying any .netrc
+    # credentials over the signature
+    return r
+
+
+def _add_acquire(start: float):
+    _acquire.seconds = getattr(_acquire, "seconds", 0.0) + time.perf_counter() - start
+
+
+class _TimedConnectionMixin:
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            _add_acquire(start)
+
+
+class _TimedPoolMixin:
+    def _get_conn(self, timeout=None):
+        start = time.perf_counter()
+        try:
+            return super()._get_conn(timeout=timeout)
+        finally:
+            _add_acquire(start)
+
+
+class _TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    pass
+
+
+class _TimedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+    pass
+
+
+class _TimedHTTPConnectionPool(_TimedPoolMixin, HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(_TimedPoolMixin, HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class _TimedAdapter(HTTPAdapter):
+    """Adapter whose pools time how long each request waits for a pooled connection, or to open a new one.
+    """
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {"http": _TimedHTTPConnectionPool,
+                                                   "https": _TimedHTTPSConnectionPool}
+
+
+class RequestsTransport(Transport):
+    """Transport over a pooled requests Session, which keeps up to pool_size HTTP/1.1 connections open to each host.
+    """
+    # the body of a response which is not streamed is read within send(), so a connection dropped part way through it
+    # is raised from here too
+    connection_errors = (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError,
+                         ProtocolError)
+
+    def __init__(self, pool_size: int = DEFAULT_POOL_SIZE, pool_idle_timeout: int = DEFAULT_POOL_IDLE_TIMEOUT,
+                 logger: logging.Logger = None):
+        self._pool_size = pool_size
+        self._pool_idle_timeout = pool_idle_timeout
+        self._logger = logger if logger is not None else logging.getLogger("HttpHandler")
+        self._session = None
+        self._session_last_used = None
+        self._session_lock = threading.Lock()
+        self._in_flight = 0
+
+    def _new_session(self):
+        session = requests.Session()
+        # urllib3 keeps one pool per host behind the adapter, each holding up to pool_size connections
+        adapter = _TimedAdapter(pool_maxsize=self._pool_size)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+
+        return session
+
+    def _get_session(self):
+        with self._session_lock:
+            now = time.monotonic()
+
+            # evict the pool if it has been idle for longer than the server or load balancer will keep it open. The
+            # Session is shared between threads, so it is only closed when none of them has a request in flight
+            if self._session is not None and self._pool_idle_timeout is not None and self._in_flight == 0 and \
+                    now - self._session_last_used > self._pool_idle_timeout:
+                self._logger.debug("Evicting idle connection pool")
+                self._session.close()
+                self._session = None
+
+            if self._session is None:
+                self._session = self._new_session()
+
+            self._session_last_used = now
+
+            return self._session
+
+    def _acquire_session(self):
+        with self._session_lock:
+            self._in_flight += 1
+
+        try:
+            return self._get_session()
+        except BaseException:
+            self._release_session()
+            raise
+
+    def _release_session(self):
+        with self._session_lock:
+            self._in_flight -= 1
+            self._session_last_used = time.monotonic()
+
+    def send(self, method: str, url: str, headers: dict, body: bytes = None, stream: bool = False,
+             timings: dict = None):
+        session = self._acquire_session()
+        try:
+            return self._send(session, method, url, headers, body, stream, timings)
+        finally:
+            self._release_session()
+
+    def _send(self, session, method: str, url: str, headers: dict, body: bytes, stream: bool, timings: dict):
+        if timings is None:
+            return session.request(method, url, data=body, headers=headers, auth=_no_auth, stream=stream)
+
+        # requests reads the body straight after the headers unless streaming, so stream and read it here instead to
+        # time the two apart
+        _acquire.seconds = 0.0
+        start = time.perf_counter()
+        response = session.request(method, url, data=body, headers=headers, auth=_no_auth, stream=True)
+        headers_read = time.perf_counter()
+
+        timings[CONNECT] = timings.get(CONNECT, 0.0) + _acquire.seconds
+        timings[TTFB] = timings.get(TTFB, 0.0) + headers_read - start - _acquire.seconds
+
+        if not stream:
+            response.content
+            timings[TRANSFER] = timings.get(TRANSFER, 0.0) + time.perf_counter() - headers_read
+
+        return response
+
+    def close(self):
+        with self._session_lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+
+class _HttpxResponse:
+    """Presents an httpx Response through the parts of the requests Response interface that the Client uses.
+    """
+
+    def __init__(self, response):
+        self._response = response
+        self.status_code = response.status_code
+        self.reason = response.reason_phrase
+        self.headers = response.headers
+
+    @property
+    def content(self):
+        return self._response.read()
+
+    @property
+    def text(self):
+        return self._response.read().decode("utf-8")
+
+    def json(self):
+        return json.loads(self._response.read())
+
+    def iter_content(self, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        return self._response.iter_bytes(chunk_size=chunk_size)
+
+    def close(self):
+        self._response.close()
+
+
+class Http2Transport(Transport):
+    """Transport over a pooled httpx Client with HTTP/2 enabled, so that concurrent requests to a host are multiplexed
+    over a few connections rather than needing one connection each. Falls back to HTTP/1.1 for servers without HTTP/2.
+
+    Requires httpx with HTTP/2 support: pip install 'httpx[http2]'
+    """
+
+    def __init__(self, pool_size: int = DEFAULT_POOL_SIZE, pool_idle_timeout: int = DEFAULT_POOL_IDLE_TIMEOUT,
+                 timeout: float = DEFAULT_HTTP2_TIMEOUT):
+        try:
+            import httpx
+        except ImportError:
+            raise ImportError("The HTTP/2 transport requires httpx. Install it with \"pip install 'httpx[http2]'\"")
+
+        self._httpx = httpx
+        self.connection_errors = (httpx.TransportError,)
+        self._limits = httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size,
+                                    keepalive_expiry=pool_idle_timeout)
+        self._timeout = timeout
+        self._client = None
+        self._lock = threading.Lock()
+
+    def _get_client(self):
+        with self._lock:
+            if self._client is None:
+                self._client = self._httpx.Client(http2=True, limits=self._limits, timeout=self._timeout)
+
+            return self._client
+
+    @staticmethod
+    def _trace(timings: dict):
+        # httpcore reports the steps of opening a connection as "connection.<step>.started" then ".complete" or
+        # ".failed"
+        started = {}
+
+        def trace(event_name: str, info: dict):
+            step, _, stage = event_name.rpartition(".")
+            if not step.startswith("connection."):
+                return
+
+            if stage == "started":
+                started[step] = time.perf_counter()
+            elif step in started:
+                timings[CONNECT] = timings.get(CONNECT, 0.0) + time.perf_counter() - started.pop(step)
+
+        return trace
+
+    def send(self, method: str, url: str, headers: dict, body: bytes = None, stream: bool = False,
+             timings: dict = None):
+        client = self._get_client()
+        request = client.build_request(method, url, headers=headers, content=body)
+        if timings is None:
+            return _HttpxResponse(client.send(request, stream=stream))
+
+        # read the body separately from the headers to time the two apart, as the RequestsTransport does
+        connect = timings.get(CONNECT, 0.0)
+        request.extensions["trace"] = self._trace(timings)
+        start = time.perf_counter()
+        response = client.send(request, stream=True)
+        headers_read = time.perf_counter()
+        timings[TTFB] = timings.get(TTFB, 0.0) + headers_read - start - (timings.get(CONNECT, 0.0) - connect)
+
+        if not stream:
+            response.read()
+            timings[TRANSFER] = timings.get(TRANSFER, 0.0) + time.perf_counter() - headers_read
+
+        return _HttpxResponse(response)
+
+    def close(self):
+        with self._lock:
+            if self._client is not None:
+                self._client.close()
+                self._client = None
+
+
+class BufferedResponse:
+    """A fully read HTTP response, exposing the parts of the requests Response interface that the Client uses.
+    """
+
+    def __init__(self, status_code: int, reason: str, headers, content: bytes):
+        self.status_code = status_code
+        self.reason = reason
+        self.headers = headers
+        self.content = content
+
+    @property
+    def text(self):
+        return self.content.decode("utf-8") if self.content is not None else None
+
+    def json(self):
+        return json.loads(self.content)
+
+    def iter_content(self, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        body = io.BytesIO(self.content if self.content is not None else b"")
+
+        return iter(lambda: body.read(chunk_size), b"")
+
+    def close(self):
+        pass
+
+    def __iter__(self):
+        # mirror requests, where iterating a response yields its body
+        yield self.content
+
+
+class InMemoryTransport(Transport):
+    """Transport which calls a Python handler in place of a server, with no sockets or serialisation of the HTTP
+    exchange, for tests and for load tests of the Client itself.
+
+    The handler is called as handler(method, url, headers, body) and returns (status_code, headers, body), where body
+    is bytes, a str, or any other value to be returned as JSON.
+    """
+
+    def __init__(self, handler):
+        self._handler = handler
+
+    def send(self, method: str, url: str, headers: dict, body: bytes = None, stream: bool = False,
+             timings: dict = None):
+        start = time.perf_counter()
+        status_code, response_headers, response_body = self._handler(method, url, dict(headers), body)
+        if timings is not None:
+            timings[TTFB] = timings.get(TTFB, 0.0) + time.perf_counter() - start
+
+        if response_body is None:
+            content = b""
+        elif isinstance(response_body, bytes):
+            content = response_body
+        elif isinstance(response_body, str):
+            content = response_body.encode("utf-8")
+        else:
+            content = json.dumps(response_body).encode("utf-8")
+
+        headers = CaseInsensitiveDict(response_headers if response_headers is not None else {})
+        headers.setdefault("Content-Length", str(len(content)))
+        try:
+            reason = HTTPStatus(status_code).phrase
+        except ValueError:
+            reason = ""
+
+        return BufferedResponse(status_code, reason, headers, content)
+
@@ -1,30 +1,58 @@
 import os
-import boto3
+import threading
+from datetime import datetime, timezone, timedelta
 from src.lib.credentials import Credentials
 
+# how long to reuse temporary credentials whose expiry botocore does not expose, before reading them from it again
+_UNKNOWN_EXPIRY_REUSE = timedelta(minutes=15)
 
-def get_credentials() -> Credentials:
-    _access_key = None
-    _secret_key = None
-    _session_token = None
-
-    # support boto3 based configuration of credentials
-    session = boto3.session.Session()
-    if session is not None:
-        credentials = session.get_credentials().get_frozen_credentials()
-        _access_key = credentials.access_key
-        _secret_key = credentials.secret_key
-        if session.get_credentials().token is not None:
-            _session_token = session.get_credentials().token
-    else:
-        # attempt to get creds from environment
-        _access_key = os.getenv("aws_access_key_id")
-        _secret_key = os.getenv("aws_secret_access_key")
-        _session_token = os.getenv("aws_session_token")
 
-    credentials = Credentials(access_key=_access_key, secret_key=_secret_key, session_token=_session_token)
+class BotoCredentialSource:
+    """Resolves credentials the same way as the AWS Python SDK, from one boto3 Session held for the life of the source.
+
+    Temporary credentials, such as those of an assumed role or an instance profile, are refreshed by botocore when they
+    are read, so the Session is not built again for each refresh.
+    """
+
+    def __init__(self):
+        self._credentials = None
+        self._lock = threading.Lock()
+
+    def _session_credentials(self):
+        with self._lock:
+            if self._credentials is None:
+                # boto3 is slow to import, so only load it when it is needed
+                import boto3
+
+                self._credentials = boto3.session.Session().get_credentials()
+
+            return self._credentials
+
+    def __call__(self) -> Credentials:
+        session_credentials = self._session_credentials()
 
-    return credentials
+        if session_credentials is None:
+            # attempt to get creds from environment
+            return Credentials(access_key=os.getenv("aws_access_key_id"), secret_key=os.getenv("aws_secret_access_key"),
+                               session_token=os.getenv("aws_session_token"))
+
+        credentials = session_credentials.get_frozen_credentials()
+
+        # botocore has no public accessor for the expiry of temporary credentials, and static credentials have none.
+        # If it is missing from refreshable credentials, read them again from botocore, which refreshes them as needed
+        expiry_time = getattr(session_credentials, "_expiry_time", None)
+        if expiry_time is None and callable(getattr(session_credentials, "refresh_needed", None)):
+            expiry_time = datetime.now(timezone.utc) + _UNKNOWN_EXPIRY_REUSE
+
+        return Credentials(access_key=credentials.access_key, secret_key=credentials.secret_key,
+                           session_token=credentials.token, expiry_time=expiry_time)
+
+
+_boto_credentials = BotoCredentialSource()
+
+
+def get_credentials() -> Credentials:
+    return _boto_credentials()
 
 
 def resolve_url_info(url: str) -> tuple:
@@ -0,0 +1,83 @@
+import sys
+import os
+import threading
+import unittest
+
+sys.path.append("..")
+parentdir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+os.sys.path.insert(0, parentdir)
+
+from src.exceptions import *
+from src.lib.async_http_handler import AsyncHttpHelper, BufferedResponse, aiohttp
+from src.lib.http_handler import HttpHelper
+from src.lib.credentials import CredentialProvider, Credentials
+from benchmark.stand_in_server import StandInServer
+
+
+@unittest.skipIf(aiohttp is None, "aiohttp not installed")
+class AsyncDataAPIClientTest(unittest.IsolatedAsyncioTestCase):
+    server = None
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = StandInServer().start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def _client(self):
+        from src.async_data_api_client import AsyncDataAPIClient
+
+        return AsyncDataAPIClient(stage="dev", region_name="us-east-1", access_key="AKIDEXAMPLE", secret_key="secret",
+                                  service_endpoint=self.server.endpoint, tls=False)
+
+    async def test_get_resource(self):
+        async with self._client() as client:
+            item = await client.get_resource(data_type="MyItem", item_id="1234")
+            self.assertTrue(item.get("Item").get("Resource").get("id").startswith("/dev/MyItem/1234"))
+
+    async def test_argument_validation(self):
+        async with self._client() as client:
+            with self.assertRaises(InvalidArgumentsException):
+                await client.find(data_type="MyItem", resource_attributes={}, metadata_attributes={})
+
+    async def test_credentials_resolved_off_the_event_loop(self):
+        resolved_on = []
+
+        def _resolve():
+            resolved_on.append(threading.current_thread())
+            return Credentials("AKIDEXAMPLE", "secret")
+
+        provider = CredentialProvider(resolve=_resolve)
+        helper = AsyncHttpHelper(host=f"http://{self.server.endpoint}", stage="dev", region="us-east-1",
+                                 access_key=None, secret_key=None, session_token=None, credential_provider=provider)
+        try:
+            self.assertEqual(200, (await helper.get("MyItem", "1234")).status_code)
+            self.assertEqual(200, (await helper.get("MyItem", "1234")).status_code)
+        finally:
+            await helper.close()
+
+        # resolved once, on an executor thread
+        self.assertEqual(1, len(resolved_on))
+        self.assertIsNot(threading.main_thread(), resolved_on[0])
+
+    def test_async_helper_has_no_sync_transport(self):
+        helper = AsyncHttpHelper(host="http://localhost:1", stage="dev", region="us-east-1", access_key="AKIDEXAMPLE",
+                                 secret_key="secret", session_token=None)
+
+        self.assertNotIsInstance(helper, HttpHelper)
+        self.assertIsNone(getattr(helper, "_transport", None))
+
+    def test_status_mapping(self):
+        handle = self._client()._handle_response
+        with self.assertRaises(ResourceNotFoundException):
+            handle(BufferedResponse(404, "Not Found", {}, b""))
+        with self.assertRaises(ConstraintViolationException):
+            handle(BufferedResponse(409, "Conflict", {}, b""))
+        self.assertIsNone(handle(BufferedResponse(204, "No Content", {}, b"")))
+        self.assertEqual(handle(BufferedResponse(200, "OK", {}, b'{"a": 1}')), {"a": 1})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import sys
+import os
+import unittest
+import threading
+import time
+from unittest import mock
+
+sys.path.append("..")
+parentdir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+os.sys.path.insert(0, parentdir)
+
+from src.exceptions import *
+from fakes import local_client
+
+
+def _get_resource(data_type, item_id, **kwargs):
+    if item_id.startswith("missing"):
+        raise ResourceNotFoundException()
+    return {"Item": {"Resource": {"id": item_id}}}
+
+
+class BatchGetTest(unittest.TestCase):
+    client = None
+
+    @classmethod
+    def setUpClass(cls):
+        cls.client = local_client()
+
+    def test_results_in_input_order(self):
+        ids = [str(i) for i in range(50)] + ["missing-1"]
+        with mock.patch.object(self.client, "get_resource", side_effect=_get_resource):
+            results = self.client.get_resources(data_type="MyItem", item_ids=ids, max_concurrency=8)
+
+        self.assertEqual([r.get("Item").get("Resource").get("id") for r in results[:-1]], ids[:-1])
+        self.assertIsInstance(results[-1], ResourceNotFoundException)
+
+    def test_concurrency_limited_to_pool_size(self):
+        client = local_client(pool_size=2)
+        lock = threading.Lock()
+        in_flight = [0, 0]
+
+        def _counting_get(data_type, item_id, **kwargs):
+            with lock:
+                in_flight[0] += 1
+                in_flight[1] = max(in_flight)
+            time.sleep(0.01)
+            with lock:
+                in_flight[0] -= 1
+            return _get_resource(data_type, item_id)
+
+        with mock.patch.object(client, "get_resource", side_effect=_counting_get):
+            client.get_resources(data_type="MyItem", item_ids=[str(i) for i in range(20)], max_concurrency=8)
+
+        self.assertEqual(2, in_flight[1])
+
+    def test_other_errors_raise(self):
+        with mock.patch.object(self.client, "get_resource", side_effect=DetailedException("boom")):
+            with self.assertRaises(DetailedException):
+                self.client.get_resources(data_type="MyItem", item_ids=["1", "2"])
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(InvalidArgumentsException):
+            self.client.get_resources(data_type="MyItem", item_ids=["1"], max_concurrency=0)
+
+        with self.assertRaises(InvalidArgumentsException):
+            self.client.get_resources(data_type="MyItem", item_ids=["1"], item_master_option="bad")
+
+
+if __name__ == '__main__':
+    unittest.main()
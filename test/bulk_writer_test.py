@@ -0,0 +1,131 @@
+import sys
+import os
+import threading
+import time
+import unittest
+
+sys.path.append("..")
+parentdir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+os.sys.path.insert(0, parentdir)
+
+from src.exceptions import *
+from src.lib.bulk_writer import BulkWriter
+
+
+class _Client:
+    def __init__(self, delay: float = 0):
+        self.delay = delay
+        self.written = []
+        self.lock = threading.Lock()
+
+    def put_resource(self, data_type, item_id, resource, item_version=None, strict_schema=False):
+        time.sleep(self.delay)
+        if item_version == -1:
+            raise ConstraintViolationException()
+        with self.lock:
+            self.written.append(item_id)
+        return resource
+
+    def put_metadata(self, data_type, item_id, meta, strict_schema=False):
+        return self.put_resource(data_type, item_id, meta)
+
+
+class BulkWriterTest(unittest.TestCase):
+    def test_writes_from_many_producers(self):
+        client = _Client()
+
+        with BulkWriter(client, concurrency=4, queue_size=10) as writer:
+            def _produce(p):
+                for i in range(25):
+                    writer.put_resource("MyItem", f"{p}-{i}", {"attr1": i})
+
+            producers = [threading.Thread(target=_produce, args=(p,)) for p in range(4)]
+            for t in producers:
+                t.start()
+            for t in producers:
+                t.join()
+
+        self.assertEqual(len(client.written), 100)
+        self.assertEqual(writer.report.succeeded, 100)
+        self.assertTrue(writer.report.ok)
+
+    def test_failures_are_reported(self):
+        with BulkWriter(_Client(), concurrency=2) as writer:
+            writer.put_resource("MyItem", "1", {}, item_version=-1)
+            writer.put_metadata("MyItem", "2", {})
+
+        report = writer.report
+        self.assertEqual((report.succeeded, report.failed), (1, 1))
+        self.assertEqual(report.failures[0].item_id, "1")
+        self.assertTrue(report.failures[0].is_version_conflict)
+
+    def test_backpressure(self):
+        writer = BulkWriter(_Client(delay=0.05), concurrency=1, queue_size=1)
+        start = time.perf_counter()
+        for i in range(4):
+            writer.put_resource("MyItem", str(i), {})
+
+        # the producer had to wait for the single worker to drain the queue
+        self.assertGreater(time.perf_counter() - start, 0.05)
+        self.assertEqual(writer.close().succeeded, 4)
+
+    def test_closed_writer_rejects_writes(self):
+        writer = BulkWriter(_Client())
+        writer.close()
+        with self.assertRaises(RuntimeError):
+            writer.put_resource("MyItem", "1", {})
+
+    def test_writes_racing_close_are_written_or_rejected(self):
+        client = _Client()
+        writer = BulkWriter(client, concurrency=2, queue_size=1)
+        accepted = []
+
+        def _produce(n):
+            for i in range(200):
+                try:
+                    writer.put_resource("MyItem", f"{n}-{i}", {})
+                except RuntimeError:
+                    return
+                accepted.append(f"{n}-{i}")
+
+        producers = [threading.Thread(target=_produce, args=(n,)) for n in range(4)]
+        for p in producers:
+            p.start()
+        time.sleep(0.01)
+        report = writer.close()
+        for p in producers:
+            p.join()
+
+        self.assertEqual(sorted(accepted), sorted(client.written))
+        self.assertEqual(len(accepted), report.succeeded)
+
+    def test_producers_wait_on_a_full_queue_together(self):
+        release = threading.Event()
+        client = _Client()
+        client.put_metadata = lambda data_type, item_id, meta, strict_schema=False: release.wait()
+        writer = BulkWriter(client, concurrency=1, queue_size=1)
+
+        # the worker is held by the first write and the second fills the queue
+        writer.put_metadata("MyItem", "0", {})
+        writer.put_resource("MyItem", "1", {})
+        producers = [threading.Thread(target=writer.put_resource, args=("MyItem", str(i), {})) for i in range(2, 6)]
+        for p in producers:
+            p.start()
+
+        deadline = time.monotonic() + 5
+        while len(writer._queue.not_full._waiters) < len(producers) and time.monotonic() < deadline:
+            time.sleep(0.001)
+        waiting = len(writer._queue.not_full._waiters)
+
+        release.set()
+        report = writer.close()
+        self.assertEqual(len(producers), waiting)
+        for p in producers:
+            p.join()
+
+        self.assertEqual(6, report.succeeded)
+        self.assertEqual(["1", "2", "3", "4", "5"], sorted(client.written))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import sys
+import os
+import json
+import inspect
+import unittest
+
+sys.path.append("..")
+parentdir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+os.sys.path.insert(0, parentdir)
+
+from src.data_api_client import DataAPIClient
+from benchmark.stand_in_server import StandInServer
+from benchmark import client_benchmark
+
+
+class ClientBenchmarkTest(unittest.TestCase):
+    server = None
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = StandInServer(page_items=5, pages=3, item_size=256).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def test_every_public_method_is_benchmarked(self):
+        public = {name for name, _ in inspect.getmembers(DataAPIClient, inspect.isfunction)
+                  if not name.startswith("_")}
+        covered = set(client_benchmark.request_cases({}).keys()) | \
+            set(client_benchmark.batch_cases({}, 1).keys()) | client_benchmark.NOT_BENCHMARKED
+
+        self.assertEqual(set(), public - covered)
+
+    def test_suite_runs_without_errors(self):
+        results = client_benchmark.run_suite(self.server.endpoint, requests=2, threads=2, item_size=256,
+                                             batch_size=3, batch_requests=1)
+
+        self.assertEqual([], [(r.get("method"), r.get("mode")) for r in results if r.get("errors") > 0])
+        self.assertEqual({client_benchmark.SYNC, client_benchmark.PARALLEL, client_benchmark.BATCH},
+                         {r.get("mode") for r in results})
+
+        scan = [r for r in results if r.get("method") == "iter_items"][0]
+        self.assertEqual(15, scan.get("items"))
+
+        # machine readable output round trips
+        document = json.loads(client_benchmark.to_json(results, {}))
+        self.assertEqual(len(results), len(document.get("results")))
+        self.assertEqual(len(results) + 1, len(client_benchmark.to_csv(results).strip().splitlines()))
+
+    def test_percentile(self):
+        ordered = list(range(1, 101))
+
+        self.assertEqual(50, client_benchmark.percentile(ordered, 50))
+        self.assertEqual(95, client_benchmark.percentile(ordered, 95))
+        self.assertEqual(99, client_benchmark.percentile(ordered, 99))
+        self.assertEqual(7, client_benchmark.percentile([7], 99))
+
+    def test_regressions(self):
+        baseline = [{"method": "get_resource", "mode": "sync", "p50_ms": 2.0, "throughput": 500.0}]
+
+        self.assertEqual([], client_benchmark.regressions(
+            [{"method": "get_resource", "mode": "sync", "p50_ms": 2.1, "throughput": 480.0}], baseline, 0.2))
+        self.assertEqual(["p50_ms", "throughput"], [metric for _, metric, _ in client_benchmark.regressions(
+            [{"method": "get_resource", "mode": "sync", "p50_ms": 3.0, "throughput": 300.0}], baseline, 0.2)])
+
+    def test_routes(self):
+        self.assertEqual(200, self.server.route("GET", "/data-apis", {}, None)[1])
+        self.assertEqual("list", self.server.route("GET", "/dev/Bench/list", {}, None)[0])
+        self.assertEqual("schema", self.server.route("PUT", "/dev/Bench/schema/Resource", {}, {})[0])
+        self.assertEqual("upstream", self.server.route("GET", "/dev/Bench/1/upstream", {}, None)[0])
+        self.assertEqual(404, self.server.route("GET", "/test/Bench/1", {}, None)[1])
+
+
+if __name__ == '__main__':
+    unittest.main()
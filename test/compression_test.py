@@ -0,0 +1,108 @@
+import sys
+import os
+import io
+import gzip
+import json
+import hashlib
+import unittest
+from unittest import mock
+import requests
+import urllib3
+
+sys.path.append("..")
+parentdir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+os.sys.path.insert(0, parentdir)
+
+from src.exceptions import *
+from src.lib.compression import RequestCompressor, GZIP, DEFLATE, decompress
+from src.lib.http_handler import HttpHelper
+import src.lib.request_args as request_args
+
+_body = {"Resource": {f"attribute_{i}": f"value {i}" for i in range(500)}}
+
+
+def _helper(compressor=None):
+    helper = HttpHelper(host="https://example.com", stage="dev", region="us-east-1", access_key="AKIDEXAMPLE",
+                        secret_key="secret", session_token=None, compressor=compressor)
+    session = mock.Mock()
+    response = requests.Response()
+    response.status_code = 200
+    session.request.return_value = response
+    helper._transport._get_session = mock.Mock(return_value=session)
+
+    return helper, session
+
+
+def _prepared(session):
+    # apply the signer as requests would when sending
+    args, kwargs = session.request.call_args
+    return requests.Request(args[0], args[1], data=kwargs.get("data"), headers=kwargs.get("headers"),
+                            auth=kwargs.get("auth")).prepare()
+
+
+class RequestCompressorTest(unittest.TestCase):
+    def test_round_trip(self):
+        raw = json.dumps(_body).encode("utf-8")
+
+        for encoding in [GZIP, DEFLATE]:
+            compressed, content_encoding = RequestCompressor(encoding).compress(raw)
+            self.assertEqual(encoding, content_encoding)
+            self.assertLess(len(compressed), len(raw))
+            self.assertEqual(raw, decompress(compressed, encoding))
+
+    def test_below_threshold(self):
+        raw = b'{"Resource": {}}'
+        self.assertEqual((raw, None), RequestCompressor(threshold=1024).compress(raw))
+
+    def test_incompressible(self):
+        raw = os.urandom(4096)
+        self.assertEqual((raw, None), RequestCompressor(threshold=0).compress(raw))
+
+    def test_invalid(self):
+        with self.assertRaises(InvalidArgumentsException):
+            RequestCompressor("br")
+        with self.assertRaises(InvalidArgumentsException):
+            RequestCompressor(threshold=-1)
+
+
+class CompressedRequestTest(unittest.TestCase):
+    def test_compressed_body_is_signed(self):
+        helper, session = _helper(RequestCompressor(GZIP, threshold=1024))
+        helper.put("Customer", "1", put_body=_body)
+        request = _prepared(session)
+
+        self.assertEqual("gzip", request.headers.get("Content-Encoding"))
+        self.assertEqual(_body, json.loads(gzip.decompress(request.body)))
+        # the payload hash covers the bytes on the wire, and the encoding is a signed header
+        self.assertEqual(hashlib.sha256(request.body).hexdigest(), request.headers.get("x-amz-content-sha256"))
+        self.assertIn("content-encoding", request.headers.get("Authorization"))
+
+    def test_small_body_uncompressed(self):
+        helper, session = _helper(RequestCompressor(GZIP, threshold=1024))
+        helper.post("Customer", "find", post_body={"Resource": {"name": "x"}})
+        request = _prepared(session)
+
+        self.assertIsNone(request.headers.get("Content-Encoding"))
+        self.assertEqual({"Resource": {"name": "x"}}, json.loads(request.body))
+
+    def test_accept_encoding(self):
+        helper, session = _helper()
+        helper.get("Customer", "1")
+
+        self.assertEqual("gzip, deflate", session.request.call_args.kwargs.get("headers").get("accept-encoding"))
+
+    def test_streamed_response_decoded(self):
+        page = {"Items": [{"id": i} for i in range(1000)], "LastEvaluatedKey": {"id": 999}}
+        raw = urllib3.HTTPResponse(body=io.BytesIO(gzip.compress(json.dumps(page).encode("utf-8"))),
+                                   headers={"Content-Encoding": "gzip"}, status=200, preload_content=False)
+        response = requests.Response()
+        response.status_code = 200
+        response.raw = raw
+
+        streamed = request_args.handle_streaming_response(response)
+        self.assertEqual(page.get("Items"), list(streamed))
+        self.assertEqual({"id": 999}, streamed.last_evaluated_key)
+
+
+if __name__ == '__main__':
+    unittest.main()
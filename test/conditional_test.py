@@ -0,0 +1,111 @@
+import sys
+import os
+import unittest
+from unittest import mock
+
+sys.path.append("..")
+parentdir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+os.sys.path.insert(0, parentdir)
+
+from src.lib.conditional import ValidatorCache, extract_validators
+from fakes import fake_response, local_client
+
+_ITEM = b'{"Item": {"Resource": {"id": "1", "ItemVersion": 3, "LastUpdateDate": "2020-11-20 10:15:30"}, ' \
+        b'"Metadata": {"ItemVersion": 2, "LastUpdateDate": "2020-11-21 08:00:00"}}}'
+
+
+class ConditionalGetTest(unittest.TestCase):
+    def _client(self, responses):
+        client = local_client(validator_cache=ValidatorCache(derive_validators=True))
+        client._http_handler = mock.Mock()
+        client._http_handler.get.side_effect = responses
+        client._http_handler.put.side_effect = lambda **kwargs: fake_response(200, b'{"Resource": {}}')
+        return client
+
+    def test_validators_from_item(self):
+        r = fake_response(200, _ITEM)
+        validators = extract_validators(r, r.json(), derive=True)
+
+        self.assertEqual('"3-2"', validators.get("If-None-Match"))
+        self.assertEqual("Sat, 21 Nov 2020 08:00:00 GMT", validators.get("If-Modified-Since"))
+
+    def test_validators_from_headers(self):
+        r = fake_response(200, _ITEM, {"ETag": '"abc"', "Last-Modified": "Fri, 20 Nov 2020 10:15:30 GMT"})
+        validators = extract_validators(r, r.json())
+
+        self.assertEqual({"If-None-Match": '"abc"', "If-Modified-Since": "Fri, 20 Nov 2020 10:15:30 GMT"},
+                         validators)
+
+    def test_no_validators(self):
+        r = fake_response(200, b'{"a": 1}')
+
+        self.assertEqual({}, extract_validators(r, r.json(), derive=True))
+
+    def test_validators_not_derived_by_default(self):
+        r = fake_response(200, _ITEM)
+
+        self.assertEqual({}, extract_validators(r, r.json()))
+
+        client = local_client(validator_cache=ValidatorCache())
+        client._http_handler = mock.Mock()
+        client._http_handler.get.side_effect = [fake_response(200, _ITEM), fake_response(200, _ITEM)]
+        client.get_resource("Customer", "1")
+        client.get_resource("Customer", "1")
+
+        self.assertIsNone(client._http_handler.get.call_args_list[1].kwargs.get("headers"))
+
+    def test_invalidate_drops_only_the_item(self):
+        cache = ValidatorCache(max_size=3)
+        for key in [("dev", "T", "1", "resource", ()), ("dev", "T", "1", "metadata", ()),
+                    ("dev", "T", "2", "resource", ()), ("dev", "T", "3", "resource", ())]:
+            cache.put(key, {"If-None-Match": '"1"'}, {})
+
+        cache.invalidate("dev", "T", "1")
+        cache.invalidate("dev", "T", "2")
+
+        self.assertEqual(1, len(cache))
+        self.assertIsNotNone(cache.get(("dev", "T", "3", "resource", ())))
+        self.assertEqual({("dev", "T", "3"): {("dev", "T", "3", "resource", ())}}, cache._by_item)
+
+    def test_not_modified_serves_held_body(self):
+        client = self._client([fake_response(200, _ITEM), fake_response(304)])
+
+        first = client.get_resource("Customer", "1")
+        first["Item"]["Resource"]["id"] = "changed"
+        second = client.get_resource("Customer", "1")
+
+        self.assertEqual("1", second.get("Item").get("Resource").get("id"))
+        self.assertIsNone(client._http_handler.get.call_args_list[0].kwargs.get("headers"))
+        self.assertEqual('"3-2"', client._http_handler.get.call_args_list[1].kwargs.get("headers").get("If-None-Match"))
+
+    def test_modified_replaces_held_body(self):
+        updated = _ITEM.replace(b'"ItemVersion": 3', b'"ItemVersion": 4')
+        client = self._client([fake_response(200, _ITEM), fake_response(200, updated), fake_response(304)])
+
+        client.get_resource("Customer", "1")
+        client.get_resource("Customer", "1")
+        third = client.get_resource("Customer", "1")
+
+        self.assertEqual(4, third.get("Item").get("Resource").get("ItemVersion"))
+        self.assertEqual('"4-2"', client._http_handler.get.call_args_list[2].kwargs.get("headers").get("If-None-Match"))
+
+    def test_write_drops_validators(self):
+        client = self._client([fake_response(200, _ITEM), fake_response(200, _ITEM)])
+
+        client.get_resource("Customer", "1")
+        client.put_resource("Customer", "1", {"id": "1"})
+        client.get_resource("Customer", "1")
+
+        self.assertIsNone(client._http_handler.get.call_args_list[1].kwargs.get("headers"))
+
+    def test_projections_held_separately(self):
+        client = self._client([fake_response(200, _ITEM), fake_response(200, _ITEM)])
+
+        client.get_resource("Customer", "1")
+        client.get_resource("Customer", "1", only_attributes=["id"])
+
+        self.assertIsNone(client._http_handler.get.call_args_list[1].kwargs.get("headers"))
+
+
+if __name__ == '__main__':
+    unittest.main()
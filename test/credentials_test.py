@@ -0,0 +1,149 @@
+import sys
+import os
+import unittest
+from unittest import mock
+import threading
+from datetime import datetime, timezone, timedelta
+
+sys.path.append("..")
+parentdir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+os.sys.path.insert(0, parentdir)
+
+from src.lib.credentials import Credentials, CredentialProvider, get_credential_provider
+from src.lib.signing import SigV4Signer
+from src.lib.utils import BotoCredentialSource
+
+
+def _expiring(key: str, seconds: float):
+    return Credentials(key, "secret", "token", expiry_time=datetime.now(timezone.utc) + timedelta(seconds=seconds))
+
+
+class CredentialProviderTest(unittest.TestCase):
+    def test_shared_provider(self):
+        self.assertIs(get_credential_provider(), get_credential_provider())
+
+    def test_static_credentials_resolved_once(self):
+        resolve = mock.Mock(return_value=Credentials("AKID1", "secret"))
+        provider = CredentialProvider(resolve=resolve)
+
+        for _ in range(5):
+            self.assertEqual("AKID1", provider.get().access_key)
+
+        resolve.assert_called_once()
+
+    def test_refresh_in_background_before_expiry(self):
+        released = threading.Event()
+        refreshed = threading.Event()
+        calls = []
+
+        def _resolve():
+            calls.append(1)
+            if len(calls) == 1:
+                return _expiring("AKID1", 60)
+
+            # the refresh is slow, but callers are not held up by it
+            released.wait(5)
+            refreshed.set()
+            return _expiring("AKID2", 3600)
+
+        provider = CredentialProvider(resolve=_resolve, refresh_margin=300, min_refresh_interval=0)
+
+        self.assertEqual("AKID1", provider.get().access_key)
+        # inside the margin the current credentials are returned while one refresh runs
+        self.assertEqual("AKID1", provider.get().access_key)
+        self.assertEqual("AKID1", provider.get().access_key)
+
+        released.set()
+        self.assertTrue(refreshed.wait(5))
+        for _ in range(100):
+            if provider.get().access_key == "AKID2":
+                break
+            threading.Event().wait(0.01)
+
+        self.assertEqual("AKID2", provider.get().access_key)
+        self.assertEqual(2, len(calls))
+
+    def test_refreshes_are_spaced(self):
+        resolve = mock.Mock(side_effect=lambda: _expiring("AKID1", 60))
+        provider = CredentialProvider(resolve=resolve, refresh_margin=300, min_refresh_interval=60)
+
+        # every resolve returns credentials inside the margin, which must not start a refresh for every request
+        for _ in range(5):
+            self.assertEqual("AKID1", provider.get().access_key)
+        resolve.assert_called_once()
+
+        provider._last_resolved -= 60
+        provider.get()
+        for _ in range(100):
+            if not provider._refreshing:
+                break
+            threading.Event().wait(0.01)
+        provider.get()
+
+        self.assertEqual(2, resolve.call_count)
+
+    def test_boto_source_keeps_session_credentials(self):
+        expiry = datetime.now(timezone.utc) + timedelta(hours=1)
+        session_credentials = mock.Mock(_expiry_time=expiry)
+        session_credentials.get_frozen_credentials.side_effect = [mock.Mock(access_key="AKID1", secret_key="s",
+                                                                            token="t1"),
+                                                                  mock.Mock(access_key="AKID2", secret_key="s",
+                                                                            token="t2")]
+
+        with mock.patch("boto3.session.Session") as session:
+            session.return_value.get_credentials.return_value = session_credentials
+            source = BotoCredentialSource()
+            first = source()
+            second = source()
+
+        session.assert_called_once()
+        self.assertEqual(("AKID1", "t1", expiry), (first.access_key, first.session_token, first.expiry_time))
+        self.assertEqual("AKID2", second.access_key)
+
+    def test_boto_source_without_expiry(self):
+        session_credentials = mock.Mock(spec=["get_frozen_credentials", "refresh_needed"])
+        session_credentials.get_frozen_credentials.return_value = mock.Mock(access_key="AKID1", secret_key="s",
+                                                                            token="t1")
+
+        with mock.patch("boto3.session.Session") as session:
+            session.return_value.get_credentials.return_value = session_credentials
+            credentials = BotoCredentialSource()()
+
+        # refreshable credentials are read from botocore again, rather than being kept as if they were static
+        self.assertIsNotNone(credentials.expiry_time)
+        self.assertGreater(credentials.expiry_time, datetime.now(timezone.utc))
+
+    def test_expired_credentials_block(self):
+        resolve = mock.Mock(side_effect=[_expiring("AKID1", -1), _expiring("AKID2", 3600)])
+        provider = CredentialProvider(resolve=resolve)
+
+        self.assertEqual("AKID1", provider.get().access_key)
+        # the next caller sees expired credentials, and waits for new ones
+        self.assertEqual("AKID2", provider.get().access_key)
+        self.assertEqual(2, resolve.call_count)
+
+    def test_failed_refresh_keeps_credentials(self):
+        resolve = mock.Mock(side_effect=[_expiring("AKID1", 60), Exception("sts unavailable"),
+                                         _expiring("AKID2", 3600)])
+        provider = CredentialProvider(resolve=resolve, refresh_margin=300)
+
+        provider.get()
+        provider.get()
+        for _ in range(100):
+            if not provider._refreshing:
+                break
+            threading.Event().wait(0.01)
+
+        self.assertEqual("AKID1", provider.get().access_key)
+
+    def test_signer_uses_provider(self):
+        provider = CredentialProvider(resolve=mock.Mock(return_value=Credentials("AKID1", "secret", "token")))
+        signer = SigV4Signer(None, None, "us-east-1", "execute-api", credential_provider=provider)
+        headers = signer.sign("GET", "https://example.com/dev/Customer/1", {})
+
+        self.assertIn("Credential=AKID1/", headers.get("Authorization"))
+        self.assertEqual("token", headers.get("x-amz-security-token"))
+
+
+if __name__ == '__main__':
+    unittest.main()
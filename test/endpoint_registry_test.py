@@ -0,0 +1,226 @@
+import sys
+import os
+import unittest
+import json
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from unittest import mock
+
+sys.path.append("..")
+parentdir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+os.sys.path.insert(0, parentdir)
+
+from src.lib.endpoint_registry import EndpointRegistry, get_endpoint_registry, default_endpoint_cache, \
+    ENDPOINT_CACHE_ENV, REFRESH_DATE, REFRESH_DATE_FORMAT
+from src.lib.data_api_control_plane import DataApiControlPlane
+from src.data_api_client import DataAPIClient
+
+_ENDPOINTS = {
+    "dev": {"Endpoint": "https://abc.execute-api.eu-west-1.amazonaws.com", "Stage": "dev"},
+    "prod": {"URL": "https://data.example.com", "Stage": "prod"}
+}
+
+
+class EndpointRegistryTest(unittest.TestCase):
+    def setUp(self):
+        self._dir = tempfile.TemporaryDirectory()
+        self._path = os.path.join(self._dir.name, "cache", "endpoints.json")
+
+    def tearDown(self):
+        self._dir.cleanup()
+
+    def test_missing_file_is_empty(self):
+        registry = EndpointRegistry(self._path)
+
+        self.assertEqual({}, registry.get())
+        self.assertFalse(registry.is_loaded())
+
+    def test_save_is_atomic_and_loaded_once(self):
+        registry = EndpointRegistry(self._path)
+        registry.save(_ENDPOINTS)
+
+        with open(self._path) as f:
+            saved = json.load(f)
+        self.assertEqual(_ENDPOINTS.get("dev"), saved.get("dev"))
+        self.assertIn(REFRESH_DATE, saved)
+        # only the cache and its lock file are left behind
+        self.assertEqual(["endpoints.json", "endpoints.json.lock"], sorted(os.listdir(os.path.dirname(self._path))))
+
+        reader = EndpointRegistry(self._path)
+        first = reader.get()
+        with mock.patch("builtins.open", side_effect=AssertionError("read twice")):
+            self.assertIs(first, reader.get())
+
+    def test_concurrent_saves(self):
+        registry = EndpointRegistry(self._path)
+        errors = []
+
+        def _save(i):
+            try:
+                registry.save({"dev": {"Endpoint": f"https://{i}.example.com"}})
+                EndpointRegistry(self._path).get()
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=_save, args=(i,)) for i in range(16)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual([], errors)
+        with open(self._path) as f:
+            self.assertIn("dev", json.load(f))
+
+    def test_background_refresh(self):
+        registry = EndpointRegistry(self._path)
+        refreshed = threading.Event()
+
+        def _fetch():
+            refreshed.set()
+            return _ENDPOINTS
+
+        registry.start_refresh(_fetch, refresh_interval=0.01)
+        try:
+            self.assertTrue(refreshed.wait(5))
+        finally:
+            registry.stop_refresh()
+
+        time.sleep(0.05)
+        self.assertEqual("dev", registry.get().get("dev").get("Stage"))
+
+    def _save_aged(self, seconds: float):
+        endpoints = dict(_ENDPOINTS)
+        endpoints[REFRESH_DATE] = (datetime.now() - timedelta(seconds=seconds)).strftime(REFRESH_DATE_FORMAT)
+        os.makedirs(os.path.dirname(self._path), exist_ok=True)
+        with open(self._path, 'w') as f:
+            json.dump(endpoints, f)
+
+    def test_age_and_staleness(self):
+        self._save_aged(120)
+        registry = EndpointRegistry(self._path)
+
+        self.assertAlmostEqual(120, registry.age(), delta=5)
+        self.assertTrue(registry.is_stale(60))
+        self.assertFalse(registry.is_stale(3600))
+        self.assertFalse(registry.is_stale(None))
+
+        # endpoints without a RefreshDate are of unknown age
+        with open(self._path, 'w') as f:
+            json.dump(_ENDPOINTS, f)
+        registry.reload()
+        self.assertIsNone(registry.age())
+        self.assertTrue(registry.is_stale(3600))
+
+    def test_seeded_until_saved(self):
+        seed = os.path.join(self._dir.name, "seed.json")
+        with open(seed, 'w') as f:
+            json.dump({"old": {"Endpoint": "https://old.example.com"}}, f)
+
+        registry = EndpointRegistry(self._path, seed_path=seed)
+        self.assertIn("old", registry.get())
+
+        registry.save(_ENDPOINTS)
+        self.assertNotIn("old", EndpointRegistry(self._path, seed_path=seed).get())
+
+    def test_seed_without_refresh_date_is_fresh(self):
+        seed = os.path.join(self._dir.name, "seed.json")
+        with open(seed, 'w') as f:
+            json.dump(_ENDPOINTS, f)
+
+        control_plane = DataApiControlPlane(region_name="eu-west-1", endpoint_cache=self._path)
+        control_plane._registry = EndpointRegistry(self._path, seed_path=seed)
+        self.assertFalse(control_plane._registry.is_stale(3600))
+
+        with mock.patch("src.lib.data_api_control_plane.HttpHelper") as helper:
+            control_plane.connect(from_url="https://abc.execute-api.eu-west-1.amazonaws.com/dev",
+                                  access_key="AKIDEXAMPLE", secret_key="secret")
+            self.assertEqual(0, helper.return_value.get.call_count)
+
+        self.assertEqual("https://abc.execute-api.eu-west-1.amazonaws.com", control_plane.get_endpoint("dev"))
+
+    def test_default_location_is_user_writable(self):
+        with mock.patch.dict(os.environ, {"XDG_CACHE_HOME": self._dir.name}):
+            os.environ.pop(ENDPOINT_CACHE_ENV, None)
+            self.assertEqual(os.path.join(self._dir.name, "aws-data-api", "endpoints.json"), default_endpoint_cache())
+
+        with mock.patch.dict(os.environ, {ENDPOINT_CACHE_ENV: self._path}):
+            self.assertEqual(self._path, default_endpoint_cache())
+
+    def test_shared_per_path_and_configurable(self):
+        self.assertIs(get_endpoint_registry(self._path), get_endpoint_registry(self._path))
+
+        with mock.patch.dict(os.environ, {ENDPOINT_CACHE_ENV: self._path}):
+            self.assertIs(get_endpoint_registry(self._path), get_endpoint_registry())
+
+    def test_control_plane_uses_registry(self):
+        get_endpoint_registry(self._path).save(_ENDPOINTS)
+        control_plane = DataApiControlPlane(region_name="eu-west-1", endpoint_cache=self._path)
+
+        self.assertEqual("https://abc.execute-api.eu-west-1.amazonaws.com", control_plane.get_endpoint("dev"))
+        self.assertFalse(control_plane.is_custom_domain("dev"))
+        self.assertEqual("https://data.example.com", control_plane.get_endpoint("prod"))
+        self.assertTrue(control_plane.is_custom_domain("prod"))
+
+    def test_connect_fetches_once(self):
+        control_plane = DataApiControlPlane(region_name="eu-west-1", endpoint_cache=self._path)
+
+        with mock.patch("src.lib.data_api_control_plane.HttpHelper") as helper:
+            helper.return_value.get.return_value.json.return_value = dict(_ENDPOINTS)
+            control_plane.connect(from_url="https://abc.execute-api.eu-west-1.amazonaws.com/dev",
+                                  access_key="AKIDEXAMPLE", secret_key="secret")
+            control_plane.connect(from_url="https://abc.execute-api.eu-west-1.amazonaws.com/dev",
+                                  access_key="AKIDEXAMPLE", secret_key="secret")
+
+            self.assertEqual(1, helper.return_value.get.call_count)
+
+            control_plane.connect(from_url="https://abc.execute-api.eu-west-1.amazonaws.com/dev",
+                                  access_key="AKIDEXAMPLE", secret_key="secret", force_refresh=True)
+            self.assertEqual(2, helper.return_value.get.call_count)
+
+        self.assertEqual("https://abc.execute-api.eu-west-1.amazonaws.com", control_plane.get_endpoint("dev"))
+
+    def test_connect_refreshes_stale_endpoints(self):
+        self._save_aged(7200)
+        control_plane = DataApiControlPlane(region_name="eu-west-1", endpoint_cache=self._path)
+
+        with mock.patch("src.lib.data_api_control_plane.HttpHelper") as helper:
+            helper.return_value.get.return_value.json.return_value = dict(_ENDPOINTS)
+
+            control_plane.connect(from_url="https://abc.execute-api.eu-west-1.amazonaws.com/dev",
+                                  access_key="AKIDEXAMPLE", secret_key="secret", refresh_interval=None)
+            self.assertEqual(0, helper.return_value.get.call_count)
+
+            control_plane.connect(from_url="https://abc.execute-api.eu-west-1.amazonaws.com/dev",
+                                  access_key="AKIDEXAMPLE", secret_key="secret", refresh_interval=3600)
+            self.assertEqual(1, helper.return_value.get.call_count)
+            self.assertLess(get_endpoint_registry(self._path).age(), 60)
+
+    def test_connect_keeps_stale_endpoints_when_refetch_fails(self):
+        self._save_aged(7200)
+        control_plane = DataApiControlPlane(region_name="eu-west-1", endpoint_cache=self._path)
+
+        with mock.patch("src.lib.data_api_control_plane.HttpHelper") as helper:
+            helper.return_value.get.side_effect = ConnectionError("unreachable")
+
+            with self.assertLogs("DataApiControlPlane", level="WARNING"):
+                control_plane.connect(from_url="https://abc.execute-api.eu-west-1.amazonaws.com/dev",
+                                      access_key="AKIDEXAMPLE", secret_key="secret", refresh_interval=3600)
+            self.assertEqual("https://abc.execute-api.eu-west-1.amazonaws.com", control_plane.get_endpoint("dev"))
+
+            with self.assertRaises(ConnectionError):
+                control_plane.connect(from_url="https://abc.execute-api.eu-west-1.amazonaws.com/dev",
+                                      access_key="AKIDEXAMPLE", secret_key="secret", force_refresh=True)
+
+    def test_client_endpoint_cache(self):
+        get_endpoint_registry(self._path).save(_ENDPOINTS)
+        client = DataAPIClient(stage="dev", region_name="eu-west-1", access_key="AKIDEXAMPLE", secret_key="secret",
+                               endpoint_cache=self._path)
+
+        self.assertEqual("https://abc.execute-api.eu-west-1.amazonaws.com/dev", client._http_handler.get_base_path())
+
+
+if __name__ == '__main__':
+    unittest.main()
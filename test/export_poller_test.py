@@ -0,0 +1,147 @@
+import sys
+import os
+import threading
+import unittest
+from concurrent.futures import TimeoutError
+
+sys.path.append("..")
+parentdir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+os.sys.path.insert(0, parentdir)
+
+from src.exceptions import DetailedException, ResourceNotFoundException
+from src.data_api_client import DataAPIClient
+from src.lib.export_poller import ExportJob, ExportPoller
+from src.lib.transport import InMemoryTransport
+from benchmark.stand_in_server import StandInApi
+
+
+def _poller(**kwargs):
+    return ExportPoller(**dict(dict(min_interval=0.01, max_interval=0.05, backoff=2), **kwargs))
+
+
+class _Runs:
+    """Stands in for get_export_status. Each run reports its states in turn, then stays in the last one.
+    """
+
+    def __init__(self, runs: dict, errors: list = None):
+        self._runs = runs
+        self._errors = list(errors) if errors is not None else []
+        self._lock = threading.Lock()
+        self.calls = []
+
+    def _next(self, run):
+        states = self._runs[run]
+        return {"Status": states.pop(0) if len(states) > 1 else states[0]}
+
+    def __call__(self, data_type, job_name, job_run_id=None):
+        with self._lock:
+            self.calls.append(job_run_id)
+            if len(self._errors) > 0:
+                raise self._errors.pop(0)
+
+            if job_run_id is not None:
+                return {job_run_id: self._next(job_run_id)}
+
+            return {run: self._next(run) for run in self._runs}
+
+
+class ExportPollerTest(unittest.TestCase):
+    def test_success(self):
+        runs = _Runs({"jr_1": ["RUNNING", "RUNNING", "SUCCEEDED"]})
+        completed = threading.Event()
+        job = _poller().track(ExportJob(runs, "Customer", "Customer-export", "jr_1"))
+        job.add_done_callback(lambda j: completed.set())
+
+        self.assertEqual({"Status": "SUCCEEDED"}, job.wait(timeout=5))
+        self.assertTrue(job.done())
+        self.assertTrue(completed.wait(timeout=5))
+        self.assertEqual("SUCCEEDED", job.status)
+        self.assertEqual(3, len(runs.calls))
+
+    def test_failure(self):
+        job = _poller().track(ExportJob(_Runs({"jr_1": ["FAILED"]}), "Customer", "Customer-export", "jr_1"))
+
+        with self.assertRaises(DetailedException) as e:
+            job.wait(timeout=5)
+        self.assertEqual({"Status": "FAILED"}, e.exception.detail)
+
+    def test_runs_of_a_job_share_status_calls(self):
+        runs = _Runs({f"jr_{i}": ["RUNNING", "RUNNING", "SUCCEEDED"] for i in range(4)})
+        poller = _poller()
+        jobs = [poller.track(ExportJob(runs, "Customer", "Customer-export", f"jr_{i}")) for i in range(4)]
+
+        for job in jobs:
+            job.wait(timeout=5)
+
+        # the runs are read together, rather than once each
+        self.assertLess(len(runs.calls), 4 * 3)
+        self.assertIn(None, runs.calls)
+
+    def test_backoff(self):
+        poller = _poller()
+        runs = _Runs({"jr_1": ["RUNNING"]})
+        job = poller.track(ExportJob(runs, "Customer", "Customer-export", "jr_1", status="RUNNING"))
+
+        with self.assertRaises(TimeoutError):
+            job.wait(timeout=0.3)
+        # intervals of 0.02, 0.04 then 0.05 seconds rather than 0.01
+        self.assertLess(len(runs.calls), 10)
+
+        job.cancel()
+        self.assertTrue(job.cancelled())
+
+    def test_transient_errors(self):
+        runs = _Runs({"jr_1": ["SUCCEEDED"]}, errors=[ConnectionError(), ConnectionError()])
+        job = _poller().track(ExportJob(runs, "Customer", "Customer-export", "jr_1"))
+
+        self.assertEqual({"Status": "SUCCEEDED"}, job.wait(timeout=5))
+
+    def test_persistent_errors(self):
+        runs = _Runs({"jr_1": ["SUCCEEDED"]}, errors=[ConnectionError()] * 3)
+        job = _poller(max_errors=3).track(ExportJob(runs, "Customer", "Customer-export", "jr_1"))
+
+        with self.assertRaises(ConnectionError):
+            job.wait(timeout=5)
+
+        runs = _Runs({"jr_1": ["SUCCEEDED"]}, errors=[ResourceNotFoundException()])
+        job = _poller().track(ExportJob(runs, "Customer", "Customer-export", "jr_1"))
+        with self.assertRaises(ResourceNotFoundException):
+            job.wait(timeout=5)
+
+    def test_run_without_status(self):
+        calls = []
+
+        def no_status(data_type, job_name, job_run_id=None):
+            calls.append(job_run_id)
+            return {}
+
+        job = _poller(max_errors=3).track(ExportJob(no_status, "Customer", "Customer-export", "jr_1"))
+
+        with self.assertRaises(DetailedException):
+            job.wait(timeout=5)
+        self.assertEqual(3, len(calls))
+
+    def test_thread_stops_when_idle(self):
+        poller = _poller()
+        poller.track(ExportJob(_Runs({"jr_1": ["SUCCEEDED"]}), "Customer", "Customer-export", "jr_1")).wait(5)
+        thread = poller._thread
+
+        if thread is not None:
+            thread.join(timeout=5)
+        self.assertEqual(0, poller.tracking)
+        self.assertIsNone(poller._thread)
+
+    def test_client_start_export(self):
+        client = DataAPIClient(stage="dev", region_name="us-east-1", service_endpoint=StandInApi.ENDPOINT, tls=False,
+                               access_key="AKIDEXAMPLE", secret_key="secret", transport=InMemoryTransport(StandInApi()),
+                               export_poller=_poller())
+
+        self.assertEqual("jr_0", client.start_export("Customer", 2, 50, "s3://b/export", "s3://b/log").get("JobRunId"))
+
+        job = client.start_export("Customer", 2, 50, "s3://b/export", "s3://b/log", as_job=True)
+        self.assertEqual(("Customer", "Customer-export", "jr_0"), (job.data_type, job.job_name, job.job_run_id))
+        self.assertEqual("SUCCEEDED", job.wait(timeout=5).get("Status"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+import json
+
+import requests
+
+from src.data_api_client import DataAPIClient
+from src.lib.retry import RetryPolicy
+from src.lib.json_codec import StdlibJsonCodec
+
+
+def fake_response(status: int, content=b"{}", headers: dict = None):
+    """A requests Response which has already been read, with content given as bytes or as a document to send as JSON.
+    """
+    r = requests.Response()
+    r.status_code = status
+    r._content = content if isinstance(content, bytes) else json.dumps(content).encode("utf-8")
+    r._content_consumed = True
+    r.headers.update(headers or {})
+    return r
+
+
+def local_client(**kwargs):
+    """A Client for the dev stage with static credentials and an endpoint nothing listens on, for tests which replace
+    its http handler.
+    """
+    return DataAPIClient(stage="dev", region_name="us-east-1", access_key="AKIDEXAMPLE", secret_key="secret",
+                         service_endpoint="localhost:1", tls=False, **kwargs)
+
+
+class NoSleepPolicy(RetryPolicy):
+    """RetryPolicy which records the delays it would have slept for, rather than sleeping.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.delays = []
+
+    def sleep(self, delay):
+        self.delays.append(delay)
+
+
+class CountingCodec(StdlibJsonCodec):
+    """JsonCodec which counts the documents it encodes and decodes.
+    """
+
+    def __init__(self):
+        self.encoded = 0
+        self.decoded = 0
+
+    def dumps(self, obj) -> bytes:
+        self.encoded += 1
+        return super().dumps(obj)
+
+    def loads(self, data):
+        self.decoded += 1
+        return super().loads(data)
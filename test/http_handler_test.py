@@ -0,0 +1,58 @@
+import sys
+import os
+import unittest
+
+import requests
+
+sys.path.append("..")
+parentdir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+os.sys.path.insert(0, parentdir)
+
+from src.lib.http_handler import HttpHelper
+
+
+def _helper(**kwargs):
+    return HttpHelper(host="https://example.com", stage="dev", region="us-east-1", access_key="AKIDEXAMPLE",
+                      secret_key="secret", session_token=None, **kwargs)
+
+
+class HttpHelperTest(unittest.TestCase):
+    def test_session_is_reused(self):
+        transport = _helper()._transport
+        self.assertIs(transport._get_session(), transport._get_session())
+
+    def test_idle_session_is_evicted(self):
+        transport = _helper(pool_idle_timeout=0)._transport
+        first = transport._get_session()
+        transport._session_last_used -= 1
+        self.assertIsNot(first, transport._get_session())
+
+    def test_session_in_use_is_not_evicted(self):
+        transport = _helper(pool_idle_timeout=0)._transport
+        first = transport._acquire_session()
+        transport._session_last_used -= 1
+
+        # another thread is still sending over the first Session, so it must stay open
+        self.assertIs(first, transport._get_session())
+        transport._release_session()
+        transport._session_last_used -= 1
+        self.assertIsNot(first, transport._get_session())
+
+    def test_pool_size_sizes_each_host_pool(self):
+        adapter = _helper(pool_size=25)._transport._get_session().get_adapter("https://example.com")
+        self.assertEqual(25, adapter._pool_maxsize)
+        self.assertEqual(requests.adapters.DEFAULT_POOLSIZE, adapter._pool_connections)
+
+    def test_keep_alive_disabled(self):
+        self.assertEqual(_helper(keep_alive=False)._headers.get("Connection"), "close")
+        self.assertIsNone(_helper()._headers.get("Connection"))
+
+    def test_close(self):
+        helper = _helper()
+        helper._transport._get_session()
+        helper.close()
+        self.assertIsNone(helper._transport._session)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,141 @@
+import sys
+import os
+import unittest
+from unittest import mock
+import threading
+import time
+
+sys.path.append("..")
+parentdir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+os.sys.path.insert(0, parentdir)
+
+from src.lib.item_cache import ItemCache
+from fakes import fake_response, local_client
+
+
+class ItemCacheTest(unittest.TestCase):
+    def _client(self, cache):
+        client = local_client(item_cache=cache)
+        client._http_handler = mock.Mock()
+        client._http_handler.get.side_effect = lambda **kwargs: fake_response(200, b'{"Item": {"Resource": {"a": 1}}}')
+        client._http_handler.put.side_effect = lambda **kwargs: fake_response(200, b'{"Resource": {"a": 2}}')
+        client._http_handler.delete.side_effect = lambda **kwargs: fake_response(200)
+        return client
+
+    def test_lru_eviction(self):
+        cache = ItemCache(max_size=2)
+        cache.put(("dev", "T", "1", "resource", ()), 1)
+        cache.put(("dev", "T", "2", "resource", ()), 2)
+        cache.get(("dev", "T", "1", "resource", ()))
+        cache.put(("dev", "T", "3", "resource", ()), 3)
+
+        self.assertEqual(1, cache.get(("dev", "T", "1", "resource", ())))
+        self.assertIsNone(cache.get(("dev", "T", "2", "resource", ())))
+        self.assertEqual(1, cache.evictions)
+        self.assertEqual(2, len(cache))
+
+    def test_ttl_expiry(self):
+        cache = ItemCache(ttl=0.01)
+        cache.put(("dev", "T", "1", "resource", ()), 1)
+        time.sleep(0.02)
+
+        self.assertIsNone(cache.get(("dev", "T", "1", "resource", ())))
+        self.assertEqual(1, cache.evictions)
+        self.assertEqual(1, cache.misses)
+
+    def test_values_are_copied(self):
+        cache = ItemCache()
+        value = {"Resource": {"a": 1}}
+        cache.put(("dev", "T", "1", "resource", ()), value)
+        value["Resource"]["a"] = 2
+        cache.get(("dev", "T", "1", "resource", ()))["Resource"]["a"] = 3
+
+        self.assertEqual({"Resource": {"a": 1}}, cache.get(("dev", "T", "1", "resource", ())))
+
+    def test_invalidate_drops_all_projections(self):
+        cache = ItemCache()
+        cache.put(("dev", "T", "1", "resource", ()), 1)
+        cache.put(("dev", "T", "1", "metadata", ()), 2)
+        cache.put(("dev", "T", "2", "resource", ()), 3)
+        cache.invalidate("dev", "T", "1")
+
+        self.assertEqual(1, len(cache))
+        self.assertEqual(2, cache.invalidations)
+
+    def test_client_reads_through_cache(self):
+        client = self._client(ItemCache())
+
+        for _ in range(3):
+            client.get_resource("Customer", "1")
+        client.get_resource("Customer", "1", only_attributes=["a"])
+
+        # one fetch for each projection
+        self.assertEqual(2, client._http_handler.get.call_count)
+        self.assertEqual(2, client.cache_statistics().get("Hits"))
+        self.assertEqual(2, client.cache_statistics().get("Misses"))
+
+    def test_client_writes_invalidate(self):
+        client = self._client(ItemCache())
+        writes = [
+            lambda: client.put_resource("Customer", "1", {"a": 2}),
+            lambda: client.put_metadata("Customer", "1", {"b": 2}),
+            lambda: client.delete_resource("Customer", "1"),
+            lambda: client.delete_attributes("Customer", "1", resource_attributes=["a"]),
+            lambda: client.restore_item("Customer", "1"),
+            lambda: client.set_item_master("Customer", "1", "2")
+        ]
+
+        for write in writes:
+            client.get_resource("Customer", "1")
+            client.get_metadata("Customer", "1")
+            write()
+
+        self.assertEqual(2 * len(writes), client._http_handler.get.call_count)
+
+    def test_write_during_read_is_not_overwritten(self):
+        client = self._client(ItemCache())
+        started = threading.Event()
+        release = threading.Event()
+
+        def _slow_get(**kwargs):
+            started.set()
+            release.wait()
+            return fake_response(200, b'{"Item": {"Resource": {"a": 1}}}')
+
+        client._http_handler.get.side_effect = _slow_get
+        reader = threading.Thread(target=client.get_resource, args=("Customer", "1"))
+        reader.start()
+        started.wait()
+
+        # the write lands while the read of the old Item is in flight
+        client.put_resource("Customer", "1", {"a": 2})
+        release.set()
+        reader.join()
+
+        client._http_handler.get.side_effect = lambda **kwargs: fake_response(200, b'{"Item": {"Resource": {"a": 2}}}')
+        self.assertEqual({"a": 2}, client.get_resource("Customer", "1").get("Item").get("Resource"))
+        self.assertEqual(2, client._http_handler.get.call_count)
+        self.assertEqual({}, client._item_cache._loading)
+
+    def test_failed_write_invalidates(self):
+        client = self._client(ItemCache())
+        client.get_resource("Customer", "1")
+        client._http_handler.put.side_effect = lambda **kwargs: fake_response(409)
+
+        with self.assertRaises(Exception):
+            client.put_resource("Customer", "1", {"a": 2})
+
+        client.get_resource("Customer", "1")
+        self.assertEqual(2, client._http_handler.get.call_count)
+
+    def test_client_without_cache(self):
+        client = self._client(None)
+        client.get_resource("Customer", "1")
+        client.get_resource("Customer", "1")
+
+        self.assertEqual(2, client._http_handler.get.call_count)
+        self.assertIsNone(client.cache_statistics())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+import sys
+import os
+import json
+import unittest
+from unittest import mock
+
+sys.path.append("..")
+parentdir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+os.sys.path.insert(0, parentdir)
+
+from src.exceptions import *
+from src.lib.json_codec import JsonCodec, StdlibJsonCodec, OrjsonCodec, default_codec, get_codec
+from fakes import CountingCodec, fake_response, local_client
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_doc = {"Items": [{"id": str(i), "Resource": {"name": "é", "score": 1.5, "tags": [True, None]}} for i in range(10)]}
+
+
+class JsonCodecTest(unittest.TestCase):
+    def test_stdlib_round_trip(self):
+        codec = StdlibJsonCodec()
+        encoded = codec.dumps(_doc)
+
+        self.assertIsInstance(encoded, bytes)
+        self.assertEqual(_doc, codec.loads(encoded))
+
+    @unittest.skipUnless(orjson is not None, "orjson not installed")
+    def test_orjson(self):
+        codec = OrjsonCodec()
+        encoded = codec.dumps(_doc)
+
+        self.assertIsInstance(encoded, bytes)
+        self.assertEqual(_doc, codec.loads(encoded))
+        self.assertIsInstance(default_codec(), OrjsonCodec)
+
+    @unittest.skipUnless(orjson is not None, "orjson not installed")
+    def test_orjson_falls_back_to_stdlib(self):
+        doc = {"big": 2 ** 70, 1: "integer key"}
+        self.assertEqual(json.dumps(doc).encode("utf-8"), OrjsonCodec().dumps(doc))
+
+    @unittest.skipUnless(orjson is not None, "orjson not installed")
+    def test_orjson_keeps_long_integers(self):
+        codec = OrjsonCodec()
+        doc = {"Resource": {"big": 123456789012345678901234567890, "low": -9223372036854775809, "small": 12}}
+
+        self.assertEqual(doc, codec.loads(json.dumps(doc).encode("utf-8")))
+        self.assertEqual(doc, codec.loads(json.dumps(doc)))
+        self.assertIsInstance(codec.loads(b'{"n": 18446744073709551616}').get("n"), int)
+
+    def test_codecs_must_implement_dumps_and_loads(self):
+        class _EncodeOnly(JsonCodec):
+            def dumps(self, obj) -> bytes:
+                return b"{}"
+
+        with self.assertRaises(TypeError):
+            _EncodeOnly()
+
+    def test_get_codec(self):
+        codec = StdlibJsonCodec()
+
+        self.assertIs(codec, get_codec(codec))
+        self.assertIs(default_codec(), get_codec())
+        self.assertIsInstance(get_codec("json"), StdlibJsonCodec)
+        with self.assertRaises(InvalidArgumentsException):
+            get_codec("yaml")
+
+
+class ClientCodecTest(unittest.TestCase):
+    def test_client_uses_codec(self):
+        codec = CountingCodec()
+        client = local_client(json_codec=codec)
+
+        session = mock.Mock()
+        session.request.return_value = fake_response(200, {"Item": {"Resource": {"id": "1"}}})
+        client._http_handler._transport._get_session = mock.Mock(return_value=session)
+
+        client.put_resource("Customer", "1", {"name": "x"})
+        self.assertEqual(1, codec.encoded)
+        self.assertIsInstance(session.request.call_args.kwargs.get("data"), bytes)
+
+        self.assertEqual({"Resource": {"id": "1"}}, client.get_resource("Customer", "1").get("Item"))
+        self.assertEqual(2, codec.decoded)
+
+
+if __name__ == '__main__':
+    unittest.main()
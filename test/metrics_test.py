@@ -0,0 +1,159 @@
+import sys
+import os
+import unittest
+import inspect
+from unittest import mock
+
+sys.path.append("..")
+parentdir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+os.sys.path.insert(0, parentdir)
+
+from src.data_api_client import DataAPIClient
+from src.lib.http_handler import HttpHelper
+from src.lib.metrics import RequestMetrics, LatencyHistogram, SERIALIZE, SIGN, DECODE, TOTAL
+from src.lib.transport import Transport, InMemoryTransport, CONNECT, TTFB, TRANSFER
+from benchmark.stand_in_server import StandInApi, StandInServer
+
+
+class _Unreachable(Transport):
+    connection_errors = (ConnectionRefusedError,)
+
+    def send(self, method, url, headers, body=None, stream=False, timings=None):
+        raise ConnectionRefusedError()
+
+
+class LatencyHistogramTest(unittest.TestCase):
+    def test_percentiles(self):
+        histogram = LatencyHistogram()
+        for ms in range(1, 1001):
+            histogram.record(ms / 1000)
+
+        self.assertEqual(1000, histogram.count)
+        for p, expected in [(50, 0.5), (90, 0.9), (99, 0.99), (99.9, 0.999)]:
+            self.assertAlmostEqual(expected, histogram.percentile(p), delta=expected * 0.02)
+        self.assertEqual(1.0, histogram.percentile(100))
+        self.assertEqual(1000.0, histogram.summary().get("max_ms"))
+
+    def test_empty(self):
+        self.assertIsNone(LatencyHistogram().percentile(99))
+        self.assertIsNone(LatencyHistogram().summary().get("p99_ms"))
+
+
+class ClientMetricsTest(unittest.TestCase):
+    def _client(self, request_metrics: RequestMetrics = None):
+        api = StandInApi(page_items=4, pages=2, item_size=128)
+        return DataAPIClient(stage="dev", region_name="us-east-1", service_endpoint=api.endpoint, tls=False,
+                             access_key="AKIDEXAMPLE", secret_key="secret", transport=InMemoryTransport(api),
+                             request_metrics=request_metrics if request_metrics is not None else RequestMetrics())
+
+    def test_metrics_per_method(self):
+        client = self._client()
+        client.get_resource("Customer", "1")
+        client.get_resource("Customer", "2")
+        client.put_resource("Customer", "1", {"name": "x"})
+        list(client.iter_items("Customer", page_size=4))
+
+        metrics = client.metrics()
+        self.assertEqual({"get_resource", "put_resource", "iter_items"}, set(metrics.keys()))
+        self.assertEqual(2, metrics.get("get_resource").get("count"))
+        self.assertEqual(2, metrics.get("iter_items").get("count"))
+        self.assertEqual({SIGN, TTFB, DECODE, TOTAL}, set(metrics.get("get_resource").get("latency").keys()))
+        self.assertIn(SERIALIZE, metrics.get("put_resource").get("latency"))
+        self.assertGreater(metrics.get("put_resource").get("bytes_out"), 0)
+        self.assertGreater(metrics.get("get_resource").get("bytes_in"), 0)
+        self.assertIsNotNone(metrics.get("get_resource").get("latency").get(TOTAL).get("p99_ms"))
+
+        client.metrics(reset=True)
+        self.assertEqual({}, client.metrics())
+
+    def test_metrics_off_by_default(self):
+        api = StandInApi()
+        client = DataAPIClient(stage="dev", region_name="us-east-1", service_endpoint=api.endpoint, tls=False,
+                               access_key="AKIDEXAMPLE", secret_key="secret", transport=InMemoryTransport(api))
+        client.get_resource("Customer", "1")
+
+        self.assertIsNone(client.metrics())
+        # methods are not wrapped to name their requests
+        self.assertNotIn("get_resource", vars(client))
+
+    def test_labelled_methods_keep_their_signature(self):
+        client = self._client()
+
+        self.assertIn("get_resource", vars(client))
+        self.assertEqual(inspect.getfullargspec(DataAPIClient.get_resource).args[1:],
+                         inspect.getfullargspec(client.get_resource).args)
+
+    def test_bulk_methods_are_named_after_themselves(self):
+        client = self._client()
+
+        paginator = client.iter_items("Customer", page_size=4)
+        self.assertEqual(8, len(list(paginator)))
+        self.assertEqual(8, len(list(client.iter_find("Customer", resource_attributes={"a": 1}))))
+        self.assertEqual(8, len(list(client.iter_items("Customer", page_size=4, stream=True))))
+        self.assertEqual(16, len(list(client.scan_all("Customer", total_segments=2, page_size=4))))
+        client.get_resources("Customer", ["1", "2", "3"], max_concurrency=2)
+        with client.bulk_writer(concurrency=2) as writer:
+            for i in range(3):
+                writer.put_resource("Customer", str(i), {"name": "x"})
+        # calls made directly are still named after the method called
+        client.list_items("Customer", page_size=4)
+
+        metrics = client.metrics()
+        self.assertEqual({"iter_items": 4, "iter_find": 2, "scan_all": 4, "get_resources": 3, "bulk_writer": 3,
+                          "list_items": 1}, {operation: m.get("count") for operation, m in metrics.items()})
+
+    def test_streamed_responses_have_no_decode_phase(self):
+        events = []
+        client = self._client(request_metrics=RequestMetrics(callbacks=[events.append]))
+
+        self.assertEqual(8, len(list(client.iter_items("Customer", page_size=4, stream=True))))
+        self.assertEqual(2, len(events))
+        self.assertNotIn(DECODE, events[0].phases)
+
+    def test_callbacks(self):
+        events = []
+        failing = mock.Mock(side_effect=ValueError())
+        client = self._client(request_metrics=RequestMetrics(callbacks=[failing, events.append]))
+
+        client.get_resource("Customer", "1")
+
+        failing.assert_called_once()
+        event = events[0]
+        self.assertEqual(("get_resource", "GET", "Customer/1", "Customer", 200, 0),
+                         (event.operation, event.method, event.path, event.data_type, event.status, event.retries))
+        self.assertFalse(event.failed)
+        self.assertGreaterEqual(event.phases.get(TOTAL), event.phases.get(TTFB) + event.phases.get(DECODE))
+
+    def test_connection_error(self):
+        events = []
+        helper = HttpHelper(host="https://example.com", stage="dev", region="us-east-1", access_key="AKIDEXAMPLE",
+                            secret_key="secret", session_token=None, transport=_Unreachable(),
+                            metrics=RequestMetrics(callbacks=[events.append]))
+
+        with self.assertRaises(ConnectionRefusedError):
+            helper.get("Customer", "1")
+
+        self.assertIsNone(events[0].status)
+        self.assertIsInstance(events[0].error, ConnectionRefusedError)
+        self.assertTrue(events[0].failed)
+        self.assertEqual("GET", events[0].operation)
+
+    def test_requests_transport_phases(self):
+        server = StandInServer(item_size=128).start()
+        events = []
+        try:
+            client = DataAPIClient(stage="dev", region_name="us-east-1", service_endpoint=server.endpoint, tls=False,
+                                   access_key="AKIDEXAMPLE", secret_key="secret",
+                                   request_metrics=RequestMetrics(callbacks=[events.append]))
+            client.get_resource("Customer", "1")
+            client.close()
+        finally:
+            server.stop()
+
+        self.assertEqual(200, events[0].status)
+        for phase in (CONNECT, TTFB, TRANSFER, DECODE):
+            self.assertIn(phase, events[0].phases)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,140 @@
+import sys
+import os
+import unittest
+from unittest import mock
+import threading
+import time
+
+sys.path.append("..")
+parentdir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+os.sys.path.insert(0, parentdir)
+
+from src.exceptions import *
+from src.lib.namespace_cache import NamespaceMetadataCache, get_metadata_cache
+from fakes import fake_response, local_client
+
+_INFO = b'{"DataType": "Customer", "PrimaryKey": "id", "DeleteMode": "soft", "StrictOCCV": "False"}'
+
+
+class NamespaceCacheTest(unittest.TestCase):
+    def _client(self, cache):
+        client = local_client(metadata_cache=cache)
+        client._http_handler.get = mock.Mock(side_effect=lambda **kwargs: fake_response(200, _INFO))
+        client._http_handler.put = mock.Mock(side_effect=lambda **kwargs: fake_response(200))
+        return client
+
+    def test_shared_cache(self):
+        self.assertIs(get_metadata_cache(), get_metadata_cache())
+
+    def test_info_served_from_cache(self):
+        client = self._client(NamespaceMetadataCache())
+
+        full = client.get_info("Customer")
+        subset = client.get_info("Customer", attribute_filters=["PrimaryKey", "Missing"])
+
+        self.assertEqual("soft", full.get("DeleteMode"))
+        self.assertEqual({"PrimaryKey": "id"}, subset)
+        self.assertEqual(1, client._http_handler.get.call_count)
+        # the full document is fetched, with filters applied locally
+        self.assertIsNone(client._http_handler.get.call_args.kwargs.get("query_params"))
+
+    def test_kinds_and_namespaces_cached_separately(self):
+        client = self._client(NamespaceMetadataCache())
+
+        for _ in range(2):
+            client.get_info("Customer")
+            client.get_status("Customer")
+            client.get_endpoints("Customer")
+            client.get_info("Order")
+
+        self.assertEqual(4, client._http_handler.get.call_count)
+
+    def test_expiry_and_refresh(self):
+        client = self._client(NamespaceMetadataCache(ttl=-1))
+        client.get_info("Customer")
+        client.get_info("Customer")
+        self.assertEqual(2, client._http_handler.get.call_count)
+
+        client = self._client(NamespaceMetadataCache())
+        client.get_info("Customer")
+        client.refresh_namespace_metadata("Customer")
+        client.get_info("Customer")
+        client.put_info("Customer", {"a": 1})
+        client.get_info("Customer")
+        self.assertEqual(3, client._http_handler.get.call_count)
+
+    def test_concurrent_loads_coalesce(self):
+        cache = NamespaceMetadataCache()
+        calls = []
+
+        def _load():
+            calls.append(1)
+            time.sleep(0.05)
+            return {"PrimaryKey": "id"}
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(cache.get(("api", "info", "Customer"), _load)))
+                   for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(1, len(calls))
+        self.assertEqual([{"PrimaryKey": "id"}] * 8, results)
+
+    def test_errors_reach_all_waiters_and_are_not_cached(self):
+        cache = NamespaceMetadataCache()
+        started = threading.Event()
+
+        def _load():
+            started.set()
+            time.sleep(0.05)
+            raise ResourceNotFoundException()
+
+        errors = []
+
+        def _get():
+            try:
+                cache.get(("api", "info", "Customer"), _load)
+            except ResourceNotFoundException as e:
+                errors.append(e)
+
+        first = threading.Thread(target=_get)
+        first.start()
+        started.wait()
+        second = threading.Thread(target=_get)
+        second.start()
+        first.join()
+        second.join()
+
+        self.assertEqual(2, len(errors))
+        self.assertEqual({"ok": 1}, cache.get(("api", "info", "Customer"), lambda: {"ok": 1}))
+
+    def test_invalidate_during_load(self):
+        cache = NamespaceMetadataCache()
+        started = threading.Event()
+        release = threading.Event()
+
+        def _slow_load():
+            started.set()
+            release.wait()
+            return {"PrimaryKey": "old"}
+
+        loader = threading.Thread(target=cache.get, args=(("api", "info", "Customer"), _slow_load))
+        loader.start()
+        started.wait()
+
+        # a caller arriving after the invalidation does not join the load sent before it
+        cache.invalidate(api="api", data_type="Customer")
+        self.assertEqual({"PrimaryKey": "new"}, cache.get(("api", "info", "Customer"), lambda: {"PrimaryKey": "new"}))
+
+        release.set()
+        loader.join()
+
+        # and the older document does not replace the cached one
+        self.assertEqual({"PrimaryKey": "new"}, cache.get(("api", "info", "Customer"), lambda: {"PrimaryKey": "x"}))
+
+
+if __name__ == '__main__':
+    unittest.main()
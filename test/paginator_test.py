@@ -0,0 +1,97 @@
+import sys
+import os
+import threading
+import time
+import unittest
+
+sys.path.append("..")
+parentdir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+os.sys.path.insert(0, parentdir)
+
+import src.parameters as params
+from src.exceptions import *
+from src.lib.paginator import Paginator
+
+_total_pages = 4
+_page_size = 3
+
+
+class _Pages:
+    def __init__(self, delay: float = 0):
+        self.delay = delay
+        self.requested = []
+        self.lock = threading.Lock()
+
+    def __call__(self, start_token):
+        page = 0 if start_token is None else start_token
+        with self.lock:
+            self.requested.append(page)
+        time.sleep(self.delay)
+
+        response = {"Items": [{"id": f"{page}-{i}"} for i in range(_page_size)]}
+        if page + 1 < _total_pages:
+            response[params.LAST_EVALUATED_KEY] = page + 1
+
+        return response
+
+
+class PaginatorTest(unittest.TestCase):
+    def test_follows_all_pages(self):
+        for prefetch in [True, False]:
+            items = list(Paginator(_Pages(), prefetch=prefetch))
+            self.assertEqual(len(items), _total_pages * _page_size)
+            self.assertEqual(items[-1].get("id"), f"{_total_pages - 1}-{_page_size - 1}")
+
+    def test_max_items(self):
+        pages = _Pages()
+        items = list(Paginator(pages, max_items=4))
+        self.assertEqual(len(items), 4)
+        self.assertEqual(pages.requested, [0, 1])
+
+    def test_resume_after_stopping_mid_page(self):
+        first = Paginator(_Pages(), max_items=4)
+        self.assertEqual(["0-0", "0-1", "0-2", "1-0"], [item.get("id") for item in first])
+        self.assertEqual(1, first.last_evaluated_key)
+        self.assertFalse(first.exhausted)
+
+        # resuming is page aligned: page 1 is read again from its start, so none of its Items are skipped
+        rest = Paginator(_Pages(), start_token=first.last_evaluated_key)
+        ids = [item.get("id") for item in rest]
+        self.assertEqual(["1-0", "1-1", "1-2"], ids[:3])
+        self.assertEqual((_total_pages - 1) * _page_size, len(ids))
+        self.assertIsNone(rest.last_evaluated_key)
+        self.assertTrue(rest.exhausted)
+
+        # stopping within the first page resumes from the start, and is not mistaken for the end
+        first = Paginator(_Pages(), max_items=2)
+        self.assertEqual(2, len(list(first)))
+        self.assertIsNone(first.last_evaluated_key)
+        self.assertFalse(first.exhausted)
+
+        # stopping at the end of a page resumes from the next one
+        first = Paginator(_Pages(), max_items=_page_size)
+        self.assertEqual(_page_size, len(list(first)))
+        self.assertEqual(1, first.last_evaluated_key)
+
+    def test_max_pages(self):
+        paginator = Paginator(_Pages(), max_pages=2)
+        self.assertEqual(len(list(paginator)), 2 * _page_size)
+        self.assertEqual(paginator.last_evaluated_key, 2)
+
+    def test_prefetch_overlaps(self):
+        pages = _Pages(delay=0.05)
+        iterator = iter(Paginator(pages).pages())
+        next(iterator)
+        time.sleep(0.1)
+
+        # the second page was requested while the caller held the first
+        self.assertEqual(pages.requested, [0, 1])
+        iterator.close()
+
+    def test_invalid_caps(self):
+        with self.assertRaises(InvalidArgumentsException):
+            Paginator(_Pages(), max_items=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
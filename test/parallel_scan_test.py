@@ -0,0 +1,71 @@
+import sys
+import os
+import threading
+import unittest
+
+sys.path.append("..")
+parentdir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+os.sys.path.insert(0, parentdir)
+
+import src.parameters as params
+from src.exceptions import *
+from src.lib.parallel_scan import ParallelScanner
+
+_pages_per_segment = 3
+_page_size = 5
+
+
+def _list_page(segment, start_token):
+    page = 0 if start_token is None else start_token
+    items = [{"id": f"{segment}-{page}-{i}"} for i in range(_page_size)]
+    response = {"Items": items}
+
+    if page + 1 < _pages_per_segment:
+        response[params.LAST_EVALUATED_KEY] = page + 1
+
+    return response
+
+
+class ParallelScannerTest(unittest.TestCase):
+    def test_unordered(self):
+        items = list(ParallelScanner(_list_page, total_segments=4))
+        self.assertEqual(len(items), 4 * _pages_per_segment * _page_size)
+        self.assertEqual(len(set(i.get("id") for i in items)), len(items))
+
+    def test_ordered(self):
+        items = list(ParallelScanner(_list_page, total_segments=4, ordered=True, max_workers=2))
+        segments = [int(i.get("id").split("-")[0]) for i in items]
+        self.assertEqual(segments, sorted(segments))
+
+    def test_progress(self):
+        progress = {}
+        lock = threading.Lock()
+
+        def _on_progress(p):
+            with lock:
+                progress[p.segment] = (p.pages, p.items, p.complete)
+
+        list(ParallelScanner(_list_page, total_segments=2, progress_callback=_on_progress))
+        self.assertEqual(progress.get(1), (_pages_per_segment, _pages_per_segment * _page_size, True))
+
+    def test_error_propagates(self):
+        def _failing(segment, start_token):
+            if segment == 1:
+                raise ResourceNotFoundException()
+            return _list_page(segment, start_token)
+
+        with self.assertRaises(ResourceNotFoundException):
+            list(ParallelScanner(_failing, total_segments=2))
+
+    def test_early_stop(self):
+        scan = iter(ParallelScanner(_list_page, total_segments=4, buffer_pages=1))
+        next(scan)
+        scan.close()
+
+    def test_invalid_segments(self):
+        with self.assertRaises(InvalidArgumentsException):
+            ParallelScanner(_list_page, total_segments=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+import sys
+import os
+import unittest
+from unittest import mock
+import threading
+
+sys.path.append("..")
+parentdir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+os.sys.path.insert(0, parentdir)
+
+from src.lib.http_handler import HttpHelper
+from src.lib.rate_limiter import TokenBucket, AdaptiveRateLimiter
+from src.exceptions import InvalidArgumentsException
+from fakes import fake_response
+
+
+class RateLimiterTest(unittest.TestCase):
+    def test_bucket_allows_burst_then_paces(self):
+        bucket = TokenBucket(rate=10, burst=2)
+
+        self.assertEqual(0, bucket.reserve())
+        self.assertEqual(0, bucket.reserve())
+
+        # the third caller waits for one token, the fourth behind it for two
+        self.assertAlmostEqual(0.1, bucket.reserve(), delta=0.01)
+        self.assertAlmostEqual(0.2, bucket.reserve(), delta=0.01)
+
+    def test_bucket_rejects_invalid_rate(self):
+        with self.assertRaises(InvalidArgumentsException):
+            TokenBucket(rate=0)
+
+    def test_reads_and_writes_use_separate_buckets(self):
+        limiter = AdaptiveRateLimiter(read_rate=1, write_rate=1)
+
+        self.assertEqual(0, limiter.reserve("GET", "Customer/1"))
+        self.assertEqual(0, limiter.reserve("PUT", "Customer/1"))
+        # find is a POST but only reads
+        self.assertGreater(limiter.reserve("POST", "Customer/find"), 0)
+        self.assertGreater(limiter.reserve("DELETE", "Customer/1"), 0)
+
+    def test_throttle_decreases_once_per_interval(self):
+        limiter = AdaptiveRateLimiter(read_rate=100, write_rate=50, decrease_interval=60)
+
+        limiter.record("GET", "Customer/1", 429)
+        limiter.record("GET", "Customer/1", 429)
+
+        self.assertEqual(50, limiter.read_rate)
+        self.assertEqual(50, limiter.write_rate)
+
+    def test_throttle_floor(self):
+        limiter = AdaptiveRateLimiter(read_rate=2, min_rate=1.5, decrease_interval=0)
+
+        for _ in range(5):
+            limiter.record("GET", "Customer/1", 429)
+
+        self.assertEqual(1.5, limiter.read_rate)
+
+    def test_success_increases_up_to_max(self):
+        limiter = AdaptiveRateLimiter(read_rate=10, max_read_rate=11)
+
+        for _ in range(10):
+            limiter.record("GET", "Customer/1", 200)
+
+        # each success adds 1/rate, so a second's worth of successes adds about 1 request/second
+        self.assertAlmostEqual(11, limiter.read_rate, delta=0.1)
+
+        for _ in range(10):
+            limiter.record("GET", "Customer/1", 200)
+
+        self.assertEqual(11, limiter.read_rate)
+
+    def test_server_errors_do_not_adapt(self):
+        limiter = AdaptiveRateLimiter(read_rate=10)
+        limiter.record("GET", "Customer/1", 503)
+
+        self.assertEqual(10, limiter.read_rate)
+
+    def test_shared_between_threads(self):
+        limiter = AdaptiveRateLimiter(write_rate=1000)
+        waits = []
+
+        def worker():
+            for _ in range(100):
+                waits.append(limiter.reserve("PUT", "Customer/1"))
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        # 400 reservations against a burst of 1000 never have to wait
+        self.assertEqual(400, len(waits))
+        self.assertEqual(0, max(waits))
+
+    def test_http_helper_acquires_and_records(self):
+        limiter = AdaptiveRateLimiter(read_rate=100, decrease_interval=0)
+        helper = HttpHelper(host="https://example.com", stage="dev", region="us-east-1", access_key="AKIDEXAMPLE",
+                            secret_key="secret", session_token=None, rate_limiter=limiter)
+        session = mock.Mock()
+        session.request.side_effect = [fake_response(429)]
+        helper._transport._get_session = lambda: session
+
+        with mock.patch.object(limiter, "acquire", wraps=limiter.acquire) as acquire:
+            response = helper.get("Customer", "1")
+
+        self.assertEqual(429, response.status_code)
+        acquire.assert_called_once_with("GET", "Customer/1")
+        self.assertEqual(50, limiter.read_rate)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+import sys
+import os
+import pickle
+import unittest
+from unittest import mock
+
+sys.path.append("..")
+parentdir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+os.sys.path.insert(0, parentdir)
+
+from src.lib.records import ItemRecord, RecordFactory
+from fakes import CountingCodec, fake_response, local_client
+
+
+def _item(i: int) -> dict:
+    return {"id": f"customer-{i}", "ItemVersion": i, "LastUpdateAction": "update",
+            "Resource": {"name": f"name {i}", "tags": ["a", "b"]}, "Metadata": {"source": "crm"},
+            "References": [{"Resource": "Order", "Id": str(i)}]}
+
+
+class ItemRecordTest(unittest.TestCase):
+    def test_mapping(self):
+        item = _item(1)
+        record = RecordFactory().make(item)
+
+        self.assertIsInstance(record, ItemRecord)
+        self.assertEqual(item, record.to_dict())
+        self.assertEqual(item, record)
+        self.assertEqual(list(item.keys()), list(record.keys()))
+        self.assertEqual("customer-1", record["id"])
+        self.assertEqual("crm", record.metadata.get("source"))
+        self.assertEqual("Order", record.references[0].get("Resource"))
+        self.assertIsNone(record.get("Master"))
+        self.assertNotIn("Master", record)
+        with self.assertRaises(KeyError):
+            record["Master"]
+
+    def test_sections_decoded_on_access(self):
+        codec = CountingCodec()
+        record = RecordFactory(codec).make(_item(1))
+
+        self.assertEqual(1, record["ItemVersion"])
+        self.assertEqual(0, codec.decoded)
+        self.assertEqual("name 1", record.resource.get("name"))
+        self.assertEqual(1, codec.decoded)
+
+    def test_shared_layout(self):
+        factory = RecordFactory()
+        first = factory.make(_item(1))
+        second = factory.make(_item(2))
+        other = factory.make({"id": "x"})
+
+        self.assertIs(first._shape, second._shape)
+        self.assertIsNot(first._shape, other._shape)
+        self.assertIs(first._values[2], second._values[2])
+
+    def test_shape_limit(self):
+        factory = RecordFactory(max_shapes=1)
+        factory.make({"a": 1})
+        record = factory.make({"b": 2})
+
+        self.assertEqual({"b": 2}, record.to_dict())
+        self.assertEqual(1, len(factory._shapes))
+
+    def test_no_instance_dict(self):
+        record = RecordFactory().make(_item(1))
+
+        with self.assertRaises(AttributeError):
+            record.extra = 1
+
+    def test_pickles_as_dict(self):
+        record = RecordFactory().make(_item(1))
+        self.assertEqual(_item(1), pickle.loads(pickle.dumps(record)))
+
+
+class CompactClientTest(unittest.TestCase):
+    def setUp(self):
+        self.client = local_client()
+        self.client._http_handler = mock.Mock()
+
+    def test_list_items_compact(self):
+        self.client._http_handler.get.return_value = fake_response(200, {"Items": [_item(i) for i in range(3)]})
+        page = self.client.list_items("Customer", page_size=3, compact=True)
+
+        self.assertTrue(all(isinstance(item, ItemRecord) for item in page.get("Items")))
+        self.assertEqual([_item(i) for i in range(3)], [item.to_dict() for item in page.get("Items")])
+
+    def test_streamed_find_compact(self):
+        self.client._http_handler.post.return_value = fake_response(200, {"Items": [_item(i) for i in range(3)]})
+        items = list(self.client.iter_find("Customer", resource_attributes={"name": "x"}, stream=True,
+                                           compact=True))
+
+        self.assertEqual(3, len(items))
+        self.assertIsInstance(items[0], ItemRecord)
+        self.assertEqual(_item(2), items[2])
+
+
+if __name__ == '__main__':
+    unittest.main()
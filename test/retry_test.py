@@ -0,0 +1,92 @@
+import sys
+import os
+import unittest
+from unittest import mock
+from email.utils import formatdate
+import time
+
+import requests
+
+sys.path.append("..")
+parentdir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+os.sys.path.insert(0, parentdir)
+
+from src.lib.http_handler import HttpHelper
+from src.lib.retry import RetryPolicy, RetryBudget, parse_retry_after, RETRY_COST
+from fakes import fake_response, NoSleepPolicy
+
+
+def _helper(policy, responses):
+    helper = HttpHelper(host="https://example.com", stage="dev", region="us-east-1", access_key="AKIDEXAMPLE",
+                        secret_key="secret", session_token=None, retry_policy=policy)
+    session = mock.Mock()
+    session.request.side_effect = responses
+    helper._transport._get_session = lambda: session
+    return helper, session
+
+
+class RetryPolicyTest(unittest.TestCase):
+    def test_idempotency(self):
+        policy = RetryPolicy()
+        self.assertTrue(policy.is_retryable_request("GET", "MyItem/1234"))
+        self.assertTrue(policy.is_retryable_request("POST", "MyItem/find"))
+        self.assertFalse(policy.is_retryable_request("PUT", "MyItem/1234"))
+        self.assertFalse(policy.is_retryable_request("POST", "MyItem/export"))
+        self.assertTrue(RetryPolicy(retry_writes=True).is_retryable_request("PUT", "MyItem/1234"))
+        self.assertFalse(RetryPolicy(max_retries=0).is_retryable_request("GET", "MyItem/1234"))
+
+    def test_backoff_is_capped_full_jitter(self):
+        policy = RetryPolicy(base_delay=1, max_delay=4)
+        for attempt in range(10):
+            self.assertLessEqual(policy.backoff(attempt), min(4, 2 ** attempt))
+
+    def test_retry_after(self):
+        self.assertEqual(parse_retry_after("3"), 3)
+        self.assertAlmostEqual(parse_retry_after(formatdate(time.time() + 10, usegmt=True)), 10, delta=2)
+        self.assertIsNone(parse_retry_after("soon"))
+
+        policy = RetryPolicy(max_delay=5)
+        self.assertGreaterEqual(policy.next_delay(0, status_code=429, retry_after="2"), 2)
+        self.assertIsNone(policy.next_delay(0, status_code=429, retry_after="60"))
+
+    def test_non_retryable_status(self):
+        self.assertIsNone(RetryPolicy().next_delay(0, status_code=404))
+
+    def test_budget(self):
+        policy = RetryPolicy(budget=RetryBudget(capacity=RETRY_COST))
+        self.assertIsNotNone(policy.next_delay(0, status_code=503))
+        self.assertIsNone(policy.next_delay(0, status_code=503))
+        policy.record_success(1)
+        self.assertIsNotNone(policy.next_delay(0, status_code=503))
+
+
+class HttpHelperRetryTest(unittest.TestCase):
+    def test_retries_throttling(self):
+        policy = NoSleepPolicy()
+        helper, session = _helper(policy, [fake_response(429, headers={"Retry-After": "1"}), fake_response(503),
+                                           fake_response(200)])
+
+        self.assertEqual(helper.get(data_type="MyItem", path="1234").status_code, 200)
+        self.assertEqual(session.request.call_count, 3)
+        self.assertGreaterEqual(policy.delays[0], 1)
+
+    def test_retries_connection_errors(self):
+        helper, session = _helper(NoSleepPolicy(), [requests.ConnectionError(), fake_response(200)])
+        self.assertEqual(helper.post(data_type="MyItem", path="find", post_body={}).status_code, 200)
+
+    def test_gives_up(self):
+        helper, session = _helper(NoSleepPolicy(max_retries=2), [fake_response(503)] * 5)
+        self.assertEqual(helper.get(data_type="MyItem", path="1234").status_code, 503)
+        self.assertEqual(session.request.call_count, 3)
+
+    def test_writes_not_retried(self):
+        helper, session = _helper(NoSleepPolicy(), [fake_response(503), fake_response(200)])
+        self.assertEqual(helper.put(data_type="MyItem", path="1234", put_body={}).status_code, 503)
+
+        helper, session = _helper(NoSleepPolicy(), [requests.ConnectionError()])
+        with self.assertRaises(requests.ConnectionError):
+            helper.delete(data_type="MyItem", path="1234", delete_body={})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,120 @@
+import sys
+import os
+import unittest
+import subprocess
+from unittest import mock
+
+sys.path.append("..")
+parentdir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+os.sys.path.insert(0, parentdir)
+
+from src.exceptions import *
+from src.lib.schema_cache import SchemaCache, compile_validator, schema_library
+from fakes import fake_response, local_client
+
+_SCHEMA = {
+    "$schema": "http://json-schema.org/draft-07/schema#",
+    "type": "object",
+    "properties": {
+        "name": {"type": "string"},
+        "age": {"type": "integer"}
+    },
+    "required": ["name"]
+}
+
+_has_library = schema_library() is not None
+
+
+class SchemaCacheTest(unittest.TestCase):
+    def test_refresh_after_hitcount(self):
+        cache = SchemaCache(refresh_hitcount=3)
+        fetch = mock.Mock(return_value=None)
+
+        for _ in range(7):
+            cache.validate(("dev", "Customer", "resource"), fetch, {})
+
+        # the fetch is the first of every 3 uses
+        self.assertEqual(3, fetch.call_count)
+
+    def test_zero_hitcount_always_fetches(self):
+        cache = SchemaCache(refresh_hitcount=0)
+        fetch = mock.Mock(return_value=None)
+
+        for _ in range(3):
+            cache.validate(("dev", "Customer", "resource"), fetch, {})
+
+        self.assertEqual(3, fetch.call_count)
+
+    def test_refresh_after_ttl(self):
+        cache = SchemaCache(ttl=-1)
+        fetch = mock.Mock(return_value=None)
+
+        cache.validate(("dev", "Customer", "resource"), fetch, {})
+        cache.validate(("dev", "Customer", "resource"), fetch, {})
+
+        self.assertEqual(2, fetch.call_count)
+
+    def test_missing_schema_is_cached(self):
+        cache = SchemaCache()
+        fetch = mock.Mock(side_effect=ResourceNotFoundException())
+
+        cache.validate(("dev", "Customer", "resource"), fetch, {"anything": 1})
+        cache.validate(("dev", "Customer", "resource"), fetch, {"anything": 1})
+
+        self.assertEqual(1, fetch.call_count)
+
+    @unittest.skipUnless(_has_library, "requires fastjsonschema or jsonschema")
+    def test_compiled_validator(self):
+        validate = compile_validator(_SCHEMA)
+        validate({"name": "Bob", "age": 30})
+
+        with self.assertRaises(InvalidArgumentsException):
+            validate({"age": "thirty"})
+
+    def test_library_imported_on_first_use(self):
+        script = "import sys, src.data_api_client; print('fastjsonschema' in sys.modules or 'jsonschema' in sys.modules)"
+        out = subprocess.run([sys.executable, "-c", script], cwd=parentdir, check=True, capture_output=True,
+                             text=True).stdout.strip()
+
+        self.assertEqual("False", out)
+
+    @unittest.skipUnless(_has_library, "requires fastjsonschema or jsonschema")
+    def test_uncompilable_schema_is_left_to_the_api(self):
+        cache = SchemaCache()
+        fetch = mock.Mock(return_value={"type": "not-a-type"})
+
+        with self.assertLogs("SchemaCache", level="WARNING"):
+            cache.validate(("dev", "Customer", "resource"), fetch, {"name": "Bob"})
+        cache.validate(("dev", "Customer", "resource"), fetch, {"name": "Bob"})
+
+        self.assertEqual(1, fetch.call_count)
+
+    @unittest.skipUnless(_has_library, "requires fastjsonschema or jsonschema")
+    def test_client_rejects_invalid_item_before_write(self):
+        client = local_client(schema_cache=SchemaCache())
+        client._http_handler = mock.Mock()
+        client._http_handler.get.side_effect = lambda **kwargs: fake_response(200, {"type": "object",
+                                                                                    "required": ["name"]})
+        client._http_handler.put.side_effect = lambda **kwargs: fake_response(200, {"Resource": {"name": "Bob"}})
+
+        with self.assertRaises(InvalidArgumentsException):
+            client.put_resource("Customer", "1", {"age": 30}, strict_schema=True)
+        self.assertEqual(0, client._http_handler.put.call_count)
+
+        client.put_resource("Customer", "1", {"name": "Bob"}, strict_schema=True)
+        # without strict_schema nothing is validated locally
+        client.put_resource("Customer", "1", {"age": 30})
+
+        self.assertEqual(2, client._http_handler.put.call_count)
+        self.assertEqual(1, client._http_handler.get.call_count)
+
+        # changing the schema drops the cached copy
+        client.put_schema("Customer", "Resource", {"type": "object", "required": ["name"]})
+        with self.assertRaises(InvalidArgumentsException):
+            client.put_resource("Customer", "1", {"age": 30}, strict_schema=True)
+
+        self.assertEqual(2, client._http_handler.get.call_count)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import sys
+import os
+import unittest
+import requests
+from datetime import datetime
+
+sys.path.append("..")
+parentdir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+os.sys.path.insert(0, parentdir)
+
+from src.lib.signing import SigV4Signer, SigningKeyCache, derive_signing_key
+
+_access_key = "AKIDEXAMPLE"
+_secret_key = "wJalrXUtnFEMI/K7MDENG+bPxRfiCYEXAMPLEKEY"
+
+
+class SigningTest(unittest.TestCase):
+    def test_derive_signing_key(self):
+        # key derivation example from the AWS Signature Version 4 documentation
+        key = derive_signing_key(_secret_key, "20150830", "us-east-1", "iam")
+        self.assertEqual(key.hex(), "c4afb1cc5771d871763a393e44b703571b55cc28424d1a5e86da6ed3c154a4b9")
+
+    def test_key_cache(self):
+        cache = SigningKeyCache()
+        first = cache.get(_access_key, _secret_key, "20150830", "us-east-1", "execute-api")
+        second = cache.get(_access_key, _secret_key, "20150830", "us-east-1", "execute-api")
+        self.assertIs(first, second)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+        # a new day or a new secret derives a new key
+        cache.get(_access_key, _secret_key, "20150831", "us-east-1", "execute-api")
+        cache.get(_access_key, "other", "20150831", "us-east-1", "execute-api")
+        self.assertEqual(cache.misses, 3)
+
+    def test_key_cache_bounded(self):
+        cache = SigningKeyCache(max_size=2)
+        for d in ["20150830", "20150831", "20150901"]:
+            cache.get(_access_key, _secret_key, d, "us-east-1", "execute-api")
+        self.assertEqual(len(cache._keys), 2)
+
+    def test_set_credentials(self):
+        signer = SigV4Signer(_access_key, _secret_key, "us-east-1", "execute-api", key_cache=SigningKeyCache())
+        signer.set_credentials("AKIDOTHER", _secret_key, "token")
+        headers = signer.sign("GET", "https://example.com/dev/x", {})
+        self.assertEqual(headers.get("x-amz-security-token"), "token")
+        self.assertIn("Credential=AKIDOTHER/", headers.get("Authorization"))
+
+    def test_matches_aws4auth(self):
+        try:
+            from requests_aws4auth import AWS4Auth
+        except ImportError:
+            self.skipTest("requests_aws4auth not installed")
+
+        url = "https://abc.execute-api.eu-west-1.amazonaws.com/dev/MyItem/a%20b?Limit=10&ExclusiveStartKey=x%2Fy"
+        timestamp = datetime(2020, 11, 20, 12, 0, 0)
+
+        for method, body in [("GET", None), ("PUT", b'{"Resource": {"attr1": "abc"}}')]:
+            expected = requests.Request(method, url, data=body, headers={"content-type": "application/json",
+                                                                         "x-amz-date": "20201120T120000Z"}).prepare()
+            AWS4Auth(_access_key, _secret_key, "eu-west-1", "execute-api", session_token="token",
+                     date="20201120")(expected)
+
+            signer = SigV4Signer(_access_key, _secret_key, "eu-west-1", "execute-api", session_token="token")
+            actual = signer.sign(method, url, {"content-type": "application/json"}, body, timestamp=timestamp)
+
+            self.assertEqual(actual.get("Authorization"), expected.headers.get("Authorization"))
+
+
+if __name__ == '__main__':
+    unittest.main()
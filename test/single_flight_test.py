@@ -0,0 +1,195 @@
+import sys
+import os
+import asyncio
+import threading
+import time
+import unittest
+
+sys.path.append("..")
+parentdir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+os.sys.path.insert(0, parentdir)
+
+from src.exceptions import ResourceNotFoundException
+from src.data_api_client import DataAPIClient
+from src.lib.single_flight import SingleFlight, AsyncSingleFlight
+from src.lib.transport import InMemoryTransport
+
+_THREADS = 8
+
+
+def _run_concurrently(call, threads: int = _THREADS):
+    results = [None] * threads
+
+    def _worker(i):
+        try:
+            results[i] = call()
+        except Exception as e:
+            results[i] = e
+
+    workers = [threading.Thread(target=_worker, args=(i,)) for i in range(threads)]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+
+    return results
+
+
+class _SlowApi:
+    """Answers every request after a delay, long enough for the other threads to arrive while it is in flight.
+    """
+
+    def __init__(self, status: int = 200, delay: float = 0.2):
+        self.status = status
+        self.delay = delay
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, method, url, headers, body):
+        with self._lock:
+            self.requests += 1
+        time.sleep(self.delay)
+
+        return self.status, {}, {"Item": {"Resource": {"id": "1"}}} if self.status == 200 else {"Message": "Not Found"}
+
+
+class SingleFlightTest(unittest.TestCase):
+    def test_concurrent_calls_share_one_load(self):
+        flight = SingleFlight()
+        calls = []
+
+        def _load():
+            calls.append(1)
+            time.sleep(0.2)
+            return {"id": "1"}
+
+        results = _run_concurrently(lambda: flight.do(("k",), _load))
+
+        self.assertEqual(1, len(calls))
+        self.assertEqual(_THREADS - 1, flight.coalesced)
+        self.assertTrue(all(r == {"id": "1"} for r in results))
+        # every caller gets its own copy
+        self.assertEqual(_THREADS, len({id(r) for r in results}))
+
+    def test_errors_reach_every_waiter(self):
+        flight = SingleFlight()
+
+        def _load():
+            time.sleep(0.2)
+            raise ResourceNotFoundException()
+
+        results = _run_concurrently(lambda: flight.do(("k",), _load))
+        self.assertTrue(all(isinstance(r, ResourceNotFoundException) for r in results))
+
+        # nothing is held once the flight has landed
+        self.assertEqual(1, flight.do(("k",), lambda: 1))
+
+    def test_forget(self):
+        flight = SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+
+        def _slow():
+            started.set()
+            release.wait()
+            return "before"
+
+        first = threading.Thread(target=flight.do, args=(("a", "1"), _slow))
+        first.start()
+        started.wait()
+
+        flight.forget(lambda key: key[1] == "1")
+        self.assertEqual("after", flight.do(("a", "1"), lambda: "after"))
+
+        release.set()
+        first.join()
+        self.assertEqual({}, flight._flights)
+
+    def test_async(self):
+        flight = AsyncSingleFlight()
+        calls = []
+
+        async def _load():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return {"id": "1"}
+
+        async def _failing():
+            await asyncio.sleep(0.05)
+            raise ResourceNotFoundException()
+
+        async def _main():
+            results = await asyncio.gather(*[flight.do(("k",), _load) for _ in range(_THREADS)])
+            errors = await asyncio.gather(*[flight.do(("e",), _failing) for _ in range(_THREADS)],
+                                          return_exceptions=True)
+            return results, errors
+
+        results, errors = asyncio.run(_main())
+
+        self.assertEqual(1, len(calls))
+        self.assertTrue(all(r == {"id": "1"} for r in results))
+        self.assertEqual(_THREADS, len({id(r) for r in results}))
+        self.assertTrue(all(isinstance(e, ResourceNotFoundException) for e in errors))
+
+    def test_async_join_after_request_finished(self):
+        flight = AsyncSingleFlight()
+
+        async def _load():
+            return {"id": "1"}
+
+        async def _main():
+            first = asyncio.ensure_future(flight.do(("k",), _load))
+            await asyncio.sleep(0)
+            # scheduled to run after the request completes, but before the flight lands
+            late = asyncio.ensure_future(flight.do(("k",), _load))
+            return await asyncio.gather(first, late)
+
+        first, late = asyncio.run(_main())
+
+        self.assertEqual(1, flight.coalesced)
+        self.assertEqual({"id": "1"}, late)
+        self.assertIsNot(first, late)
+        self.assertEqual({}, flight._flights)
+
+
+class ClientCoalescingTest(unittest.TestCase):
+    def _client(self, api, coalesce_reads: bool = True):
+        return DataAPIClient(stage="dev", region_name="us-east-1", service_endpoint="stand-in.local", tls=False,
+                             access_key="AKIDEXAMPLE", secret_key="secret", transport=InMemoryTransport(api),
+                             coalesce_reads=coalesce_reads)
+
+    def test_get_resource(self):
+        api = _SlowApi()
+        client = self._client(api)
+        results = _run_concurrently(lambda: client.get_resource("Customer", "1"))
+
+        self.assertEqual(1, api.requests)
+        self.assertTrue(all(r.get("Item").get("Resource").get("id") == "1" for r in results))
+
+    def test_not_found_reaches_every_caller(self):
+        api = _SlowApi(status=404)
+        client = self._client(api)
+        results = _run_concurrently(lambda: client.get_metadata("Customer", "1"))
+
+        self.assertEqual(1, api.requests)
+        self.assertTrue(all(isinstance(r, ResourceNotFoundException) for r in results))
+
+    def test_different_requests_are_not_coalesced(self):
+        api = _SlowApi()
+        client = self._client(api)
+        _run_concurrently(lambda: client.get_info("Customer"), threads=2)
+        _run_concurrently(lambda: client.get_resource("Customer", "1", only_attributes=["id"]), threads=1)
+
+        self.assertEqual(2, api.requests)
+
+    def test_disabled_by_default(self):
+        api = _SlowApi()
+        client = DataAPIClient(stage="dev", region_name="us-east-1", service_endpoint="stand-in.local", tls=False,
+                               access_key="AKIDEXAMPLE", secret_key="secret", transport=InMemoryTransport(api))
+        _run_concurrently(lambda: client.get_resource("Customer", "1"))
+
+        self.assertEqual(_THREADS, api.requests)
+
+
+if __name__ == '__main__':
+    unittest.main()
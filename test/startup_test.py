@@ -0,0 +1,47 @@
+import sys
+import os
+import unittest
+import subprocess
+from unittest import mock
+
+sys.path.append("..")
+parentdir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+os.sys.path.insert(0, parentdir)
+
+from src.data_api_client import DataAPIClient
+from src.lib.credentials import Credentials, CredentialProvider
+
+
+class StartupTest(unittest.TestCase):
+    def test_import_does_not_load_boto3(self):
+        out = subprocess.run([sys.executable, "-c", "import sys, src.data_api_client; print('boto3' in sys.modules)"],
+                             cwd=parentdir, check=True, capture_output=True, text=True).stdout.strip()
+
+        self.assertEqual("False", out)
+
+    def test_binding_is_deferred_to_first_request(self):
+        resolve = mock.Mock(return_value=Credentials("AKIDEXAMPLE", "secret"))
+        client = DataAPIClient(stage="dev", region_name="us-east-1", service_endpoint="localhost:1", tls=False,
+                               credential_provider=CredentialProvider(resolve=resolve))
+        self.assertIsNone(client._bound_http_handler)
+
+        self.assertEqual("http://localhost:1/dev", client._http_handler.get_base_path())
+        self.assertIs(client._http_handler, client._http_handler)
+        # credentials are only resolved when the first request is signed
+        resolve.assert_not_called()
+
+        client._http_handler._auth.sign("GET", "http://localhost:1/dev/Customer/1", {})
+        resolve.assert_called_once()
+
+        client.close()
+
+    def test_close_before_first_request(self):
+        client = DataAPIClient(stage="dev", region_name="us-east-1", access_key="AKIDEXAMPLE", secret_key="secret",
+                               service_endpoint="localhost:1", tls=False)
+        client.close()
+
+        self.assertIsNone(client._bound_http_handler)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,189 @@
+import sys
+import os
+import json
+import unittest
+from unittest import mock
+
+sys.path.append("..")
+parentdir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+os.sys.path.insert(0, parentdir)
+
+import src.parameters as params
+from src.exceptions import *
+from src.lib.paginator import Paginator
+from src.lib.streaming import StreamingPage
+from fakes import CountingCodec, fake_response, local_client
+
+_page = {"Items": [{"id": i, "Resource": {"name": "é" * i, "score": 1.5 * i, "tags": [True, None, -3]}}
+                   for i in range(50)],
+         params.LAST_EVALUATED_KEY: {"id": 49}, "Count": 50}
+
+
+def _chunks(doc, size: int):
+    raw = json.dumps(doc).encode("utf-8")
+
+    return [raw[i:i + size] for i in range(0, len(raw), size)]
+
+
+class StreamingPageTest(unittest.TestCase):
+    def test_any_chunk_boundary(self):
+        for size in [1, 2, 3, 7, 100, 65536]:
+            page = StreamingPage(_chunks(_page, size))
+            self.assertEqual(_page.get("Items"), list(page))
+            self.assertEqual({"id": 49}, page.last_evaluated_key)
+            self.assertEqual(50, page.get("Count"))
+            self.assertEqual(50, page.item_count)
+
+    def test_fields_before_items(self):
+        doc = {params.LAST_EVALUATED_KEY: 5, "Items": [1, 2.5, True, None, "x", 1e5]}
+        page = StreamingPage(_chunks(doc, 1))
+
+        # known before the Items are read
+        self.assertEqual(5, page.last_evaluated_key)
+        self.assertEqual(doc.get("Items"), list(page))
+
+    def test_items_read_lazily(self):
+        chunks = iter(_chunks(_page, 16))
+        page = StreamingPage(chunks)
+        first = next(iter(page))
+
+        self.assertEqual(0, first.get("id"))
+        self.assertGreater(len(list(chunks)), 0)
+
+    def test_trailing_fields_drain_body(self):
+        close = mock.Mock()
+        page = StreamingPage(_chunks(_page, 64), close=close)
+        close.assert_not_called()
+
+        self.assertEqual({"id": 49}, page.last_evaluated_key)
+        self.assertEqual(50, page.item_count)
+        close.assert_called_once()
+
+    def test_empty_pages(self):
+        for doc in [{}, {"Items": []}]:
+            page = StreamingPage(_chunks(doc, 1))
+            self.assertEqual([], list(page))
+            self.assertIsNone(page.last_evaluated_key)
+
+    def test_large_item_is_not_decoded_per_chunk(self):
+        doc = {"Items": [{"id": 1, "Resource": {"values": list(range(20000))}}]}
+        chunks = _chunks(doc, 16)
+        page = StreamingPage(chunks)
+
+        with mock.patch("json.JSONDecoder.raw_decode", side_effect=json.JSONDecoder.raw_decode,
+                        autospec=True) as raw_decode:
+            self.assertEqual(doc.get("Items"), list(page))
+
+        # decoding is retried each time the unread text doubles, rather than once for each of the chunks
+        self.assertLess(raw_decode.call_count, 40)
+        self.assertGreater(len(chunks), 5000)
+
+    def test_malformed(self):
+        close = mock.Mock()
+        page = StreamingPage([b'{"Items": [1, 2'], close=close)
+
+        with self.assertRaises(Exception):
+            list(page)
+        close.assert_called_once()
+
+    def test_fields_decoded_with_codec(self):
+        codec = CountingCodec()
+        page = StreamingPage(_chunks(_page, 7), codec=codec)
+
+        self.assertEqual(50, len(list(page)))
+        self.assertEqual({"id": 49}, page.last_evaluated_key)
+        self.assertEqual(50, page.get("Count"))
+        # LastEvaluatedKey and Count, but none of the Items
+        self.assertEqual(2, codec.decoded)
+
+
+class _StreamedPages:
+    def __init__(self, total: int = 3):
+        self.total = total
+        self.requested = []
+        self.closed = []
+
+    def __call__(self, start_token):
+        page = 0 if start_token is None else start_token
+        self.requested.append(page)
+
+        doc = {"Items": [{"id": f"{page}-{i}"} for i in range(4)]}
+        if page + 1 < self.total:
+            doc[params.LAST_EVALUATED_KEY] = page + 1
+
+        return StreamingPage(_chunks(doc, 5), close=lambda: self.closed.append(page))
+
+
+class StreamingPaginatorTest(unittest.TestCase):
+    def test_follows_streamed_pages(self):
+        pages = _StreamedPages()
+        paginator = Paginator(pages, prefetch=False)
+        items = list(paginator)
+
+        self.assertEqual(12, len(items))
+        self.assertEqual("2-3", items[-1].get("id"))
+        self.assertEqual([0, 1, 2], pages.requested)
+        self.assertEqual([0, 1, 2], pages.closed)
+        self.assertIsNone(paginator.last_evaluated_key)
+
+    def test_limits(self):
+        pages = _StreamedPages()
+        self.assertEqual(6, len(list(Paginator(pages, max_items=6, prefetch=False))))
+        self.assertEqual([0, 1], pages.requested)
+        self.assertEqual([0, 1], pages.closed)
+
+        paginator = Paginator(_StreamedPages(), max_pages=2, prefetch=False)
+        self.assertEqual(8, len(list(paginator)))
+        self.assertEqual(2, paginator.last_evaluated_key)
+
+    def test_resume_after_stopping_mid_page(self):
+        paginator = Paginator(_StreamedPages(), max_items=6, prefetch=False)
+        self.assertEqual(6, len(list(paginator)))
+        self.assertEqual(1, paginator.last_evaluated_key)
+
+        # the last Item of a page turns out to be the end of it once the caller asks for more
+        paginator = Paginator(_StreamedPages(), max_items=8, prefetch=False)
+        self.assertEqual(8, len(list(paginator)))
+        self.assertEqual(2, paginator.last_evaluated_key)
+
+
+class StreamingClientTest(unittest.TestCase):
+    def setUp(self):
+        self.client = local_client()
+        self.client._http_handler = mock.Mock()
+
+    def test_list_items_stream(self):
+        self.client._http_handler.get.return_value = fake_response(200, _page)
+        page = self.client.list_items("Customer", page_size=50, stream=True)
+
+        self.assertIsInstance(page, StreamingPage)
+        self.assertEqual(_page.get("Items"), list(page))
+        self.assertEqual(True, self.client._http_handler.get.call_args.kwargs.get("stream"))
+
+    def test_find_stream_error(self):
+        self.client._http_handler.post.return_value = fake_response(404, {})
+
+        with self.assertRaises(ResourceNotFoundException):
+            self.client.find("Customer", resource_attributes={"name": "x"}, stream=True)
+
+    def test_stream_decodes_other_responses_with_client_codec(self):
+        codec = mock.Mock(wraps=self.client._codec)
+        self.client._codec = codec
+        self.client._http_handler.post.return_value = fake_response(202, {"Message": "accepted"})
+
+        self.assertEqual({"Message": "accepted"},
+                         self.client.find("Customer", resource_attributes={"name": "x"}, stream=True))
+        codec.loads.assert_called_once()
+
+    def test_iter_items_stream(self):
+        second = dict(_page)
+        second.pop(params.LAST_EVALUATED_KEY)
+        self.client._http_handler.get.side_effect = [fake_response(200, _page), fake_response(200, second)]
+
+        self.assertEqual(100, len(list(self.client.iter_items("Customer", stream=True))))
+        self.assertEqual({"id": 49}, self.client._http_handler.get.call_args.kwargs.get("query_params").get(
+            params.EXCLUSIVE_START_KEY))
+
+
+if __name__ == '__main__':
+    unittest.main()
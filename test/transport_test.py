@@ -0,0 +1,148 @@
+import sys
+import os
+import unittest
+import importlib.util
+from unittest import mock
+
+import requests
+import urllib3
+
+sys.path.append("..")
+parentdir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+os.sys.path.insert(0, parentdir)
+
+from src.data_api_client import DataAPIClient
+from src.lib.http_handler import HttpHelper
+from src.lib.compression import RequestCompressor
+import src.lib.transport as transport
+from src.lib.transport import Transport, RequestsTransport, InMemoryTransport, BufferedResponse, CONNECT, TTFB, \
+    TRANSFER
+from benchmark.stand_in_server import StandInApi, StandInServer
+from fakes import NoSleepPolicy
+
+
+class _FlakyTransport(Transport):
+    connection_errors = (ConnectionResetError,)
+
+    def __init__(self, failures: int):
+        self.failures = failures
+        self.calls = 0
+
+    def send(self, method, url, headers, body=None, stream=False, timings=None):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise ConnectionResetError()
+
+        return BufferedResponse(200, "OK", {}, b"{}")
+
+
+class TransportTest(unittest.TestCase):
+    def _client(self, api, **kwargs):
+        return DataAPIClient(stage="dev", region_name="us-east-1", service_endpoint=api.endpoint, tls=False,
+                             access_key="AKIDEXAMPLE", secret_key="secret", transport=InMemoryTransport(api), **kwargs)
+
+    def test_in_memory_client(self):
+        api = StandInApi(page_items=4, pages=3, item_size=128)
+        client = self._client(api)
+
+        self.assertEqual("/dev/Customer/1", client.get_resource("Customer", "1").get("Item").get("Resource").get("id"))
+        self.assertEqual(12, len(list(client.iter_items("Customer", page_size=4))))
+        self.assertEqual(12, len(list(client.iter_items("Customer", page_size=4, stream=True))))
+        self.assertEqual(7, api.requests)
+
+    def test_in_memory_compressed_request(self):
+        api = StandInApi()
+        client = self._client(api, compression=RequestCompressor(threshold=0))
+
+        self.assertIsNotNone(client.put_resource("Customer", "1", {"name": "x"}))
+        self.assertLess(api.bytes_received, len('{"Resource": {"name": "x"}}') + 32)
+
+    def test_handler_receives_signed_request(self):
+        handler = mock.Mock(return_value=(200, {"Content-Type": "application/json"}, {"Item": {}}))
+        helper = HttpHelper(host="https://example.com", stage="dev", region="us-east-1", access_key="AKIDEXAMPLE",
+                            secret_key="secret", session_token=None, transport=InMemoryTransport(handler))
+
+        response = helper.get("Customer", "1")
+
+        method, url, headers, body = handler.call_args.args
+        self.assertEqual(("GET", "https://example.com/dev/Customer/1", None), (method, url, body))
+        self.assertTrue(headers.get("Authorization").startswith("AWS4-HMAC-SHA256"))
+        self.assertEqual({"Item": {}}, response.json())
+        self.assertEqual("application/json", response.headers.get("content-type"))
+        self.assertEqual("OK", response.reason)
+
+    def test_connection_errors_are_retried(self):
+        flaky = _FlakyTransport(failures=2)
+        helper = HttpHelper(host="https://example.com", stage="dev", region="us-east-1", access_key="AKIDEXAMPLE",
+                            secret_key="secret", session_token=None, retry_policy=NoSleepPolicy(), transport=flaky)
+
+        self.assertEqual(200, helper.get("Customer", "1").status_code)
+        self.assertEqual(3, flaky.calls)
+
+    def test_close_closes_transport(self):
+        custom = mock.Mock(spec=Transport)
+        helper = HttpHelper(host="https://example.com", stage="dev", region="us-east-1", access_key="AKIDEXAMPLE",
+                            secret_key="secret", session_token=None, transport=custom)
+
+        helper.close()
+        custom.close.assert_called_once_with()
+
+    def test_requests_transport(self):
+        session = mock.Mock()
+        requests_transport = RequestsTransport()
+        requests_transport._get_session = mock.Mock(return_value=session)
+
+        requests_transport.send("PUT", "https://example.com/dev/Customer/1", {"a": "b"}, b"{}")
+
+        args, kwargs = session.request.call_args
+        self.assertEqual(("PUT", "https://example.com/dev/Customer/1"), args)
+        self.assertEqual(b"{}", kwargs.get("data"))
+        self.assertEqual({"a": "b"}, kwargs.get("headers"))
+        # an explicit auth handler stops requests applying .netrc credentials
+        self.assertIsNotNone(kwargs.get("auth"))
+
+    def test_requests_transport_retries_truncated_bodies(self):
+        errors = RequestsTransport.connection_errors
+        self.assertTrue(issubclass(requests.exceptions.ChunkedEncodingError, errors))
+        self.assertTrue(issubclass(urllib3.exceptions.ProtocolError, errors))
+
+    def test_transport_requires_send(self):
+        class _NoSend(Transport):
+            pass
+
+        with self.assertRaises(TypeError):
+            _NoSend()
+
+    def test_buffered_response_iter_content(self):
+        response = BufferedResponse(200, "OK", {}, b"abcdefg")
+        self.assertEqual([b"abc", b"def", b"g"], list(response.iter_content(3)))
+
+    def test_http2_requires_httpx(self):
+        with mock.patch.dict(sys.modules, {"httpx": None}):
+            with self.assertRaises(ImportError):
+                transport.Http2Transport()
+
+    @unittest.skipUnless(importlib.util.find_spec("httpx") is not None and importlib.util.find_spec("h2") is not None,
+                         "requires httpx[http2]")
+    def test_http2_transport(self):
+        server = StandInServer(item_size=128).start()
+        http2 = transport.Http2Transport()
+        timings = {}
+        try:
+            response = http2.send("GET", f"http://{server.endpoint}/dev/Customer/2", {}, timings=timings)
+            self.assertEqual(200, response.status_code)
+            self.assertEqual(transport.DEFAULT_HTTP2_TIMEOUT, http2._get_client().timeout.read)
+
+            client = DataAPIClient(stage="dev", region_name="us-east-1", service_endpoint=server.endpoint, tls=False,
+                                   access_key="AKIDEXAMPLE", secret_key="secret", transport=http2)
+            self.assertEqual("/dev/Customer/1",
+                             client.get_resource("Customer", "1").get("Item").get("Resource").get("id"))
+            client.close()
+        finally:
+            server.stop()
+
+        for phase in (CONNECT, TTFB, TRANSFER):
+            self.assertIn(phase, timings)
+
+if __name__ == '__main__':
+    unittest.main()